@@ -1,5 +1,6 @@
 import abc
 from utils.logger import Logger
+from utils.dtypes import get_dtype_hints
 import os
 import datetime
 
@@ -13,7 +14,16 @@ class Strategy(metaclass=abc.ABCMeta):
         self.variables = variables
 
         self.type_dict = {'csv': 'csv', 'xls': 'excel', 'xlsx': 'excel', 'xlsm': 'excel',
-                          'pickle': 'pickle'}
+                          'pickle': 'pickle', 'parquet': 'parquet', 'feather': 'feather', 'arrow': 'feather',
+                          'npy': 'npy'}
+        # types which can be loaded into ChunkSource and written from it chunk by chunk
+        self.chunked_types = ['csv']
+        # types whose parsing is CPU-bound, they are read in input process pool if it is enabled
+        self.process_types = ['csv', 'excel']
+        # types whose parsed dataframes are stored in input cache if it is enabled
+        self.cached_types = ['csv', 'excel']
+        # types whose loaders apply row filter while reading the file, other types are filtered after loading
+        self.filtered_types = ['csv', 'parquet', 'feather']
 
     def get_columns_names(self, strategy_name: str) -> (list, dict):
         """
@@ -40,6 +50,38 @@ class Strategy(metaclass=abc.ABCMeta):
         original_names = list(rename_names.keys())
         return original_names, rename_names
 
+    def get_columns_types(self, strategy_name: str) -> (dict, list):
+        """
+        Returns types of visible columns declared in input strategy with key 'dtype'. Value 'date' marks column parsed
+        as date, other values are pandas dtypes (e.g. 'category', 'float32', 'int64', 'str').
+
+        :param str strategy_name: Name of the input strategy for loaded file.
+        :return (dict, list): Dictionary with original name of column as a key and dtype as a value and list with
+        original names of date columns.
+        """
+        dtypes = {}
+        date_columns = []
+
+        for sv in self.config.get_attr('input_strategies')[strategy_name]:
+            if sv.get('visible', 1) == 1 and 'original_name' in sv and sv.get('dtype'):
+                if sv['dtype'] == 'date':
+                    date_columns.append(sv['original_name'])
+                else:
+                    dtypes[sv['original_name']] = sv['dtype']
+
+        return dtypes, date_columns
+
+    def get_dtype_hints(self, strategy_name: str) -> dict:
+        """
+        Returns types declared with key 'dtype' in input strategy for visible columns, used by dtype optimization
+        of loaded dataframe.
+
+        :param str strategy_name: Name of the input strategy.
+        :return dict: Dictionary with final name of column as a key and declared type as a value, see
+                      utils.dtypes.get_dtype_hints.
+        """
+        return get_dtype_hints(self.config.get_attr('input_strategies')[strategy_name])
+
     def check_file_name(self, file_name: str) -> str:
         """
         Checks if file exists, according to 'on_file_exist_rewrite' rewrite file or create new with timestamp.
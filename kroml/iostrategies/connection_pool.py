@@ -0,0 +1,260 @@
+import os
+import time
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
+from utils.logger import Logger
+from utils.backends import get_backend
+
+logger = Logger(__name__)
+
+SUPPORTED_DATABASES = ['postgresql', 'mysql', 'oracle', 'sqlite']
+
+# query used to check that idle connection is still alive
+HEALTH_QUERIES = {'oracle': 'select 1 from dual'}
+
+pools = {}
+
+pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Pool of DBAPI connections to one database. At most max_size connections are open, connection which was idle
+    longer than idle_timeout seconds is closed and idle connection is checked by health query before it is reused.
+    Connection is returned to the pool in clean state - open transaction is rolled back.
+    """
+    def __init__(self, connect, max_size: int = 5, idle_timeout: float = 300, health_query: str = 'select 1',
+                 name: str = None):
+        """
+        :param connect: Function without arguments opening new connection.
+        :param int max_size: Maximal number of open connections.
+        :param float idle_timeout: Idle connections older than this number of seconds are closed.
+        :param str health_query: Query executed on idle connection before it is reused.
+        :param str name: Name of the pool used in log.
+        """
+        self.connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_query = health_query
+        self.name = name
+        self.pid = os.getpid()
+
+        self.idle = []
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def close_expired(self) -> None:
+        """
+        Closes idle connections older than idle_timeout, has to be called with condition acquired.
+
+        :return None: No return value
+        """
+        now = time.monotonic()
+        expired = [conn for conn, last_used in self.idle if now - last_used > self.idle_timeout]
+        self.idle = [(conn, last_used) for conn, last_used in self.idle if now - last_used <= self.idle_timeout]
+
+        for conn in expired:
+            self.size -= 1
+            ConnectionPool.close_connection(conn)
+
+    def is_healthy(self, conn) -> bool:
+        """
+        Checks connection by health query.
+
+        :param conn: DBAPI connection.
+        :return bool: True if the query succeeded.
+        """
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.health_query)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def close_connection(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: float = None):
+        """
+        Returns healthy idle connection or opens new one. Waits for released connection if max_size connections
+        are open.
+
+        :param float timeout: Maximal number of seconds to wait for connection, waits without limit if None.
+        :return: DBAPI connection.
+        """
+        with self.condition:
+            while True:
+                self.close_expired()
+                if self.idle:
+                    conn = self.idle.pop()[0]
+                    break
+                if self.size < self.max_size:
+                    self.size += 1
+                    conn = None
+                    break
+                if not self.condition.wait(timeout):
+                    raise Exception('No connection of pool "{}" released in {}s.'.format(self.name, timeout))
+
+        if conn is not None and self.is_healthy(conn):
+            return conn
+
+        if conn is not None:
+            logger.info('Connection of pool "{}" failed health check, reconnecting.'.format(self.name),
+                        inp_class='ConnectionPool', inp_func='acquire', created_by='system')
+            ConnectionPool.close_connection(conn)
+
+        try:
+            return self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+
+    def release(self, conn, discard: bool = False) -> None:
+        """
+        Returns connection into the pool. Open transaction is rolled back, connection which cannot be rolled back
+        or is discarded is closed.
+
+        :param conn: DBAPI connection returned by acquire.
+        :param bool discard: If True, connection is closed instead of returned.
+        :return None: No return value
+        """
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self.condition:
+            if discard:
+                self.size -= 1
+                ConnectionPool.close_connection(conn)
+            else:
+                self.idle.append((conn, time.monotonic()))
+            self.condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """
+        Context manager acquiring connection from the pool and releasing it at the end. Connection is discarded if
+        the context is left by any exception (including KeyboardInterrupt and GeneratorExit of abandoned generator),
+        as its state is unknown.
+
+        :param float timeout: Maximal number of seconds to wait for connection.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self) -> None:
+        """
+        Closes all idle connections.
+
+        :return None: No return value
+        """
+        with self.condition:
+            for conn, _ in self.idle:
+                self.size -= 1
+                ConnectionPool.close_connection(conn)
+            self.idle = []
+
+
+def get_connect_function(database: dict):
+    """
+    Returns function opening connection to the database described in config.
+
+    :param dict database: Database from input_db or output_db in config with keys 'type', 'db_name', 'user',
+                          'password', 'url', 'port' and 'sid' (Oracle).
+    :return: Function without arguments returning new DBAPI connection.
+    """
+    db_type = str(database.get('type')).lower()
+
+    if db_type in ('postgresql', 'mysql'):
+        return lambda: get_backend(db_type).connect(database=database['db_name'], user=database['user'],
+                                                    password=database['password'], host=database['url'],
+                                                    port=database['port'])
+    elif db_type == 'oracle':
+        return lambda: get_backend(db_type).connect(user=database['user'], password=database['password'],
+                                                    dsn='{}:{}/{}'.format(database['url'], database['port'],
+                                                                          database['sid']))
+    elif db_type == 'sqlite':
+        # connections of the pool are used by different threads, but never concurrently
+        return lambda: get_backend(db_type).connect(database['db_name'], check_same_thread=False)
+
+    raise Exception('Database type "{}" not recognized.'.format(database.get('type')))
+
+
+def get_paramstyle(db_type: str) -> str:
+    """
+    Returns DBAPI paramstyle of the database driver (e.g. 'qmark', 'named', 'pyformat').
+
+    :param str db_type: Type of the database.
+    :return str: Paramstyle of the driver.
+    """
+    return get_backend(db_type).paramstyle
+
+
+def get_pool_key(database: dict) -> tuple:
+    """
+    Returns key of the pool given by DSN and credentials of the database, password is hashed.
+
+    :param dict database: Database from config.
+    :return tuple: Key of the pool.
+    """
+    password = hashlib.sha1(str(database.get('password')).encode()).hexdigest()
+    return (str(database.get('type')).lower(), database.get('url'), database.get('port'), database.get('db_name'),
+            database.get('sid'), database.get('user'), password)
+
+
+def get_pool(database: dict, config=None) -> ConnectionPool:
+    """
+    Returns process-wide connection pool of the database, pool is created on the first request. Pools inherited
+    from parent process are not used, as their connections cannot be shared.
+
+    :param dict database: Database from input_db or output_db in config.
+    :param ConfigParser config: Configuration with 'db_pool_size' and 'db_pool_idle_timeout' of new pool.
+    :return ConnectionPool: Connection pool of the database.
+    """
+    key = get_pool_key(database)
+
+    with pools_lock:
+        pool = pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            max_size = int(config.get_attr('db_pool_size', default=5)) if config is not None else 5
+            idle_timeout = float(config.get_attr('db_pool_idle_timeout', default=300)) if config is not None else 300
+            pool = ConnectionPool(get_connect_function(database), max_size=max_size, idle_timeout=idle_timeout,
+                                  health_query=HEALTH_QUERIES.get(key[0], 'select 1'),
+                                  name='{}:{}'.format(key[0], database.get('db_name')))
+            pools[key] = pool
+
+    return pool
+
+
+def close_pools() -> None:
+    """
+    Closes idle connections of all pools of the process.
+
+    :return None: No return value
+    """
+    with pools_lock:
+        for pool in pools.values():
+            if pool.pid == os.getpid():
+                pool.close()
+        pools.clear()
+
+
+atexit.register(close_pools)
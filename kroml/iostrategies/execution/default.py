@@ -2,6 +2,9 @@ from utils.logger import Logger
 from iostrategies.execution.abstract_execution import Execution
 from iostrategies.execution.abstract_execution import initialize_modules
 from iostrategies.execution.abstract_execution import initialize_functions
+from utils.tracing import tracer
+from utils.memory import memory_tracker
+from utils.variable_context import VariableContext
 
 
 logger = Logger(__name__)
@@ -18,9 +21,26 @@ class default(Execution):
 
     def execute(self):
         for ind, function in enumerate(self.function_list):
+            if self.variables.get_status().get(self.modules[ind].get('class_name')) is True:
+                logger.info('Module was executed successfully in the checkpointed run, skipping.',
+                            inp_class=self.modules[ind].get('class_name'), inp_func=self.func_name,
+                            created_by='system')
+                continue
+
             try:
-                function(self.modules[ind].get("params", {}))
+                if not getattr(self.init_modules[ind], 'streaming', False):
+                    self.variables.materialize_variables(VariableContext.get_module_variables(self.modules[ind]))
+
+                try:
+                    with tracer.span(str(self.modules[ind].get('class_name')), category='module',
+                                     func_name=self.func_name), \
+                            memory_tracker.measure('module', str(self.modules[ind].get('class_name')),
+                                                   self.variables):
+                        function(self.modules[ind].get("params", {}))
+                finally:
+                    self.variables.release_materialized()
                 self.variables.set_module_status(self.modules[ind].get('class_name'), True)
+                self.variables.release_variables(self.modules[ind].get('class_name'))
             except Exception as e:
                 self.variables.set_module_status(self.modules[ind].get('class_name'), False)
                 if self.error_handling == 'skip':
@@ -1,73 +1,508 @@
 import pandas as pd
-import cx_Oracle
-import psycopg2
-import mysql.connector
 from iostrategies.input_db.loader_pd import Loader
 from utils.logger import Logger
-import io
+from iostrategies.connection_pool import get_pool, SUPPORTED_DATABASES
+from utils.dtypes import optimize_dtypes, CATEGORY_THRESHOLD
+from utils.db_snapshot import DBSnapshot, DB_SNAPSHOT_DIR
+import os
+import functools
+import threading
+import contextvars
+from numbers import Number, Integral
+from concurrent.futures import ThreadPoolExecutor
+from utils.tracing import tracer
+from utils.chunks import ChunkSource, concat_chunks
 
 
 logger = Logger(__name__)
+
+# number of rows fetched from database at once
+DEFAULT_FETCH_SIZE = 50000
+
+# PostgreSQL type OIDs of columns whose COPY CSV values are parsed with fixed type, so all chunks have the same dtypes
+PG_TEXT_TYPES = [18, 19, 25, 114, 1042, 1043, 2950, 3802]
+PG_BOOL_TYPES = [16]
+PG_DATE_TYPES = [1082, 1114]
+PG_TIMESTAMPTZ_TYPES = [1184]
+
+
 @logger.for_all_methods(in_args=True)
 class DBLoader(Loader):
 
     def load(self, input_database: dict) -> None:
         """
-        Function connects to chosen type of the database with data from input dictionary. Afterwards function prepares
-        select query and read data from database. Requested columns and rows are stored as dataframe in variables.
+        Function reads data from database by read(). Requested columns and rows are stored as dataframe in variables.
 
         :param dict input_database: Dictionary that contains data necessary for establishing connection to database.
         :return None: No return value
         """
-        if input_database.get('type').lower() == 'postgresql':
-            connection = psycopg2.connect(database=input_database['db_name'], user=input_database['user'],
-                                          password=input_database['password'], host=input_database['url'],
-                                          port=input_database['port'])
-        elif input_database.get('type').lower() == 'mysql':
-            connection = mysql.connector.connect(database=input_database['db_name'], user=input_database['user'],
-                                                 password=input_database['password'], host=input_database['url'],
-                                                 port=input_database['port'])
-        elif input_database.get('type').lower() == 'oracle':
-            connection = cx_Oracle.connect(user=input_database['user'],
-                                           password=input_database['password'],
-                                           dsn='{}:{}/{}'.format(input_database['url'],
-                                                                 input_database['port'],
-                                                                 input_database['sid']))
-        else:
+        for variable_name, df in self.read(input_database).items():
+            self.variables.set_object(key=variable_name, obj=df)
+
+    def read(self, input_database: dict) -> dict:
+        """
+        Function takes connection to chosen type of the database from process-wide connection pool. Afterwards
+        function prepares select query and read data from database. Variable context is not accessed, so databases
+        can be read concurrently.
+
+        :param dict input_database: Dictionary that contains data necessary for establishing connection to database.
+        :return dict: Dictionary with variable name of each query as a key and loaded dataframe as value.
+        """
+        db_type = str(input_database.get('type')).lower()
+        if db_type not in SUPPORTED_DATABASES:
             logger.warning('Database type "{}" not recognized.'.format(input_database.get('type')), created_by='system')
-            return
+            return {}
 
+        dataframes = {}
         for query_name in input_database.get('query'):
             query_values = self.config.get_attr('queries').get(query_name)
-            if query_values.get('format_strategy') in self.config.get_attr('input_strategies'):
-                original_names, rename_names = self.get_columns_names(query_values.get('format_strategy'))
-                query = 'select {} from {} where {}'.format(','.join(original_names), query_values.get('table'),
-                                                            query_values.get('condition', 'True'))
-                df = DBLoader.read_sql_iostream(query=query, con=connection)
-                df.rename(columns=rename_names, inplace=True)
+            dataframes[query_values['variable_name']] = self.read_query(input_database, db_type, query_values)
+        return dataframes
+
+    def read_query(self, input_database: dict, db_type: str, query_values: dict) -> pd.DataFrame:
+        """
+        Reads one query of input database by pooled connection. If query contains 'partition', partitions of the
+        query are read concurrently and concatenated. If query contains 'chunk_size' (and no partition or watermark),
+        ChunkSource reading the query by chunks of this size is returned instead of dataframe.
+
+        :param dict input_database: Dictionary that contains data necessary for establishing connection to database.
+        :param str db_type: Type of the database.
+        :param dict query_values: Query from config.
+        :return: Loaded dataframe or ChunkSource.
+        """
+        pool = get_pool(input_database, self.config)
+        fetch_size = int(query_values.get('fetch_size', self.config.get_attr('db_fetch_size',
+                                                                           default=DEFAULT_FETCH_SIZE)))
+        if query_values.get('format_strategy') in self.config.get_attr('input_strategies'):
+            original_names, rename_names = self.get_columns_names(query_values.get('format_strategy'))
+            hints = self.get_dtype_hints(query_values.get('format_strategy'))
+        else:
+            original_names, rename_names, hints = None, None, {}
+
+        if query_values.get('chunk_size') and not query_values.get('partition') and not query_values.get('watermark'):
+            return self.read_chunks(input_database, db_type, query_values, original_names, rename_names)
+
+        if query_values.get('watermark'):
+            df = self.read_incremental(input_database, pool, db_type, query_values, original_names, fetch_size)
+        else:
+            df = self.fetch_query(pool, db_type, query_values, original_names, fetch_size)
+
+        if rename_names is not None:
+            df.rename(columns=rename_names, inplace=True)
+
+        if query_values.get('optimize_dtypes', self.config.get_attr('optimize_dtypes', default=False)):
+            df = optimize_dtypes(df, hints, self.config.get_attr('category_threshold', default=CATEGORY_THRESHOLD),
+                                 name=query_values.get('variable_name'))
+        return df
+
+    def read_chunks(self, input_database: dict, db_type: str, query_values: dict, columns: list,
+                    rename_names: dict) -> ChunkSource:
+        """
+        Creates chunk source reading the query by chunks of query's 'chunk_size' rows. Query is executed again
+        by pooled connection on each iteration of the source, dtypes of chunks are not optimized.
+
+        :param dict input_database: Dictionary that contains data necessary for establishing connection to database.
+        :param str db_type: Type of the database.
+        :param dict query_values: Query from config.
+        :param list columns: Selected columns, all columns are selected if None.
+        :param dict rename_names: Dictionary with original name as a key and final name as a value.
+        :return ChunkSource: Chunk source of the query.
+        """
+        query = DBLoader.build_query(query_values, '*' if columns is None else ','.join(columns))
+        logger.info('Table "{}" is read by chunks of {} rows.'.format(query_values.get('table'),
+                                                                       query_values['chunk_size']),
+                    created_by='system')
+        return ChunkSource(functools.partial(read_query_chunks, input_database, db_type, query,
+                                             int(query_values['chunk_size']), self.config),
+                           rename_names=rename_names)
+
+    def fetch_query(self, pool, db_type: str, query_values: dict, columns: list, fetch_size: int) -> pd.DataFrame:
+        """
+        Fetches selected columns of the query, by partitions if the query contains 'partition'.
+
+        :param ConnectionPool pool: Connection pool of the database.
+        :param str db_type: Type of the database.
+        :param dict query_values: Query from config.
+        :param list columns: Selected columns, all columns are selected if None.
+        :param int fetch_size: Number of rows fetched at once.
+        :return pd.DataFrame: Loaded dataframe.
+        """
+        columns = '*' if columns is None else ','.join(columns)
+        if query_values.get('partition'):
+            return self.read_partitions(pool, db_type, query_values, columns, fetch_size)
+
+        with pool.connection() as connection:
+            return DBLoader.read_sql(query=DBLoader.build_query(query_values, columns), con=connection,
+                                     db_type=db_type, chunk_size=fetch_size)
+
+    def read_incremental(self, input_database: dict, pool, db_type: str, query_values: dict, columns: list,
+                         fetch_size: int) -> pd.DataFrame:
+        """
+        Reads query with 'watermark' column incrementally. Rows fetched by previous runs are kept in local snapshot
+        (directory 'db_snapshot_directory' in config), only rows with watermark greater than or equal to maximal
+        watermark of the snapshot are fetched. Rows with the maximal watermark are fetched again, so rows committed
+        later with the same watermark are not missed. If the query contains 'watermark_key' columns, fetched rows
+        replace snapshot rows with the same key, otherwise they replace snapshot rows with the maximal watermark.
+
+        :param dict input_database: Dictionary that contains data necessary for establishing connection to database.
+        :param ConnectionPool pool: Connection pool of the database.
+        :param str db_type: Type of the database.
+        :param dict query_values: Query from config.
+        :param list columns: Selected columns, all columns are selected if None.
+        :param int fetch_size: Number of rows fetched at once.
+        :return pd.DataFrame: Snapshot merged with fetched rows.
+        """
+        watermark = query_values['watermark']
+        keys = query_values.get('watermark_key') or []
+        keys = [keys] if isinstance(keys, str) else list(keys)
+
+        # watermark and key columns are stored in snapshot even if they are not selected by format strategy
+        extra_columns = []
+        if columns is not None:
+            extra_columns = [column for column in [watermark] + keys
+                             if column not in columns and column not in extra_columns]
+            columns = list(columns) + extra_columns
+
+        snapshot = DBSnapshot(self.config.get_attr('db_snapshot_directory', default=DB_SNAPSHOT_DIR))
+        key = DBSnapshot.get_key(input_database, query_values, columns)
+        stored = snapshot.get(key)
+
+        if stored is None or stored.empty or stored[watermark].isna().all():
+            df = self.fetch_query(pool, db_type, query_values, columns, fetch_size)
+            logger.info('Table "{}" read fully, {} rows stored in snapshot.'.format(query_values.get('table'),
+                                                                                    len(df)), created_by='system')
+        else:
+            last_watermark = stored[watermark].max()
+            condition = '{} >= {}'.format(watermark, DBLoader.sql_literal(last_watermark))
+            incremental_values = dict(query_values, condition='({}) and ({})'.format(
+                query_values.get('condition', 'True'), condition))
+            fetched = self.fetch_query(pool, db_type, incremental_values, columns, fetch_size)
+
+            if keys:
+                df = stored if fetched.empty else pd.concat([stored, fetched], ignore_index=True, sort=False) \
+                    .drop_duplicates(subset=keys, keep='last').reset_index(drop=True)
             else:
-                query = 'select {} from {} where {}'.format('*', query_values.get('table'),
-                                                            query_values.get('condition', 'True'))
-                df = DBLoader.read_sql_iostream(query=query, con=connection)
-            self.variables.set_object(key=query_values['variable_name'], obj=df)
-        connection.close()
+                # rows with the maximal watermark were fetched again, together with rows committed later with the same
+                # watermark
+                kept = stored[stored[watermark] != last_watermark]
+                df = kept.reset_index(drop=True) if fetched.empty else \
+                    pd.concat([kept, fetched], ignore_index=True, sort=False)
+            logger.info('Table "{}" read incrementally after {} = {}, {} rows fetched.'
+                        .format(query_values.get('table'), watermark, last_watermark, len(fetched)),
+                        created_by='system')
+
+        if stored is None or df is not stored:
+            snapshot.put(key, df)
+
+        if extra_columns:
+            df = df.drop(columns=extra_columns)
+        return df
 
     @staticmethod
-    def read_sql_iostream(query: str,
-                          con: cx_Oracle.connect or psycopg2.connect or  mysql.connector.connect) -> pd.DataFrame:
+    def build_query(query_values: dict, columns: str, partition_condition: str = None) -> str:
         """
-        More effective way of loading content of database table to dataframe using io stream - StringIO.
+        Builds select query of the query from config.
+
+        :param dict query_values: Query from config with keys 'table' and optional 'condition'.
+        :param str columns: Selected columns separated by comma.
+        :param str partition_condition: Additional condition selecting one partition.
+        :return str: Select query.
+        """
+        condition = query_values.get('condition', 'True')
+        if partition_condition is not None:
+            condition = '({}) and ({})'.format(condition, partition_condition)
+        return 'select {} from {} where {}'.format(columns, query_values.get('table'), condition)
+
+    @staticmethod
+    def sql_literal(value) -> str:
+        """
+        Formats value as SQL literal, strings and dates are quoted.
+
+        :param value: Formatted value.
+        :return str: SQL literal.
+        """
+        if value is None:
+            return 'null'
+        if isinstance(value, Number):
+            return str(value)
+        return "'{}'".format(str(value).replace("'", "''"))
+
+    def get_partition_conditions(self, pool, db_type: str, query_values: dict) -> list:
+        """
+        Returns conditions selecting partitions of the query. Partition is given by key 'partition' of the query with
+        key 'column' and one of keys:
+        'values' - list of values (or lists of values) of the column, one partition per item,
+        'ranges' - list of [from, to) ranges of the column, null means open end,
+        'splits' - number of ranges of equal width between minimum and maximum of the column.
+        Rows with null in the column are read with the first range.
+
+        :param ConnectionPool pool: Connection pool of the database.
+        :param str db_type: Type of the database.
+        :param dict query_values: Query from config.
+        :return list: List of SQL conditions.
+        """
+        partition = query_values['partition']
+        column = partition['column']
+
+        if partition.get('values') is not None:
+            conditions = []
+            for value in partition['values']:
+                if isinstance(value, list):
+                    conditions.append('{} in ({})'.format(column, ','.join(map(DBLoader.sql_literal, value))))
+                else:
+                    conditions.append('{} = {}'.format(column, DBLoader.sql_literal(value)))
+            return conditions
+
+        if partition.get('ranges') is not None:
+            ranges = partition['ranges']
+        elif partition.get('splits') is not None:
+            with pool.connection() as connection:
+                bounds = DBLoader.read_sql(query=DBLoader.build_query(query_values, 'min({0}) as min_value, '
+                                                                                    'max({0}) as max_value'
+                                                                      .format(column)),
+                                           con=connection, db_type=db_type)
+            low, high = DBLoader.parse_bound(bounds.iloc[0, 0]), DBLoader.parse_bound(bounds.iloc[0, 1])
+            if pd.isna(low) or pd.isna(high):
+                return [None]
+
+            splits = max(1, int(partition['splits']))
+            # first and last ranges are open, so values formatted differently than the parsed bounds are not lost
+            if isinstance(low, Number) and isinstance(high, Number) and \
+                    not (isinstance(low, Integral) and isinstance(high, Integral)):
+                # fractional bounds are split by true division, floor division would round the edges down to low
+                edges = [None] + [low + (high - low) * index / splits for index in range(1, splits)] + [None]
+            else:
+                edges = [None] + [low + (high - low) * index // splits for index in range(1, splits)] + [None]
+            ranges = [[edges[index], edges[index + 1]] for index in range(splits)]
+        else:
+            raise Exception('Partition of table "{}" needs values, ranges or splits.'.format(query_values.get('table')))
+
+        conditions = []
+        for low, high in ranges:
+            parts = []
+            if low is not None:
+                parts.append('{} >= {}'.format(column, DBLoader.sql_literal(low)))
+            if high is not None:
+                parts.append('{} < {}'.format(column, DBLoader.sql_literal(high)))
+            conditions.append(' and '.join(parts) or 'True')
+
+        # rows with null in the partition column do not meet any range, they are read with the first partition
+        if conditions and conditions[0] != 'True':
+            conditions[0] = '({}) or {} is null'.format(conditions[0], column)
+        return conditions
+
+    @staticmethod
+    def parse_bound(value):
+        """
+        Parses minimum or maximum of partition column returned as text (e.g. dates of SQLite) into number or date,
+        so ranges between them can be computed.
+
+        :param value: Minimum or maximum of the column.
+        :return: Number, timestamp or the value itself if it is not text.
+        """
+        if not isinstance(value, str):
+            return value
+        try:
+            return pd.to_numeric(value)
+        except (ValueError, TypeError):
+            return pd.Timestamp(value)
+
+    def read_partitions(self, pool, db_type: str, query_values: dict, columns: str, fetch_size: int) -> pd.DataFrame:
+        """
+        Reads partitions of the query concurrently, each by its own pooled connection, and concatenates them in order
+        of partitions. Number of concurrent partitions is given by 'workers' of the partition or 'db_partition_workers'
+        in config.
+
+        :param ConnectionPool pool: Connection pool of the database.
+        :param str db_type: Type of the database.
+        :param dict query_values: Query from config.
+        :param str columns: Selected columns separated by comma.
+        :param int fetch_size: Number of rows fetched at once.
+        :return pd.DataFrame: Loaded dataframe.
+        """
+        conditions = self.get_partition_conditions(pool, db_type, query_values)
+        workers = int(query_values['partition'].get('workers', self.config.get_attr('db_partition_workers',
+                                                                                      default=4)))
+
+        def read_partition(condition):
+            with tracer.span(str(condition), category='io', table=query_values.get('table')):
+                with pool.connection() as connection:
+                    return DBLoader.read_sql(query=DBLoader.build_query(query_values, columns, condition),
+                                             con=connection, db_type=db_type, chunk_size=fetch_size)
+
+        def results(futures):
+            # futures are dropped once their partitions are copied, so partitions are released one by one
+            while futures:
+                yield futures.pop(0).result()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(conditions))),
+                                thread_name_prefix='partition') as executor:
+            # each partition is read in its own copy of the context, so its span is recorded into trace of the run
+            futures = [executor.submit(contextvars.copy_context().run, read_partition, condition)
+                       for condition in conditions]
+            df = concat_chunks(results(futures))
+
+        logger.info('Table "{}" read in {} partitions.'.format(query_values.get('table'), len(conditions)),
+                    created_by='system')
+        return df
+
+    @staticmethod
+    def read_sql(query: str, con, db_type: str, chunk_size: int = DEFAULT_FETCH_SIZE) -> pd.DataFrame:
+        """
+        Reads result of the query into dataframe by chunks of chunk_size rows, see iter_chunks. Chunks are released
+        as soon as their columns are copied into the result (concat_chunks), so memory peak is about the size of
+        the result plus one chunk and one column. Use 'chunk_size' of the query to keep only one chunk in memory.
 
         :param str query: Query select for accessing data in table.
         :param con: Connection to concrete database.
+        :param str db_type: Type of the database.
+        :param int chunk_size: Number of rows fetched at once.
         :return pd.Dataframe: Output dataframe loaded from database.
         """
+        return concat_chunks(DBLoader.iter_chunks(query=query, con=con, db_type=db_type, chunk_size=chunk_size))
+
+    @staticmethod
+    def iter_chunks(query: str, con, db_type: str, chunk_size: int = DEFAULT_FETCH_SIZE):
+        """
+        Reads result of the query by chunks of chunk_size rows. PostgreSQL result is streamed by COPY, results of other
+        databases are fetched by cursor.
+
+        :param str query: Query select for accessing data in table.
+        :param con: Connection to concrete database.
+        :param str db_type: Type of the database.
+        :param int chunk_size: Number of rows of one chunk.
+        :return: Generator of dataframes.
+        """
+        if db_type == 'postgresql':
+            return DBLoader.copy_chunks(query=query, con=con, chunk_size=chunk_size)
+        return DBLoader.fetch_chunks(query=query, con=con, db_type=db_type, chunk_size=chunk_size)
+
+    @staticmethod
+    def copy_chunks(query: str, con, chunk_size: int = DEFAULT_FETCH_SIZE):
+        """
+        Streams result of the query from PostgreSQL by COPY into dataframe chunks. COPY writes into a pipe in separate
+        thread and chunks are parsed from the other end of the pipe, so the whole result is never held as text.
+        Text, boolean and date columns are parsed with types from description of the query, so all chunks have
+        the same dtypes.
+
+        :param str query: Query select for accessing data in table.
+        :param con: Connection to PostgreSQL database.
+        :param int chunk_size: Number of rows of one chunk.
+        :return: Generator of dataframes.
+        """
         copy_sql = "COPY ({query}) TO STDOUT WITH CSV {head}".format(
             query=query, head="HEADER"
         )
-        cur = con.cursor()
-        store = io.StringIO()
-        cur.copy_expert(copy_sql, store)
-        store.seek(0)
-        df = pd.read_csv(store)
-        return df
+        column_types = DBLoader.get_copy_types(query, con)
+        text_columns = [column for column, type_code in column_types.items()
+                        if type_code not in PG_DATE_TYPES + PG_TIMESTAMPTZ_TYPES]
+        read_fd, write_fd = os.pipe()
+        errors = []
+
+        def copy():
+            try:
+                with open(write_fd, 'w', encoding='utf-8', newline='') as writer:
+                    con.cursor().copy_expert(copy_sql, writer)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=copy, name='copy')
+        thread.start()
+        try:
+            # closing the reader stops COPY by broken pipe if chunks are not read until the end
+            with open(read_fd, 'r', encoding='utf-8', newline='') as reader:
+                try:
+                    for chunk in pd.read_csv(reader, chunksize=chunk_size,
+                                             dtype={column: str for column in text_columns} or None):
+                        yield DBLoader.convert_copy_chunk(chunk, column_types)
+                except pd.errors.EmptyDataError:
+                    pass
+        finally:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def get_copy_types(query: str, con) -> dict:
+        """
+        Returns PostgreSQL types of text, boolean and date columns of the query from description of its empty result.
+        Types of COPY CSV values are not inferred per chunk for these columns, as a chunk with only numeric-looking or
+        missing values would be parsed into different dtype than other chunks.
+
+        :param str query: Query select for accessing data in table.
+        :param con: Connection to PostgreSQL database.
+        :return dict: Dictionary with column name as a key and type OID as a value.
+        """
+        cursor = con.cursor()
+        try:
+            cursor.execute('select * from ({}) as described limit 0'.format(query))
+            return {description[0]: description[1] for description in cursor.description
+                    if description[1] in PG_TEXT_TYPES + PG_BOOL_TYPES + PG_DATE_TYPES + PG_TIMESTAMPTZ_TYPES}
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def convert_copy_chunk(chunk: pd.DataFrame, column_types: dict) -> pd.DataFrame:
+        """
+        Converts boolean and date columns of COPY CSV chunk read as text to their types.
+
+        :param pd.DataFrame chunk: Chunk parsed from COPY CSV.
+        :param dict column_types: Dictionary with column name as a key and type OID as a value, see get_copy_types.
+        :return pd.DataFrame: Converted chunk.
+        """
+        for column, type_code in column_types.items():
+            if type_code in PG_BOOL_TYPES:
+                chunk[column] = chunk[column].map({'t': True, 'f': False}).astype(object)
+            elif type_code in PG_DATE_TYPES:
+                chunk[column] = pd.to_datetime(chunk[column])
+            elif type_code in PG_TIMESTAMPTZ_TYPES:
+                chunk[column] = pd.to_datetime(chunk[column], utc=True)
+        return chunk
+
+    @staticmethod
+    def fetch_chunks(query: str, con, db_type: str, chunk_size: int = DEFAULT_FETCH_SIZE):
+        """
+        Fetches result of the query by cursor with array size of chunk_size rows and builds dataframe chunks directly
+        from fetched rows. MySQL cursor is unbuffered, so rows are kept on the server until they are fetched.
+
+        :param str query: Query select for accessing data in table.
+        :param con: Connection to concrete database.
+        :param str db_type: Type of the database.
+        :param int chunk_size: Number of rows of one chunk.
+        :return: Generator of dataframes.
+        """
+        cursor = con.cursor(buffered=False) if db_type == 'mysql' else con.cursor()
+        try:
+            cursor.arraysize = chunk_size
+            if db_type == 'oracle' and hasattr(cursor, 'prefetchrows'):
+                # prefetchrows is available since cx_Oracle 8
+                cursor.prefetchrows = chunk_size + 1
+            cursor.execute(query)
+            columns = [description[0] for description in cursor.description]
+
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                yield pd.DataFrame(columns=columns)
+            while rows:
+                yield pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                rows = cursor.fetchmany(chunk_size)
+        finally:
+            cursor.close()
+
+
+def read_query_chunks(input_database: dict, db_type: str, query: str, chunk_size: int, config=None):
+    """
+    Reads result of the query by chunks by pooled connection, reader of ChunkSource created by DBLoader.read_chunks.
+    Connection is held until the last chunk is read or the generator is closed.
+
+    :param dict input_database: Dictionary that contains data necessary for establishing connection to database.
+    :param str db_type: Type of the database.
+    :param str query: Select query.
+    :param int chunk_size: Number of rows of one chunk.
+    :param ConfigParser config: Configuration with settings of connection pool.
+    :return: Generator of dataframes.
+    """
+    with get_pool(input_database, config).connection() as connection:
+        for chunk in DBLoader.iter_chunks(query=query, con=connection, db_type=db_type, chunk_size=chunk_size):
+            yield chunk
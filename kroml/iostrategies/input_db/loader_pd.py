@@ -1,5 +1,6 @@
 import abc
 from utils.logger import Logger
+from utils.dtypes import get_dtype_hints
 
 logger = Logger(__name__)
 @logger.for_all_methods(in_args=False,
@@ -38,3 +39,14 @@ class Loader(metaclass=abc.ABCMeta):
 
         original_names = list(rename_names.keys())
         return original_names, rename_names
+
+    def get_dtype_hints(self, strategy_name: str) -> dict:
+        """
+        Returns types declared with key 'dtype' in input strategy for visible columns, used by dtype optimization
+        of loaded dataframe.
+
+        :param str strategy_name: Name of the input strategy.
+        :return dict: Dictionary with final name of column as a key and declared type as a value, see
+                      utils.dtypes.get_dtype_hints.
+        """
+        return get_dtype_hints(self.config.get_attr('input_strategies')[strategy_name])
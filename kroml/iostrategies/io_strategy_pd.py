@@ -1,24 +1,140 @@
+import csv
+import functools
+import threading
+import numpy as np
 import pandas as pd
 import pickle
 from iostrategies.abstract_pd_strategy import Strategy
 from utils.logger import Logger
+from utils.columnar import is_arrow_available, is_arrow_file, read_frame, write_frame, scan_frame
+from utils.filters import normalize_filters, filter_columns, filter_frame
+from utils.chunks import ChunkSource
+from utils.input_cache import InputCache, INPUT_CACHE_DIR
+from utils.backends import get_backend
+from utils.dtypes import optimize_dtypes, CATEGORY_THRESHOLD
 
 logger = Logger(__name__)
 
+# number of rows of CSV chunk filtered at once when row filter is applied
+FILTER_CHUNK_SIZE = 100000
 
-@logger.for_all_methods(in_args=True)
+
+@logger.for_all_methods(in_args=True, skip_func=['__init__'])
 class IOStrategy(Strategy):
+    def __init__(self, config, variables):
+        super().__init__(config, variables)
+
+        # workbooks opened by streaming Excel loader, shared by all entries reading sheets of the same file
+        self.workbooks = {}
+        self.workbooks_lock = threading.Lock()
+
+    @staticmethod
+    def sniff_separator(file_name: str, sample_size: int = 65536) -> str:
+        """
+        Detects separator of CSV file from a sample at the beginning of the file.
+
+        :param str file_name: Path to the CSV file.
+        :param int sample_size: Number of characters used for detection.
+        :return str: Detected separator, ',' if it cannot be detected.
+        """
+        with open(file_name, 'r', newline='') as csv_file:
+            sample = csv_file.read(sample_size)
+
+        # the last line of the sample is usually incomplete
+        if len(sample) == sample_size and '\n' in sample:
+            sample = sample.rpartition('\n')[0]
+
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+        except csv.Error:
+            return ','
+
+    @staticmethod
+    def is_pyarrow_csv_available() -> bool:
+        """
+        Checks if pandas supports multithreaded pyarrow CSV parser (pandas 1.4+ with pyarrow installed).
+
+        :return bool
+        """
+        version = tuple(int(part) for part in pd.__version__.split('.')[:2] if part.isdigit())
+        return version >= (1, 4) and is_arrow_available()
+
+    def get_csv_options(self, input_file) -> (str, dict, bool):
+        """
+        Returns path and pd.read_csv options of CSV file. If 'fast_csv' is set in input_file or config, separator is
+        detected once from a sample and column types declared in format strategy are used, so no type inference
+        pass over the data is needed.
+
+        :param dict input_file: parameter containing key 'file_name' and optional keys 'original_names', 'dtypes',
+                'date_columns' and 'separator'.
+        :return (str, dict, bool): Path to the file, options of pd.read_csv and True if fast parsing is enabled.
+        """
+        file_name = self.config.get_attr('input_directory') + input_file.get('file_name')
+
+        if not input_file.get('fast_csv', self.config.get_attr('fast_csv', default=False)):
+            return file_name, {'usecols': input_file.get('original_names'), 'engine': 'python',
+                               'sep': input_file.get('separator', None)}, False
+
+        return file_name, {'usecols': input_file.get('original_names'),
+                           'sep': input_file.get('separator') or IOStrategy.sniff_separator(file_name),
+                           'dtype': input_file.get('dtypes') or None,
+                           'parse_dates': input_file.get('date_columns') or None}, True
+
     def csv_load(self, input_file) -> dict:
         """
         Function loads CSV file, which name is stored in input_file's 'file_name', into dataframe.
+        If 'fast_csv' is set in input_file or config, file is parsed by multithreaded pyarrow parser (or C parser
+        if pyarrow is not available) with column types declared in format strategy.
+
+        If input_file contains row filter 'conditions', file is read by chunks of 'filter_chunk_size' rows and only
+        rows meeting the conditions are kept from each chunk.
 
         :param dict input_file: parameter containing key 'file_name' to recognize which file to load and key
-                'original_names' to know which column to load.
+                'original_names' to know which column to load. Optional keys 'dtypes' and 'date_columns' contain
+                declared types of columns.
         :return dict
         """
-        return pd.read_csv(self.config.get_attr('input_directory') + input_file.get('file_name'),
-                           usecols=input_file.get('original_names'), engine='python',
-                           sep=input_file.get('separator', None))
+        file_name, options, fast_csv = self.get_csv_options(input_file)
+
+        if input_file.get('conditions'):
+            if fast_csv:
+                # pyarrow parser does not support reading by chunks
+                options.update(engine='c', low_memory=False)
+
+            chunk_size = int(self.config.get_attr('filter_chunk_size', default=FILTER_CHUNK_SIZE))
+            chunks = [filter_frame(chunk, input_file['conditions'])
+                      for chunk in pd.read_csv(file_name, chunksize=chunk_size, **options)]
+            if not chunks:
+                return pd.DataFrame(columns=options['usecols'])
+            return pd.concat(chunks, ignore_index=True)
+
+        if not fast_csv:
+            return pd.read_csv(file_name, **options)
+
+        if IOStrategy.is_pyarrow_csv_available():
+            try:
+                return pd.read_csv(file_name, engine='pyarrow', **options)
+            except (ValueError, TypeError) as e:
+                logger.warning('Pyarrow parser cannot read file "{}", using C parser: {}'.format(
+                    input_file.get('file_name'), e), created_by='system')
+
+        return pd.read_csv(file_name, engine='c', low_memory=False, **options)
+
+    def csv_chunks(self, input_file) -> ChunkSource:
+        """
+        Function creates chunk source reading CSV file, which name is stored in input_file's 'file_name', by chunks
+        of input_file's 'chunk_size' rows. File is read again on each iteration of the source.
+
+        :param dict input_file: parameter containing key 'file_name', 'chunk_size' and optional keys used by csv_load.
+        :return ChunkSource
+        """
+        file_name, options, fast_csv = self.get_csv_options(input_file)
+        if fast_csv:
+            # pyarrow parser does not support reading by chunks
+            options.update(engine='c', low_memory=False)
+
+        return ChunkSource(functools.partial(pd.read_csv, file_name, chunksize=int(input_file['chunk_size']),
+                                             **options))
 
     def csv_write(self, output_file) -> None:
         """
@@ -28,12 +144,97 @@ class IOStrategy(Strategy):
         :param dict output_file: Dictionary where are stored details about output file, dataframe.
         :return None: No return value
         """
+        if isinstance(output_file['df'], ChunkSource):
+            # chunks are appended one by one, header is written only with the first chunk
+            header = True
+            with open(output_file.get('file_name'), 'w', newline='') as handle:
+                for chunk in output_file['df']:
+                    chunk.to_csv(handle, index=False, header=header, sep=output_file.get('separator', ','))
+                    header = False
+            return None
+
         output_file['df'].to_csv(output_file.get('file_name'), index=False, header=True,
                                  sep=output_file.get('separator', ','))
 
+    def get_workbook(self, file_name: str) -> dict:
+        """
+        Returns handle of workbook opened in read-only streaming mode. Workbook is opened only once per run and
+        shared by all entries reading its sheets, handle contains lock which has to be held while reading from it.
+
+        :param str file_name: Path to the Excel file.
+        :return dict: Dictionary with keys 'workbook' (openpyxl workbook) and 'lock'.
+        """
+        with self.workbooks_lock:
+            handle = self.workbooks.setdefault(file_name, {'workbook': None, 'lock': threading.Lock()})
+
+        with handle['lock']:
+            if handle['workbook'] is None:
+                handle['workbook'] = get_backend('openpyxl').load_workbook(file_name, read_only=True,
+                                                                           data_only=True, keep_links=False)
+        return handle
+
+    def close_workbooks(self) -> None:
+        """
+        Closes all workbooks opened by streaming Excel loader.
+
+        :return None: No return value
+        """
+        with self.workbooks_lock:
+            for handle in self.workbooks.values():
+                with handle['lock']:
+                    if handle['workbook'] is not None:
+                        handle['workbook'].close()
+            self.workbooks = {}
+
+    def excel_stream_load(self, input_file) -> pd.DataFrame:
+        """
+        Function loads sheet of Excel (.xlsx, .xlsm) file from workbook opened in read-only streaming mode.
+        Only the range of columns containing 'original_names' is parsed.
+
+        :param dict input_file: parameter containing key 'file_name' to recognize which file to load and key
+                'original_names' to know which column to load.
+        :return pd.DataFrame
+        """
+        handle = self.get_workbook(self.config.get_attr('input_directory') + input_file.get('file_name'))
+        sheet_name = input_file.get('sheet_name', 0)
+
+        with handle['lock']:
+            workbook = handle['workbook']
+            sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+
+            header = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), None)
+            if header is None:
+                return pd.DataFrame(columns=input_file.get('original_names'))
+
+            if input_file.get('original_names') is None:
+                indexes = list(range(len(header)))
+            else:
+                missing = set(input_file['original_names']) - set(header)
+                if missing:
+                    raise Exception('Columns {} not found in sheet "{}" of file "{}".'.format(
+                        sorted(missing, key=str), sheet_name, input_file.get('file_name')))
+                indexes = [index for index, name in enumerate(header) if name in input_file['original_names']]
+
+            if not indexes:
+                return pd.DataFrame()
+
+            first = min(indexes)
+            positions = [index - first for index in indexes]
+            data = [[row[position] if position < len(row) else None for position in positions]
+                    for row in sheet.iter_rows(min_row=2, min_col=first + 1, max_col=max(indexes) + 1,
+                                               values_only=True)]
+
+        # dimensions of sheet often include formatted but empty rows at the end
+        while data and all(value is None for value in data[-1]):
+            data.pop()
+
+        return pd.DataFrame(data, columns=[header[index] for index in indexes]).infer_objects()
+
     def excel_load(self, input_file) -> dict:
         """
         Function loads Excel file, which name is stored in input_file's 'file_name' into dataframe.
+        If 'excel_streaming' is set in input_file or config and openpyxl is installed, .xlsx and .xlsm files are read
+        by excel_stream_load, other files by pd.read_excel.
 
         :param dict input_file: parameter containing key 'file_name' to recognize which file to load and key
                 'original_names' to know which column to load.
@@ -42,6 +243,14 @@ class IOStrategy(Strategy):
         if not input_file.get('sheet_name'):
             logger.warning('Sheet name was not specified. Using selected sheet.', created_by='system')
 
+        if input_file.get('excel_streaming', self.config.get_attr('excel_streaming', default=False)) and \
+                self.get_file_extension(input_file) in ('xlsx', 'xlsm'):
+            try:
+                get_backend('openpyxl')
+                return self.excel_stream_load(input_file)
+            except ImportError:
+                logger.warning('Openpyxl is not installed, using pd.read_excel.', created_by='system')
+
         return pd.read_excel(self.config.get_attr('input_directory') + input_file.get('file_name'),
                                sheet_name=input_file.get('sheet_name', 0), usecols=input_file.get('original_names'))
 
@@ -58,55 +267,347 @@ class IOStrategy(Strategy):
     def pickle_load(self, input_file) -> dict:
         """
         Function loads Pickle file, which name is stored in input_file's 'file_name'.
+        Dataframes written in columnar (Arrow IPC) format by pickle_write are memory-mapped and only columns
+        from 'original_names' are read.
 
         :param dict input_file: parameter containing file name to recognize which file to load.
         :return dict
         """
-        return pickle.load(open(self.config.get_attr('input_directory') + input_file.get('file_name'), "rb"))
+        file_name = self.config.get_attr('input_directory') + input_file.get('file_name')
+
+        if is_arrow_file(file_name):
+            return read_frame(file_name, columns=input_file.get('original_names'))
+
+        with open(file_name, "rb") as handle:
+            return pickle.load(handle)
 
     def pickle_write(self, output_file) -> None:
         """
         Function saves dataframe into Pickle (.pickle) file. Name of the dataframe is saved in output_file's 'df'
         and name of the final file is in output_file's 'file_name'.
+        If 'columnar_storage' is set in config, dataframe is written in columnar Arrow IPC format instead.
 
         :param dict output_file: Dictionary where are stored details about output file, dataframe.
         :return None: No return value
         """
+        if self.config.get_attr('columnar_storage', default=False) and isinstance(output_file['df'], pd.DataFrame):
+            if write_frame(output_file['df'], output_file.get('file_name')):
+                return None
+
         with open(output_file.get('file_name'), 'wb') as handle:
             pickle.dump(output_file['df'], handle)
 
+    def parquet_load(self, input_file) -> pd.DataFrame:
+        """
+        Function loads Parquet file, which name is stored in input_file's 'file_name', into dataframe. Only columns
+        from 'original_names' are read from the file and the file is memory-mapped. Row filter 'conditions' is
+        evaluated during the scan, so row groups without matching rows are skipped.
+
+        :param dict input_file: parameter containing key 'file_name' to recognize which file to load and key
+                'original_names' to know which column to load.
+        :return pd.DataFrame
+        """
+        if input_file.get('conditions'):
+            return scan_frame(self.config.get_attr('input_directory') + input_file.get('file_name'), 'parquet',
+                              columns=input_file.get('original_names'), conditions=input_file['conditions'])
+
+        return pd.read_parquet(self.config.get_attr('input_directory') + input_file.get('file_name'),
+                               columns=input_file.get('original_names'), memory_map=True)
+
+    def parquet_write(self, output_file) -> None:
+        """
+        Function saves dataframe into Parquet (.parquet) file. Name of the dataframe is saved in output_file's 'df'
+        and name of the final file is in output_file's 'file_name'.
+
+        :param dict output_file: Dictionary where are stored details about output file, dataframe.
+        :return None: No return value
+        """
+        output_file['df'].to_parquet(output_file.get('file_name'), index=False)
+
+    def feather_load(self, input_file) -> pd.DataFrame:
+        """
+        Function loads Feather / Arrow IPC file, which name is stored in input_file's 'file_name', into dataframe.
+        Arrow IPC (Feather V2) file is memory-mapped and only columns from 'original_names' are read. Row filter
+        'conditions' is evaluated during the scan of Arrow IPC file and after loading of older Feather file.
+
+        :param dict input_file: parameter containing key 'file_name' to recognize which file to load and key
+                'original_names' to know which column to load.
+        :return pd.DataFrame
+        """
+        file_name = self.config.get_attr('input_directory') + input_file.get('file_name')
+
+        if is_arrow_file(file_name):
+            if input_file.get('conditions'):
+                return scan_frame(file_name, 'ipc', columns=input_file.get('original_names'),
+                                  conditions=input_file['conditions'])
+            return read_frame(file_name, columns=input_file.get('original_names'))
+
+        df = pd.read_feather(file_name, columns=input_file.get('original_names'))
+        if input_file.get('conditions'):
+            return filter_frame(df, input_file['conditions'])
+        return df
+
+    def feather_write(self, output_file) -> None:
+        """
+        Function saves dataframe into Feather / Arrow IPC (.feather, .arrow) file. Name of the dataframe is saved
+        in output_file's 'df' and name of the final file is in output_file's 'file_name'.
+
+        :param dict output_file: Dictionary where are stored details about output file, dataframe.
+        :return None: No return value
+        """
+        if not write_frame(output_file['df'].reset_index(drop=True), output_file.get('file_name')):
+            raise Exception('Dataframe cannot be written into Arrow file "{}".'.format(output_file.get('file_name')))
+
+    def npy_load(self, input_file) -> pd.DataFrame:
+        """
+        Function loads NumPy (.npy) file, which name is stored in input_file's 'file_name', into dataframe.
+        Array is memory-mapped. Fields of structured array are columns of the dataframe, columns of plain array are
+        named by their positions ('0', '1', ...). Only columns from 'original_names' are selected.
+
+        :param dict input_file: parameter containing key 'file_name' to recognize which file to load and key
+                'original_names' to know which column to load.
+        :return pd.DataFrame
+        """
+        array = np.load(self.config.get_attr('input_directory') + input_file.get('file_name'), mmap_mode='r')
+        columns = input_file.get('original_names')
+
+        if array.dtype.names is not None:
+            return pd.DataFrame(array[columns] if columns is not None else array)
+
+        if array.ndim == 1:
+            array = array.reshape(-1, 1)
+        df = pd.DataFrame(array, columns=[str(position) for position in range(array.shape[1])])
+        return df[columns] if columns is not None else df
+
+    def npy_write(self, output_file) -> None:
+        """
+        Function saves dataframe into NumPy (.npy) file as structured array. Name of the dataframe is saved
+        in output_file's 'df' and name of the final file is in output_file's 'file_name'.
+        String columns are stored as fixed-width unicode fields, so the file can be memory-mapped without pickle.
+
+        :param dict output_file: Dictionary where are stored details about output file, dataframe.
+        :return None: No return value
+        """
+        df = output_file['df']
+        column_dtypes = {}
+        for column_name in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[column_name]) and \
+                    not pd.api.types.is_datetime64_any_dtype(df[column_name]):
+                width = df[column_name].astype(str).str.len().max()
+                column_dtypes[column_name] = '<U{}'.format(max(1, int(width) if pd.notna(width) else 1))
+
+        np.save(output_file.get('file_name'), df.to_records(index=False, column_dtypes=column_dtypes),
+                allow_pickle=False)
+
     def graph_write(self, output_file):
         pass
 
-    def load(self, input_file) -> None:
+    def get_input_cache(self, input_file: dict, extension: str) -> InputCache:
+        """
+        Returns cache of parsed input files if it is enabled for the file by 'cache' in input_file or 'input_cache'
+        in config and the file type is worth caching.
+
+        :param dict input_file: Input file from config.
+        :param str extension: Type of the file.
+        :return InputCache: Input cache or None if the file is not cached.
+        """
+        if self.type_dict.get(extension) not in self.cached_types or \
+                not input_file.get('cache', self.config.get_attr('input_cache', default=False)):
+            return None
+
+        size = self.config.get_attr('input_cache_size_mb')
+        return InputCache(self.config.get_attr('input_cache_directory', default=INPUT_CACHE_DIR),
+                          max_bytes=int(float(size) * 1024 * 1024) if size else None,
+                          content_hash=self.config.get_attr('input_cache_hash', default=False))
+
+    def get_reader_options(self, input_file: dict, extension: str) -> dict:
+        """
+        Returns effective reader settings of the input file, which change parsed dataframe and so are part of its
+        input cache key: resolved CSV parser ('python', 'c' or 'pyarrow') and if Excel file is streamed by openpyxl.
+
+        :param dict input_file: Input file from config.
+        :param str extension: Type of the file.
+        :return dict: Reader settings of the file type, empty for other types.
+        """
+        file_type = self.type_dict.get(extension)
+        if file_type == 'csv':
+            if not input_file.get('fast_csv', self.config.get_attr('fast_csv', default=False)):
+                return {'csv_engine': 'python'}
+            if normalize_filters(input_file.get('filter')) or not IOStrategy.is_pyarrow_csv_available():
+                return {'csv_engine': 'c'}
+            return {'csv_engine': 'pyarrow'}
+
+        if file_type == 'excel':
+            streaming = bool(input_file.get('excel_streaming', self.config.get_attr('excel_streaming',
+                                                                                   default=False))) and \
+                extension in ('xlsx', 'xlsm')
+            if streaming:
+                try:
+                    get_backend('openpyxl')
+                except ImportError:
+                    streaming = False
+            return {'excel_streaming': streaming}
+
+        return {}
+
+    def is_optimize_dtypes(self, input_file: dict) -> bool:
+        """
+        Checks if dtypes of loaded dataframe are optimized, set by 'optimize_dtypes' in input_file or config.
+
+        :param dict input_file: Input file from config.
+        :return bool
+        """
+        return bool(input_file.get('optimize_dtypes', self.config.get_attr('optimize_dtypes', default=False)))
+
+    @staticmethod
+    def get_read_columns(columns: list, conditions: list) -> list:
+        """
+        Returns columns which have to be read from file to evaluate row filter.
+
+        :param list columns: Requested columns, None for all columns.
+        :param list conditions: Normalized row filter.
+        :return list: Requested columns followed by other columns used in the filter, None for all columns.
+        """
+        if columns is None:
+            return None
+        return list(columns) + [column for column in filter_columns(conditions) if column not in columns]
+
+    def load_filtered(self, extension: str, input_file: dict) -> pd.DataFrame:
+        """
+        Calls loader of the file type. If input_file contains row 'filter', columns used by the filter are read
+        together with 'original_names'. Loaders of filtered_types apply the filter while reading the file, other
+        dataframes are filtered right after loading. Columns used only by the filter are dropped.
+
+        :param str extension: Type of the file.
+        :param dict input_file: Input file from config with optional key 'original_names'.
+        :return pd.DataFrame
+        """
+        load = self.__getattribute__(self.type_dict.get(extension) + '_load')
+        conditions = normalize_filters(input_file.get('filter'))
+        if not conditions:
+            return load(input_file)
+
+        columns = input_file.get('original_names')
+        read_columns = IOStrategy.get_read_columns(columns, conditions)
+
+        if self.type_dict.get(extension) in self.filtered_types:
+            df = load(dict(input_file, original_names=read_columns, conditions=conditions))
+        else:
+            df = filter_frame(load(dict(input_file, original_names=read_columns)), conditions)
+
+        if columns is not None and len(read_columns) > len(columns):
+            df = df.drop(columns=read_columns[len(columns):])
+        return df
+
+    def read(self, input_file) -> object:
         '''
-        Function loads file, which name and type is stored in input_file's 'file_name' into dataframe (name stored
-        in input_file's 'variable_name') with or without renaming columns - according to 'format_strategy'.
-        Dataframe is stored as object in variables with a key as input_file's 'variable_name'.
+        Function reads file, which name and type is stored in input_file's 'file_name' into dataframe with or without
+        renaming columns - according to 'format_strategy'. Variable context is not accessed, so files can be read
+        concurrently.
+        If input_file contains 'chunk_size' and the file type can be read by chunks, ChunkSource reading the file by
+        chunks of this number of rows is returned instead of dataframe.
+        If input_file contains row 'filter' (see utils.filters.normalize_filters) on original names of columns, only
+        rows meeting it are loaded.
+        If input cache is enabled, parsed dataframe is stored in the cache and unchanged file is not parsed again.
+        If dtype optimization is enabled, low-cardinality string columns are converted to categoricals and numeric
+        columns are downcast, columns with 'dtype' in format strategy are converted to this type.
         :param dict input_file: Function takes as a parameter dictionary, that contains name of the file that should be
-        loaded with a key 'file_name', a name of object where this file will be written with a key 'variable_name'
-        and optional key 'format_strategy' where the value is a name of input strategy to be used to map column names.
-        :return: None
+        loaded with a key 'file_name' and optional key 'format_strategy' where the value is a name of input strategy
+        to be used to map column names.
+        :return: Loaded dataframe or ChunkSource
         '''
         extension = self.get_file_extension(input_file)
 
-        if self.type_dict.get(extension):
+        if self.type_dict.get(extension) and input_file.get('chunk_size'):
+            if self.type_dict.get(extension) not in self.chunked_types:
+                raise Exception('File "{}" cannot be loaded by chunks.'.format(input_file.get('file_name')))
+
+            if input_file.get('format_strategy') in self.config.get_attr('input_strategies'):
+                original_names, rename_names = self.get_columns_names(input_file.get('format_strategy'))
+                dtypes, date_columns = self.get_columns_types(input_file.get('format_strategy'))
+            else:
+                logger.warning(message='Strategy not found. Loading all columns.', created_by='system')
+                original_names, rename_names, dtypes, date_columns = None, {}, {}, []
+
+            conditions = normalize_filters(input_file.get('filter'))
+            chunk_source = self.__getattribute__(self.type_dict.get(extension) + '_chunks')(
+                dict(input_file, original_names=IOStrategy.get_read_columns(original_names, conditions),
+                     dtypes=dtypes, date_columns=date_columns))
+            chunk_source.rename_names = rename_names
+
+            if conditions:
+                # filter is applied on renamed chunks
+                chunk_source = chunk_source.map(functools.partial(
+                    filter_frame, conditions=[(rename_names.get(column, column), operator, value)
+                                              for column, operator, value in conditions],
+                    columns=None if original_names is None else [rename_names[name] for name in original_names]))
+
+            return chunk_source
+        elif self.type_dict.get(extension):
+            input_cache = self.get_input_cache(input_file, extension)
+            if input_cache is not None:
+                cache_key = input_cache.get_key(
+                    self.config.get_attr('input_directory') + input_file.get('file_name'),
+                    dict(input_file, **self.get_reader_options(input_file, extension),
+                         optimize_dtypes=self.is_optimize_dtypes(input_file),
+                         category_threshold=self.config.get_attr('category_threshold', default=CATEGORY_THRESHOLD)),
+                    self.config.get_attr('input_strategies').get(input_file.get('format_strategy')))
+                df = input_cache.get(cache_key)
+                if df is not None:
+                    logger.info('File "{}" loaded from input cache.'.format(input_file.get('file_name')),
+                                created_by='system')
+                    return df
+
             if input_file.get('format_strategy') in self.config.get_attr('input_strategies'):
                 original_names, rename_names = self.get_columns_names(input_file.get('format_strategy'))
+                dtypes, date_columns = self.get_columns_types(input_file.get('format_strategy'))
 
-                input_file['original_names'] = original_names
-                df = self.__getattribute__(self.type_dict.get(extension)+'_load')(input_file)
-                input_file.pop('original_names')
+                df = self.load_filtered(extension, dict(input_file, original_names=original_names, dtypes=dtypes,
+                                                        date_columns=date_columns))
 
                 df.rename(columns=rename_names, inplace=True)
+                hints = self.get_dtype_hints(input_file.get('format_strategy'))
             else:
                 logger.warning(message='Strategy not found. Loading all columns.', created_by='system')
-                df = self.__getattribute__(self.type_dict.get(extension)+'_load')(input_file)
+                df = self.load_filtered(extension, input_file)
+                hints = {}
 
-            self.variables.set_object(key=input_file['variable_name'], obj=df)
+            if self.is_optimize_dtypes(input_file):
+                df = optimize_dtypes(df, hints,
+                                     self.config.get_attr('category_threshold', default=CATEGORY_THRESHOLD),
+                                     name=input_file.get('file_name'))
+
+            if input_cache is not None:
+                input_cache.put(cache_key, df)
+            return df
         else:
             raise Exception('Extension of the file "{}" not recognized'.format(input_file.get('file_name')))
 
+    def load(self, input_file) -> None:
+        '''
+        Function loads file, which name and type is stored in input_file's 'file_name' into dataframe (name stored
+        in input_file's 'variable_name') with or without renaming columns - according to 'format_strategy'.
+        Dataframe is stored as object in variables with a key as input_file's 'variable_name'.
+        :param dict input_file: Function takes as a parameter dictionary, that contains name of the file that should be
+        loaded with a key 'file_name', a name of object where this file will be written with a key 'variable_name'
+        and optional key 'format_strategy' where the value is a name of input strategy to be used to map column names.
+        :return: None
+        '''
+        self.variables.set_object(key=input_file['variable_name'], obj=self.read(input_file))
+
+    @staticmethod
+    def select_columns(df: pd.DataFrame, rename_names: dict, final_names: list) -> pd.DataFrame:
+        """
+        Renames columns of dataframe and keeps only columns from final_names.
+
+        :param pd.DataFrame df: Written dataframe.
+        :param dict rename_names: Dictionary with original name as a key and final name as a value.
+        :param list final_names: Names of columns to be written.
+        :return pd.DataFrame
+        """
+        df = df.rename(columns=rename_names)
+        return df[df.columns.intersection(final_names)]
+
     def save(self, output_file) -> None:
         '''
         Method for choosing saving output file in corret type by choosing correct funtion according to file type.
@@ -121,14 +622,20 @@ class IOStrategy(Strategy):
             file['separator'] = output_file.get('separator', ',')
 
             if self.variables.get_object(key=output_file['variable_name']) is not None:
+                file['df'] = self.variables.get_object(key=output_file.get('variable_name'))
+                if isinstance(file['df'], ChunkSource) and self.type_dict.get(extension) not in self.chunked_types:
+                    file['df'] = file['df'].materialize()
+
                 if output_file.get('format_strategy') in self.config.get_attr('output_strategies'):
                     final_names, rename_names = super().get_columns_names(output_file.get('format_strategy'))
                     file['file_name'] = self.check_file_name(file['file_name'])
 
-                    file['df'] = self.variables.get_object(key=output_file.get('variable_name')).rename(columns=rename_names)
-                    file['df'] = file['df'][file['df'].columns.intersection(final_names)]
-                else:
-                    file['df'] = self.variables.get_object(key=output_file.get('variable_name'))
+                    if isinstance(file['df'], ChunkSource):
+                        file['df'] = file['df'].map(functools.partial(IOStrategy.select_columns,
+                                                                      rename_names=rename_names,
+                                                                      final_names=final_names))
+                    else:
+                        file['df'] = IOStrategy.select_columns(file['df'], rename_names, final_names)
 
                 self.__getattribute__(self.type_dict.get(extension)+'_write')(file)
             else:
@@ -136,4 +643,19 @@ class IOStrategy(Strategy):
                                'in utils/config/config.json'.format(output_file.get('variable_name')),
                                created_by='system')
         else:
-            raise Exception('Extension of the file "{}" not recognized'.format(output_file.get('file_name')))
\ No newline at end of file
+            raise Exception('Extension of the file "{}" not recognized'.format(output_file.get('file_name')))
+
+
+def read_input_file(config, input_file: dict) -> dict:
+    """
+    Reads input file in worker process of input process pool.
+
+    :param ConfigParser config: Configuration of the run.
+    :param dict input_file: Input file from config, see IOStrategy.read.
+    :return dict: Dictionary with variable name as a key and loaded dataframe as value.
+    """
+    strategy = IOStrategy(config, None)
+    try:
+        return {input_file['variable_name']: strategy.read(input_file)}
+    finally:
+        strategy.close_workbooks()
@@ -1,11 +1,15 @@
 import pandas as pd
 from iostrategies.output_db.writer_pd import Writer
 from utils.logger import Logger
-import sqlalchemy
+from iostrategies.connection_pool import get_pool, get_paramstyle, SUPPORTED_DATABASES
+from utils.chunks import ChunkSource
 import io
 
 logger = Logger(__name__)
 
+# number of rows written into database at once
+DEFAULT_WRITE_CHUNK_SIZE = 10000
+
 
 @logger.for_all_methods(in_args=True)
 class DBWriter(Writer):
@@ -14,6 +18,8 @@ class DBWriter(Writer):
         """
         Function that provides recognition of output database, connection and writing content of dataframe into it.
          It also renames names of column if format strategy is available and writing only visible columns.
+         Connection is taken from process-wide connection pool shared with DBLoader. Dataframe or chunk source is
+         written by chunks of 'db_write_chunk_size' rows, committed per chunk or per transaction ('db_commit').
 
         :param dict output_database: Dictionary where are stored details about output database like its name, type,
         parameters for connecting to database and format strategy for column mapping.
@@ -22,42 +28,107 @@ class DBWriter(Writer):
 
         db_name = str(output_database.get('type')).lower()
 
-        if db_name not in ['postgresql', 'mysql', 'oracle']:
+        if db_name not in SUPPORTED_DATABASES:
             logger.warning('Database type "{}" not recognized.'.format(output_database.get('type')),
                            created_by='system')
             return None
 
-        # establishing database connection with SQLAlchemy Engine
-        engine = sqlalchemy.create_engine(
-            '{}://{}:{}@{}:{}/{}'.format(db_name, output_database['user'], output_database['password'],
-                                         output_database['url'], output_database['port'],
-                                         output_database['db_name']))
+        pool = get_pool(output_database, self.config)
 
         # writing dataframe to sql database
         for query_name in output_database.get('query'):
             if query_name in self.config.query:
                 query_values = self.config.get_attr('queries').get(query_name)
-                if self.variables.get_object(key=query_values['variable_name']) is not None:
+                data = self.variables.get_object(key=query_values['variable_name'])
+
+                if data is not None:
+                    chunk_size = int(query_values.get('write_chunk_size', self.config.get_attr(
+                        'db_write_chunk_size', default=DEFAULT_WRITE_CHUNK_SIZE)))
+                    commit_chunks = str(query_values.get('commit', self.config.get_attr(
+                        'db_commit', default='transaction'))).lower() == 'chunk'
 
+                    chunks = DBWriter.iter_chunks(data, chunk_size)
                     if query_values.get('format_strategy') in self.config.get_attr('output_strategies'):
                         final_names, rename_names = super().get_columns_names(query_values.get('format_strategy'))
-                        df = self.variables.get_object(key=query_values.get('variable_name')).rename(
-                            columns=rename_names)
-                        df = df[df.columns.intersection(final_names)]
-                        # replace Nan with None so SQL can convert it to Null
-                        df = df.replace({pd.np.nan: None})
-                    else:
-                        df = self.variables.get_object(key=query_values.get('variable_name'))
-                    DBWriter.write_iostream_to_database(engine=engine, tablename=query_values['table'],
-                                                        dataframe=df)
+                        chunks = (DBWriter.format_chunk(chunk, rename_names, final_names) for chunk in chunks)
+
+                    with pool.connection() as conn:
+                        rows = DBWriter.write_chunks(conn=conn, db_name=db_name, tablename=query_values['table'],
+                                                     chunks=chunks, commit_chunks=commit_chunks)
+                    logger.info('{} rows written into table "{}".'.format(rows, query_values['table']),
+                                created_by='system')
+
+    @staticmethod
+    def iter_chunks(data, chunk_size: int):
+        """
+        Yields dataframe or chunks of chunk source by slices of at most chunk_size rows. Slices are views of the
+        dataframe, so no copy of whole dataframe is made.
+
+        :param data: Dataframe or ChunkSource.
+        :param int chunk_size: Maximal number of rows of one chunk.
+        :return: Generator of dataframe chunks.
+        """
+        chunk_size = max(1, chunk_size)
+        frames = data if isinstance(data, ChunkSource) else [data]
+        for frame in frames:
+            for start in range(0, len(frame), chunk_size):
+                yield frame.iloc[start:start + chunk_size]
 
     @staticmethod
-    def write_iostream_to_database(engine: sqlalchemy.engine.Engine, tablename: str,
-                                   dataframe: pd.DataFrame) -> None:
+    def format_chunk(chunk: pd.DataFrame, rename_names: dict, final_names: list) -> pd.DataFrame:
         """
-        More effective way of saving dataframe into database using io stream - StringIO.
+        Renames columns of the chunk according to format strategy and keeps only visible columns.
 
-        :param sqlalchemy.engine.Engine engine: SQL Alchemy engine for connection to databse.
+        :param pd.DataFrame chunk: Written chunk.
+        :param dict rename_names: Dictionary with original name as a key and final name as a value.
+        :param list final_names: Visible columns.
+        :return pd.DataFrame: Formatted chunk.
+        """
+        chunk = chunk.rename(columns=rename_names)
+        return chunk[chunk.columns.intersection(final_names)]
+
+    @staticmethod
+    def write_chunks(conn, db_name: str, tablename: str, chunks, commit_chunks: bool = False) -> int:
+        """
+        Writes chunks into the table by the fastest bulk API of the database: COPY for PostgreSQL and batched
+        executemany for other databases. Chunks are committed one by one if commit_chunks is set, otherwise they
+        are written in one transaction, which is rolled back by connection pool on error.
+
+        :param conn: DBAPI connection to the database.
+        :param str db_name: Type of the database.
+        :param str tablename: Name of the table in database, where will be content of chunks appended.
+        :param chunks: Iterable of dataframe chunks.
+        :param bool commit_chunks: If True, each chunk is committed separately.
+        :return int: Number of written rows.
+        """
+        paramstyle = None if db_name == 'postgresql' else get_paramstyle(db_name)
+        rows = 0
+
+        cursor = conn.cursor()
+        try:
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+                if db_name == 'postgresql':
+                    DBWriter.write_iostream_to_database(cursor=cursor, tablename=tablename, dataframe=chunk)
+                else:
+                    DBWriter.write_rows_to_database(cursor=cursor, tablename=tablename, dataframe=chunk,
+                                                    paramstyle=paramstyle)
+                rows += len(chunk)
+                if commit_chunks:
+                    conn.commit()
+            conn.commit()
+        finally:
+            cursor.close()
+        return rows
+
+    @staticmethod
+    def write_iostream_to_database(cursor, tablename: str, dataframe: pd.DataFrame) -> None:
+        """
+        More effective way of saving dataframe into PostgreSQL using io stream - StringIO and COPY in CSV format.
+        Missing values are written as unquoted empty fields, which COPY reads as Null.
+
+        :param cursor: Cursor of DBAPI connection to PostgreSQL database.
         :param str tablename: Name of the table in database, where will be content of dataframe appended.
         :param pd.Datafram dataframe: Dataframe, whose content will be appended to databse.
         :return None: No return value.
@@ -68,8 +139,30 @@ class DBWriter(Writer):
         dataframe.to_csv(store, index=False, header=False)
         store.seek(0)
 
-        conn = engine.connect().connection
-        cursor = conn.cursor()
-        cursor.copy_from(store, tablename, columns=dataframe.columns, sep=',', null='null')
-        conn.commit()
-        conn.close()
+        cursor.copy_expert('COPY {} ({}) FROM STDIN WITH CSV'.format(tablename, ','.join(map(str, dataframe.columns))),
+                           store)
+
+    @staticmethod
+    def write_rows_to_database(cursor, tablename: str, dataframe: pd.DataFrame, paramstyle: str) -> None:
+        """
+        Saves dataframe into database, which does not support COPY, by one executemany insert. Drivers send rows
+        of executemany in batches (array binding of cx_Oracle, multi-row insert of MySQL). Missing values are
+        replaced by None in rows of the chunk, so SQL converts them to Null.
+
+        :param cursor: Cursor of DBAPI connection to the database.
+        :param str tablename: Name of the table in database, where will be content of dataframe appended.
+        :param pd.Datafram dataframe: Dataframe, whose content will be appended to databse.
+        :param str paramstyle: DBAPI paramstyle of the database driver.
+        :return None: No return value.
+        """
+        if paramstyle == 'qmark':
+            placeholders = ['?'] * len(dataframe.columns)
+        elif paramstyle in ('numeric', 'named'):
+            placeholders = [':{}'.format(position + 1) for position in range(len(dataframe.columns))]
+        else:
+            placeholders = ['%s'] * len(dataframe.columns)
+
+        query = 'insert into {} ({}) values ({})'.format(tablename, ','.join(map(str, dataframe.columns)),
+                                                         ','.join(placeholders))
+
+        cursor.executemany(query, dataframe.astype(object).where(pd.notna(dataframe), None).values.tolist())
@@ -5,6 +5,9 @@ from utils.logger import Logger
 
 from utils.config_parser import ConfigParser
 from utils.variable_context import VariableContext
+from utils.backends import log_import_report
+from utils.tracing import tracer
+from utils.memory import memory_tracker
 
 from managers.input_manager import InputManager
 from managers.module_manager import ModuleManager
@@ -26,6 +29,8 @@ class MainExecution:
         self.module_manager = None
         self.output_manager = None
 
+        self.execution_count = 0
+
         self.initialize()
 
     def set_input_params(self, config_json):
@@ -35,7 +40,9 @@ class MainExecution:
 
     def initialize(self):
 
-        Logger.set_logger_settings(l_stream=sys.stdout, l_filename=self.config.get_attr('log_file'))
+        Logger.set_logger_settings(l_stream=sys.stdout, l_filename=self.config.get_attr('log_file'),
+                                   l_queue=self.config.get_attr('log_queue', default=False))
+        Logger.set_instrumentation(self.config.get_attr('instrumentation', default='stats'))
 
         self.variables = VariableContext(self.config)
 
@@ -47,16 +54,35 @@ class MainExecution:
 
         self.config.update_config(run_json)
 
-        self.variables = VariableContext(self.config)
+        # managers and modules keep reference to the variable context, so it is reinitialized in place
+        self.variables.initialize()
+
+        self.execution_count += 1
+        trace = tracer.start(enabled=self.config.get_attr('trace', default=False))
+        memory_report = memory_tracker.start(enabled=self.config.get_attr('memory_report', default=False))
 
         try:
-            self.input_manager.execute()
-            self.module_manager.execute()
-            self.output_manager.execute()
+            with tracer.span('MainExecution.execute', category='run', run_id=str(Logger.run_id)):
+                self.input_manager.execute()
+                self.module_manager.execute()
+                self.output_manager.execute()
         except Exception as e:
             raise e
         finally:
-            self.variables.save_context()
+            try:
+                with tracer.span('VariableContext.save_context', category='io'):
+                    self.variables.save_context()
+                report_name = f"{Logger.run_id}_{self.execution_count}.json"
+                report_dir = os.path.dirname(self.config.get_attr('log_file'))
+                tracer.save(os.path.join(report_dir, 'trace_' + report_name), run_id=Logger.run_id, trace=trace)
+                memory_tracker.save(os.path.join(report_dir, 'memory_' + report_name), run_id=Logger.run_id,
+                                    report=memory_report)
+            finally:
+                # tracemalloc is shared with concurrent runs, so the run is unregistered even if saving failed
+                memory_tracker.stop(memory_report)
+            log_import_report()
+            Logger.log_method_stats()
+            Logger.flush_logs()
             return self.variables.get_object('response')
 
 
@@ -1,17 +1,41 @@
+import contextvars
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from managers.manager import Manager
 from utils.logger import Logger
 from iostrategies.input_db.db_loader_pd import DBLoader
-from iostrategies.io_strategy_pd import IOStrategy
+from iostrategies.io_strategy_pd import IOStrategy, read_input_file
+from utils.tracing import tracer
+from utils.memory import memory_tracker
 
 logger = Logger(__name__)
 
 
-@logger.for_all_methods(in_args=False, skip_func=['get_input_files', 'get_input_db'])
+@logger.for_all_methods(in_args=False, skip_func=['__init__', 'get_input_files', 'get_input_db', 'load_input',
+                                                  'read_file', 'read_db', 'store_input', 'handle_input_error',
+                                                  'is_process_input', 'submit_process_input'])
 class InputManager(Manager):
     """
     Inherits from Manager and it is responsible for opening and reading input files and their saving into
     dataframes inside of variable objects alongside with handling exceptions that could appear during process.
+
+    If 'input_workers' is greater than 1, input files and databases are read concurrently by thread pool of this size
+    and stored into variable context in the order of config once all of them are read. If 'input_process_workers' is
+    greater than 0, files of CPU-bound types (Strategy.process_types) are parsed in process pool of this size.
+    Process pool uses 'spawn' start method and is submitted to only from the thread running execute, records logged
+    by its workers are written by handlers of this process.
+    Inputs are read sequentially if 'memory_report' is set, so memory usage of each input can be measured.
     """
+    def __init__(self, config, variables, error_handling='exit'):
+        super().__init__(config, variables, error_handling)
+        self.input_strategy = None
+        self.thread_pool = None
+        self.process_pool = None
+        self.log_listener = None
+        self.pending_inputs = []
+
+    @tracer.trace(category='manager')
     def execute(self) -> None:
         """
         This function reads names of input files, which are about to be processed. Based on the extension of file,
@@ -23,9 +47,143 @@ class InputManager(Manager):
         """
         # Load data from files and choose dataframe - pandas(default), spark or text
         self.input_strategy = IOStrategy(self.config, self.variables)
+        self.pending_inputs = []
+
+        workers = int(self.config.get_attr('input_workers', default=1) or 1)
+        process_workers = int(self.config.get_attr('input_process_workers', default=0) or 0)
+        if self.config.get_attr('memory_report', default=False):
+            workers = 1
+
+        if workers > 1:
+            self.thread_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='input')
+            if process_workers > 0:
+                context = multiprocessing.get_context('spawn')
+                log_queue = context.Queue()
+                self.log_listener = Logger.start_process_log_listener(log_queue)
+                self.process_pool = ProcessPoolExecutor(max_workers=process_workers, mp_context=context,
+                                                        initializer=Logger.set_process_logger,
+                                                        initargs=(log_queue, logging.getLogger().level,
+                                                                  Logger.instrumentation))
+
+        try:
+            self.get_input_files()
+            self.get_input_db()
+
+            for name, future, save_context in self.pending_inputs:
+                try:
+                    self.store_input(future.result())
+                except Exception as e:
+                    self.handle_input_error(e, save_context)
+        finally:
+            for _, future, _ in self.pending_inputs:
+                future.cancel()
+            self.pending_inputs = []
+
+            if self.thread_pool is not None:
+                self.thread_pool.shutdown(wait=True)
+                self.thread_pool = None
+            if self.process_pool is not None:
+                self.process_pool.shutdown(wait=True)
+                self.process_pool = None
+            if self.log_listener is not None:
+                self.log_listener.stop()
+                self.log_listener = None
+
+            self.input_strategy.close_workbooks()
+
+    def load_input(self, name: str, read, entry: dict, save_context: bool = False, **span_args) -> None:
+        """
+        Reads one input and stores its variables into variable context. If thread pool is running, reading is only
+        submitted and variables are stored by execute after all inputs were submitted.
 
-        self.get_input_files()
-        self.get_input_db()
+        :param str name: Name of the input (file or database name).
+        :param read: Function reading the entry and returning dictionary of variables.
+        :param dict entry: Input file or database from config.
+        :param bool save_context: If True, variable context is saved before exit on error.
+        :param span_args: Arguments stored in trace span of the input.
+        :return None: No return value
+        """
+        def traced_read():
+            with tracer.span(name, category='io', **span_args):
+                return read(entry)
+
+        if self.thread_pool is not None:
+            # read runs in copy of the context, so its spans are recorded into the trace of this run
+            future = self.thread_pool.submit(contextvars.copy_context().run, traced_read)
+            self.pending_inputs.append((name, future, save_context))
+            return None
+
+        try:
+            with memory_tracker.measure('input', name, self.variables):
+                self.store_input(traced_read())
+        except Exception as e:
+            self.handle_input_error(e, save_context)
+
+    def read_file(self, input_file: dict) -> dict:
+        """
+        Reads input file.
+
+        :param dict input_file: Input file from config.
+        :return dict: Dictionary with variable name as a key and loaded dataframe as value.
+        """
+        return {input_file['variable_name']: self.input_strategy.read(input_file)}
+
+    def is_process_input(self, input_file: dict) -> bool:
+        """
+        Checks if input file is parsed in process pool, i.e. process pool is running, the file type is CPU-bound
+        and the file is not read in chunks.
+
+        :param dict input_file: Input file from config.
+        :return bool: True if the file is parsed in process pool.
+        """
+        file_type = self.input_strategy.type_dict.get(self.input_strategy.get_file_extension(input_file))
+        return self.process_pool is not None and file_type in self.input_strategy.process_types and \
+            not input_file.get('chunk_size')
+
+    def submit_process_input(self, name: str, input_file: dict) -> None:
+        """
+        Submits reading of input file to process pool. Variables are stored by execute after all inputs were submitted.
+
+        :param str name: Name of the input file.
+        :param dict input_file: Input file from config.
+        :return None: No return value
+        """
+        future = self.process_pool.submit(read_input_file, self.config, input_file)
+        self.pending_inputs.append((name, future, False))
+
+    def read_db(self, input_database: dict) -> dict:
+        """
+        Reads all queries of input database.
+
+        :param dict input_database: Input database from config.
+        :return dict: Dictionary with variable name as a key and loaded dataframe as value.
+        """
+        return DBLoader(config=self.config, variables=self.variables).read(input_database)
+
+    def store_input(self, dataframes: dict) -> None:
+        """
+        Stores loaded variables into variable context.
+
+        :param dict dataframes: Dictionary with variable name as a key and loaded dataframe as value.
+        :return None: No return value
+        """
+        for variable_name, df in dataframes.items():
+            self.variables.set_object(key=variable_name, obj=df)
+
+    def handle_input_error(self, error: Exception, save_context: bool = False) -> None:
+        """
+        Logs error of one input and according to error_handling skips the input or raises the error.
+
+        :param Exception error: Error raised while reading the input.
+        :param bool save_context: If True, variable context is saved before the error is raised in 'exit' mode.
+        :return None: No return value
+        """
+        logger.error(str(error), inp_class=self.__class__.__name__, inp_func='execute', created_by='system')
+        if self.error_handling == 'skip':
+            return None
+        elif self.error_handling == 'exit' and save_context:
+            self.variables.save_context()
+        raise error
 
     def get_input_files(self):
         """
@@ -44,17 +202,11 @@ class InputManager(Manager):
                         pass
                     elif input_file.get('input_type') == 'text':
                         pass
+                    elif input_file.get('input_type') == 'pandas' and self.is_process_input(input_file):
+                        self.submit_process_input(str(input_file.get('file_name')), input_file)
                     elif input_file.get('input_type') == 'pandas':
-                        try:
-                            self.input_strategy.load(input_file)
-                        except Exception as e:
-                            logger.error(str(e), created_by='system')
-                            if self.error_handling == 'skip':
-                                continue
-                            elif self.error_handling == 'exit':
-                                raise e
-                            else:
-                                raise e
+                        self.load_input(str(input_file.get('file_name')), self.read_file, input_file,
+                                        variable_name=input_file.get('variable_name'))
                     else:
                         pass
                 else:
@@ -80,19 +232,8 @@ class InputManager(Manager):
                 elif input_database.get('input_type') == 'text':
                     pass
                 else:
-                    try:
-                        db_loader = DBLoader(config=self.config, variables=self.variables)
-                        db_loader.load(input_database)
-                    except Exception as e:
-                        error_message = str(e)
-                        logger.error(error_message, created_by='system')
-                        if self.error_handling == 'skip':
-                            continue
-                        elif self.error_handling == 'exit':
-                            self.variables.save_context()
-                            raise e
-                        else:
-                            raise e
+                    self.load_input(str(input_database.get('db_name')), self.read_db, input_database,
+                                    save_context=True, query=input_database.get('query'))
             else:
                 logger.info(str(input_database.get("db_name")) + " was skipped due to its 'run' attribute.",
                             created_by='system')
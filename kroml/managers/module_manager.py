@@ -1,22 +1,36 @@
 from managers.manager import Manager
 from utils.logger import Logger
+from utils.tracing import tracer
 import importlib
 import os
 import ast
 import sys
+import pickle
+import threading
 import traceback
 
 logger = Logger(__name__)
 
+MODULE_INDEX_FILE = '.module_index.pickle'
+
 
 @logger.for_all_methods(in_args=False,
                         skip_func=['get_declaration_from_source',
+                                   'load_module_index',
+                                   'save_module_index',
                                    'recognize_module'])
 class ModuleManager(Manager):
     """
     Inherits from Manager and it is responsible for handling process of all internal modules in modules folder and
     catching possible exceptions.
+
+    Classes found in modules and executions directories are kept in an index shared by all ModuleManager instances
+    in the process and persisted into MODULE_INDEX_FILE (or 'module_index_file' from config). Only files whose
+    modification time or size changed since the last scan are parsed again.
     """
+    module_index = None
+    module_index_lock = threading.Lock()
+
     def __init__(self, config, variables, error_handling='exit'):
         super().__init__(config, variables, error_handling)
 
@@ -51,12 +65,60 @@ class ModuleManager(Manager):
         return names
 
     @staticmethod
-    def recognize_module(directory: str, obj_type: type = ast.ClassDef) -> dict:
+    def load_module_index(index_file: str) -> dict:
+        """
+        Returns in-process module index, loading it from index file on the first call.
+
+        :param str index_file: Path to the persisted module index.
+        :return dict: Dictionary with (directory, object type) as the key and dictionary of scanned files as value.
+        """
+        if ModuleManager.module_index is None:
+            ModuleManager.module_index = {}
+            if index_file and os.path.isfile(index_file):
+                try:
+                    with open(index_file, 'rb') as infile:
+                        ModuleManager.module_index = pickle.load(infile)
+                except Exception:
+                    logger.warning(f"Module index \"{index_file}\" cannot be read, modules will be scanned again.",
+                                   inp_class='ModuleManager', inp_func='load_module_index', created_by='system')
+
+        return ModuleManager.module_index
+
+    @staticmethod
+    def save_module_index(index_file: str) -> None:
+        """
+        Atomically writes in-process module index into index file. Index is only an optimization, so failure to write
+        it is logged and ignored.
+
+        :param str index_file: Path to the persisted module index.
+        :return None: No return value
+        """
+        if not index_file:
+            return None
+
+        tmp_file = f"{index_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as outfile:
+                pickle.dump(ModuleManager.module_index, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, index_file)
+        except OSError:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+            logger.warning(f"Module index \"{index_file}\" cannot be written.",
+                           inp_class='ModuleManager', inp_func='save_module_index', created_by='system')
+
+    @staticmethod
+    def recognize_module(directory: str, obj_type: type = ast.ClassDef, index_file: str = MODULE_INDEX_FILE) -> dict:
         """
         Recognizes module to use by searching through modules directory and returning all .py files with their paths,
         opening them and looking for classes inside. Names of found modules are saved into dictionary alongside path to
         the file.
+        Declarations found in each file are cached in module index together with its modification time and size,
+        so unchanged files are not parsed again.
 
+        :param str directory: Directory searched for modules.
+        :param obj_type: Type of objects searched for in a file. <ast.ClassDef or ast.FunctionDef>
+        :param str index_file: Path to the persisted module index. If None, index is kept only in memory.
         :return dict: Dictionary with name of found module as the key and path to module as value.
         """
         files = []
@@ -73,17 +135,44 @@ class ModuleManager(Manager):
                 if extension == 'py':
                     files.append(os.path.join(r, file))
 
-        # opens each file and finds classes inside them and saves them
-        # into a dictionary with path to the file as key
+        with ModuleManager.module_index_lock:
+            module_index = ModuleManager.load_module_index(index_file)
+            cached_files = module_index.get((directory, obj_type.__name__), {})
+            scanned_files = {}
+
+            # opens each changed file and finds classes inside them
+            for file in files:
+                try:
+                    stat = os.stat(file)
+                except OSError:
+                    continue
+
+                cached = cached_files.get(file)
+                if cached is not None and cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                    scanned_files[file] = cached
+                    continue
+
+                try:
+                    with open(file, "r") as f:
+                        module_names = ModuleManager.get_declaration_from_source(f.read(), obj_type)
+                except Exception as e:
+                    module_names = []
+                    logger.warning(f"File \"{file}\" cannot be parsed for modules "
+                                   f"due to the error: {traceback.format_exc()}",
+                                   inp_class='ModuleManager', inp_func='recognize_module')
+
+                scanned_files[file] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'names': module_names}
+
+            if scanned_files != cached_files:
+                module_index[(directory, obj_type.__name__)] = scanned_files
+                ModuleManager.save_module_index(index_file)
+
+        # saves found classes into a dictionary with path to the file as value
         for file in files:
-            try:
-                with open(file, "r") as f:
-                    module_names = ModuleManager.get_declaration_from_source(f.read(), obj_type)
-            except Exception as e:
-                module_names = []
-                logger.warning(f"File \"{file}\" cannot be parsed for modules "
-                               f"due to the error: {traceback.format_exc()}")
+            if file not in scanned_files:
+                continue
 
+            module_names = scanned_files[file]['names']
             if module_names:
                 # if module_names is not empty
                 file_modified = file.rpartition('.')[0].replace("./", "").replace(".\\", "")\
@@ -97,7 +186,9 @@ class ModuleManager(Manager):
         return module_names_paths
 
     def initialize_modules(self) -> None:
-        module_names_paths = ModuleManager.recognize_module(self.config.get_attr('modules_directory'))
+        module_names_paths = ModuleManager.recognize_module(self.config.get_attr('modules_directory'),
+                                                            index_file=self.config.get_attr('module_index_file',
+                                                                                            MODULE_INDEX_FILE))
         for module in self.modules_dict:
             try:
                 if not isinstance(module, dict):
@@ -136,7 +227,9 @@ class ModuleManager(Manager):
 
     def initialize(self) -> None:
 
-        execution_names_paths = ModuleManager.recognize_module(self.config.get_attr('executions_directory'))
+        execution_names_paths = ModuleManager.recognize_module(self.config.get_attr('executions_directory'),
+                                                               index_file=self.config.get_attr('module_index_file',
+                                                                                               MODULE_INDEX_FILE))
         try:
             if self.config.get_attr('execution_mode') is not None:
                 if not execution_names_paths.get(self.config.get_attr('execution_mode')):
@@ -160,5 +253,6 @@ class ModuleManager(Manager):
             logger.error(str(e), inp_func=self.config.get_attr("run"), created_by='system')
             raise e
 
+    @tracer.trace(category='manager')
     def execute(self) -> None:
         self.execution_module.execute()
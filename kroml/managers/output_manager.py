@@ -2,6 +2,8 @@ from managers.manager import Manager
 from utils.logger import Logger
 from iostrategies.output_db.db_writer_pd import DBWriter
 from iostrategies.io_strategy_pd import IOStrategy
+from utils.tracing import tracer
+from utils.memory import memory_tracker
 
 logger = Logger(__name__)
 
@@ -15,6 +17,7 @@ class OutputManager(Manager):
     exceptions.
     """
 
+    @tracer.trace(category='manager')
     def execute(self) -> None:
         """
         This function reads names of files from config.json, which are about to be created. Based on the extension of
@@ -47,7 +50,10 @@ class OutputManager(Manager):
                     pass
                 elif output_file.get('output_type') == 'pandas':
                     try:
-                        output_strategy.save(output_file)
+                        with tracer.span(str(output_file.get('file_name')), category='io',
+                                         variable_name=output_file.get('variable_name')), \
+                                memory_tracker.measure('output', str(output_file.get('file_name'))):
+                            output_strategy.save(output_file)
                     except Exception as e:
                         error_message = str(e)
                         logger.error(error_message, created_by='system')
@@ -82,7 +88,10 @@ class OutputManager(Manager):
             else:
                 try:
                     db_loader = DBWriter(config=self.config, variables=self.variables)
-                    db_loader.write(output_database)
+                    with tracer.span(str(output_database.get('db_name')), category='io',
+                                     query=output_database.get('query')), \
+                            memory_tracker.measure('output', str(output_database.get('db_name'))):
+                        db_loader.write(output_database)
                 except Exception as e:
                     error_message = str(e)
                     logger.error(error_message, created_by='system')
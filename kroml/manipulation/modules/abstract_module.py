@@ -1,18 +1,38 @@
 from utils.logger import Logger
 from abc import ABC, abstractmethod
 from os.path import exists
-from keras.models import Model, load_model, Sequential
-from keras.layers import Dense, Activation
+from utils.backends import get_backend
 
 
 class Module(ABC):
     """
     Abstract class that represents internal module with __init__ and abstract execute method.
+    Keras is imported only when the model of the module is used for the first time.
+    Modules which can process ChunkSource variables chunk by chunk set streaming to True, chunk sources referenced
+    in params of other modules are materialized into dataframes before the module is executed. Materialized
+    dataframe is dropped after the module and the chunk source stays in variable context, changes of the module
+    have to be stored by set_object. Dataframe changed in place is kept in the context instead of the chunk source
+    and a warning is logged.
     """
+    streaming = False
+
     def __init__(self, config, variables):
         self.config = config
         self.variables = variables
-        self.model = Model()
+        self._model = None
+
+    @property
+    def model(self) -> 'keras.models.Model':
+        """
+        Model of the module, empty keras model is created on the first access.
+        """
+        if self._model is None:
+            self._model = get_backend('keras.models').Model()
+        return self._model
+
+    @model.setter
+    def model(self, value) -> None:
+        self._model = value
 
     def save_model(self, filename: str, overwrite= False) -> None:
         """
@@ -35,7 +55,7 @@ class Module(ABC):
 
         self.model.save(directory + filename + extension, overwrite)
 
-    def load_model(self, filename: str, lastVersion= False) -> Model:
+    def load_model(self, filename: str, lastVersion= False) -> 'keras.models.Model':
         """
         Method for loading model
         :param name: name->model name
@@ -59,9 +79,9 @@ class Module(ABC):
                 raise Exception("No saved model for: " + filename + " found!")
             else:
                 number -= 1
-                return load_model(directory + filename + str(number) + extension)
+                return get_backend('keras.models').load_model(directory + filename + str(number) + extension)
         else:
             if exists(directory + filename + extension):
-                return load_model(directory + filename + extension)
+                return get_backend('keras.models').load_model(directory + filename + extension)
             else:
                 raise Exception("No saved model for: " + filename + " found!")
\ No newline at end of file
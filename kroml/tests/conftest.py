@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+import pytest
+
+KROML_DIRECTORY = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+if KROML_DIRECTORY not in sys.path:
+    sys.path.insert(0, KROML_DIRECTORY)
+
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    """
+    Returns function writing main config and config directory of a test project into tmp_path. All directories
+    used by the framework point into tmp_path, so tests do not touch the repository. Tests run from the kroml
+    directory, as executions are searched relative to it.
+    """
+    monkeypatch.chdir(KROML_DIRECTORY)
+
+    for directory in ('config', 'data', 'logs', 'modules'):
+        (tmp_path / directory).mkdir(exist_ok=True)
+
+    def write(ini: dict = None, **attributes) -> str:
+        """
+        :param dict ini: Sections of config.ini, merged into default sections.
+        :param attributes: Values stored in config.json.
+        :return str: Path to the main config file.
+        """
+        sections = {'bool': {'debug': 'false'},
+                    'arguments': {'execution_mode': 'default', 'run': 'execute', 'error_handler': 'exit',
+                                  'instrumentation': 'stats',
+                                  'module_index_file': str(tmp_path / '.module_index.pickle'),
+                                  'variable_context_directory': str(tmp_path / 'variable_context') + '/',
+                                  'spill_directory': str(tmp_path / 'spill') + '/'},
+                    'dirs': {'INPUT_DIRECTORY': str(tmp_path / 'data') + '/',
+                             'OUTPUT_DIRECTORY': str(tmp_path / 'data') + '/',
+                             'MODELS_DIRECTORY': str(tmp_path / 'models') + '/',
+                             'INPUT_CACHE_DIRECTORY': str(tmp_path / 'input_cache') + '/',
+                             'DB_SNAPSHOT_DIRECTORY': str(tmp_path / 'db_snapshot') + '/',
+                             'MODULES_DIRECTORY': str(tmp_path / 'modules') + '/',
+                             'EXECUTIONS_DIRECTORY': './iostrategies/execution/'}}
+        for section, values in (ini or {}).items():
+            sections.setdefault(section, {}).update(values)
+
+        with open(str(tmp_path / 'config' / 'config.ini'), 'w') as outfile:
+            for section, values in sections.items():
+                outfile.write('[{}]\n'.format(section))
+                for key, value in values.items():
+                    outfile.write('{} = {}\n'.format(key, value))
+
+        json_attributes = {'modules': [], 'queries': {}, 'input_strategies': {}, 'output_strategies': {}}
+        json_attributes.update(attributes)
+        with open(str(tmp_path / 'config' / 'config.json'), 'w') as outfile:
+            json.dump(json_attributes, outfile)
+
+        main_config_file = str(tmp_path / 'main_config.ini')
+        with open(main_config_file, 'w') as outfile:
+            outfile.write('[execute]\nconfig_dir = {}/\n'.format(tmp_path / 'config'))
+            outfile.write('[default]\nlog_dir = {}/\nlog_file = log.csv\n'.format(tmp_path / 'logs'))
+            outfile.write('config_cache = .config_cache.pickle\n')
+        return main_config_file
+
+    return write
+
+
+@pytest.fixture
+def make_config(write_config):
+    """
+    Returns function writing config of a test project and returning its ConfigParser.
+    """
+    from utils.config_parser import ConfigParser
+
+    def make(ini: dict = None, **attributes):
+        return ConfigParser(main_config_file=write_config(ini, **attributes), mode='execute')
+
+    return make
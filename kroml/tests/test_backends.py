@@ -0,0 +1,20 @@
+import sqlite3
+import pytest
+from utils import backends
+
+
+def test_backend_is_imported_on_request():
+    assert backends.get_backend('SQLite') is sqlite3
+    assert 'sqlite' in backends.get_import_report()
+
+
+def test_registered_backend(monkeypatch):
+    monkeypatch.setitem(backends.BACKENDS, 'json_backend', 'json')
+    backends.register_backend('Json_Backend', 'json')
+
+    assert backends.get_backend('json_backend').__name__ == 'json'
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(Exception, match='not registered'):
+        backends.get_backend('unknown')
@@ -0,0 +1,109 @@
+import os
+import pandas as pd
+from utils.checkpoint import CheckpointStore, LazyObjectDict
+from utils.variable_context import VariableContext
+
+MODULES = [{'class_name': 'First', 'param': {'input_df': 'df'}}, {'class_name': 'Second'}]
+
+
+def count_serializations(monkeypatch):
+    calls = []
+    original = CheckpointStore.serialize
+
+    def serialize(self, obj, path):
+        calls.append(obj)
+        return original(self, obj, path)
+
+    monkeypatch.setattr(CheckpointStore, 'serialize', serialize)
+    return calls
+
+
+def test_store_writes_only_changed_variables(tmp_path, monkeypatch):
+    store = CheckpointStore(str(tmp_path))
+    objects = LazyObjectDict(store.load_object)
+    objects['df'] = pd.DataFrame({'a': [1, 2]})
+    objects['value'] = 1
+    store.save({'First': True}, objects)
+
+    index = store.read_index()
+    assert index['status'] == {'First': True}
+    assert index['variables']['df']['shape'] == [2, 1]
+    assert store.check_files() == []
+
+    calls = count_serializations(monkeypatch)
+    restored = LazyObjectDict(store.load_object)
+    for key, entry in index['variables'].items():
+        restored.set_pending(key, entry)
+
+    assert restored['df']['a'].tolist() == [1, 2]
+    restored['value'] = 2
+    store.save({'First': True}, restored)
+
+    # loaded but unchanged dataframe reuses its file, only the set value is serialized
+    assert calls == [2]
+    assert store.read_index()['variables']['df'] == index['variables']['df']
+    assert len([name for name in os.listdir(str(tmp_path)) if name != 'manifest.json']) == 2
+
+    store.save({'First': True}, restored)
+    assert calls == [2]
+
+
+def test_debug_run_resumes_from_failed_module(make_config):
+    config = make_config({'bool': {'debug': 'true'}}, modules=MODULES)
+    variables = VariableContext(config)
+    variables.set_object('df', pd.DataFrame({'a': [1]}))
+    variables.set_module_status('First', True)
+    variables.set_module_status('Second', False)
+    variables.save_context()
+
+    restored = VariableContext(config)
+    assert restored.get_status() == {'First': True, 'Second': None}
+    assert 'df' in restored.object_dict.pending
+    assert restored.get_object('df')['a'].tolist() == [1]
+
+
+def test_columnar_store_writes_arrow_files(tmp_path):
+    store = CheckpointStore(str(tmp_path), columnar=True)
+    objects = LazyObjectDict(store.load_object)
+    objects['df'] = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}, index=[5, 6])
+    objects['mixed'] = pd.DataFrame({'a': [1, 'x']})
+    store.save({}, objects)
+
+    variables = store.read_index()['variables']
+    assert variables['df']['format'] == 'arrow'
+    assert variables['mixed']['format'] == 'pickle'
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+    df = store.load_object('df', variables['df'])
+    assert df.index.tolist() == [5, 6]
+    assert store.load_object('df', variables['df'], columns=['b'])['b'].tolist() == ['x', 'y']
+
+
+def test_debug_startup_reads_only_manifest(make_config, monkeypatch):
+    config = make_config({'bool': {'debug': 'true'}}, modules=MODULES)
+    variables = VariableContext(config)
+    variables.set_object('df', pd.DataFrame({'a': [1]}))
+    variables.save_context()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('variable loaded during startup')
+
+    monkeypatch.setattr(CheckpointStore, 'load_object', fail)
+    restored = VariableContext(config)
+    assert restored.check_module_context()
+    assert list(restored.object_dict.pending) == ['df']
+
+
+def test_missing_variable_file_invalidates_checkpoint(make_config, tmp_path):
+    config = make_config({'bool': {'debug': 'true'}}, modules=MODULES)
+    variables = VariableContext(config)
+    variables.set_object('df', pd.DataFrame({'a': [1]}))
+    variables.set_module_status('First', True)
+    variables.save_context()
+
+    entry = variables.checkpoint.index['variables']['df']
+    os.remove(str(tmp_path / 'variable_context' / entry['file']))
+
+    restored = VariableContext(config)
+    assert restored.get_status() == {'First': None, 'Second': None}
+    assert 'df' not in restored.object_dict
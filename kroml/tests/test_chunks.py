@@ -0,0 +1,42 @@
+import gc
+import weakref
+import functools
+import pandas as pd
+from utils.chunks import ChunkSource, concat_chunks
+
+
+def test_chunk_source_is_reiterable_and_mapped(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('a,b\n' + ''.join('{},x\n'.format(value) for value in range(7)))
+    source = ChunkSource(functools.partial(pd.read_csv, str(path), chunksize=3), rename_names={'a': 'A'})
+
+    assert [len(chunk) for chunk in source] == [3, 3, 1]
+    assert [len(chunk) for chunk in source] == [3, 3, 1]
+
+    doubled = source.map(lambda chunk: chunk.assign(A=chunk['A'] * 2))
+    assert doubled.materialize()['A'].tolist() == [value * 2 for value in range(7)]
+    assert source.materialize()['A'].tolist() == list(range(7))
+
+
+def test_empty_chunk_source_materializes_empty_frame():
+    assert ChunkSource(lambda: iter([])).materialize().empty
+
+
+def test_concat_chunks_releases_chunks_and_unifies_dtypes():
+    alive = []
+
+    def chunks():
+        for values in ([1, 2], [3.5]):
+            chunk = pd.DataFrame({'a': values, 'b': ['x'] * len(values)})
+            alive.append(weakref.ref(chunk))
+            yield chunk
+            del chunk
+            gc.collect()
+            # previous chunk was released before the next one is read
+            assert alive[-1]() is None
+
+    df = concat_chunks(chunks())
+
+    assert df['a'].tolist() == [1.0, 2.0, 3.5] and str(df['a'].dtype) == 'float64'
+    assert df['b'].tolist() == ['x', 'x', 'x']
+    assert concat_chunks(iter([])).empty
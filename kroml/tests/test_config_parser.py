@@ -0,0 +1,36 @@
+import os
+import pickle
+from utils.config_parser import ConfigParser
+
+
+def test_values_are_typed_by_section(make_config):
+    config = make_config({'int': {'input_workers': '3'}, 'float': {'category_threshold': '0.1'}},
+                         queries={'q': {'table': 't'}})
+
+    assert config.get_attr('input_workers') == 3
+    assert config.get_attr('category_threshold') == 0.1
+    assert config.get_attr('debug') is False
+    assert config.get_attr('queries') == {'q': {'table': 't'}}
+    assert config.get_attr('missing', default='x') == 'x'
+
+
+def test_compiled_snapshot_is_reused(make_config, tmp_path):
+    make_config({'int': {'input_workers': '3'}})
+    cache_file = str(tmp_path / 'config' / '.config_cache.pickle')
+    assert os.path.isfile(cache_file)
+
+    with open(cache_file, 'rb') as infile:
+        snapshot = pickle.load(infile)
+    snapshot['attributes']['input_workers'] = 7
+    with open(cache_file, 'wb') as outfile:
+        pickle.dump(snapshot, outfile)
+
+    config = ConfigParser(main_config_file=str(tmp_path / 'main_config.ini'), mode='execute')
+    assert config.get_attr('input_workers') == 7
+
+
+def test_changed_config_file_invalidates_snapshot(make_config):
+    make_config({'int': {'input_workers': '3'}})
+    config = make_config({'int': {'input_workers': '15'}})
+
+    assert config.get_attr('input_workers') == 15
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+from iostrategies import connection_pool
+from iostrategies.connection_pool import ConnectionPool, get_connect_function, get_pool
+from iostrategies.input_db.db_loader_pd import DBLoader
+from iostrategies.output_db.db_writer_pd import DBWriter
+from utils.variable_context import VariableContext
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(connection_pool, 'pools', {})
+    database = {'type': 'sqlite', 'db_name': str(tmp_path / 'test.db'), 'query': ['prices']}
+    connect = get_connect_function(database)
+    conn = connect()
+    conn.execute('create table prices (id integer, price real)')
+    conn.executemany('insert into prices values (?, ?)', [(1, 1.5), (2, 3.0)])
+    conn.commit()
+    conn.close()
+    yield database
+    connection_pool.close_pools()
+
+
+def test_released_connection_is_reused_in_clean_state(database):
+    pool = ConnectionPool(get_connect_function(database), max_size=1)
+
+    with pool.connection() as conn:
+        conn.execute('insert into prices values (3, 4.5)')
+    with pool.connection() as reused:
+        assert reused is conn
+        assert reused.execute('select count(*) from prices').fetchone()[0] == 2
+
+    assert pool.size == 1
+    pool.close()
+    assert pool.size == 0
+
+
+def test_acquire_waits_for_released_connection(database):
+    pool = ConnectionPool(get_connect_function(database), max_size=1, name='test')
+    conn = pool.acquire()
+
+    with pytest.raises(Exception, match='No connection'):
+        pool.acquire(timeout=0.01)
+
+    pool.release(conn)
+    assert pool.acquire(timeout=0.01) is conn
+
+
+def test_unhealthy_and_failed_connections_are_replaced(database, monkeypatch):
+    pool = ConnectionPool(get_connect_function(database), max_size=1)
+    with pool.connection() as conn:
+        pass
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ConnectionPool, 'is_healthy', lambda self, connection: False)
+        with pool.connection() as reconnected:
+            assert reconnected is not conn
+
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError()
+    assert pool.size == 0 and pool.idle == []
+
+
+def test_loader_and_writer_share_pool(database, make_config):
+    queries = {'prices': {'table': 'prices', 'variable_name': 'prices'}}
+    config = make_config({'int': {'db_pool_size': '1'}}, queries=queries, query=['prices'])
+    variables = VariableContext(config)
+
+    df = DBLoader(config, variables).read(database)['prices']
+    assert df['price'].tolist() == [1.5, 3.0]
+
+    variables.set_object('prices', pd.DataFrame({'id': [3], 'price': [4.5]}))
+    DBWriter(config, variables).write(database)
+
+    pool = get_pool(database, config)
+    assert pool.max_size == 1 and pool.size == 1
+    assert DBLoader(config, variables).read(database)['prices']['id'].tolist() == [1, 2, 3]
+
+
+def test_connection_of_closed_generator_is_released(database):
+    pool = ConnectionPool(get_connect_function(database), max_size=1)
+
+    def rows():
+        with pool.connection() as conn:
+            for row in conn.execute('select id from prices'):
+                yield row
+
+    reader = rows()
+    next(reader)
+    reader.close()
+
+    assert pool.size == 0
+    with pool.connection(timeout=0.01) as conn:
+        assert conn.execute('select count(*) from prices').fetchone()[0] == 2
@@ -0,0 +1,159 @@
+import sqlite3
+import pandas as pd
+import pytest
+from iostrategies import connection_pool
+from iostrategies.input_db.db_loader_pd import DBLoader
+from utils.chunks import ChunkSource
+
+
+@pytest.fixture
+def connection(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'test.db'))
+    conn.execute('create table prices (id integer, price real, day text)')
+    conn.executemany('insert into prices values (?, ?, ?)',
+                     [(index, index * 1.5, '2020-01-{:02d}'.format(index + 1)) for index in range(5)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+class CopyCursor:
+    """
+    Cursor of PostgreSQL connection returning fixed description and COPY CSV output.
+    """
+    def __init__(self, description, csv):
+        self.description = description
+        self.csv = csv
+
+    def execute(self, query):
+        pass
+
+    def copy_expert(self, sql, writer):
+        writer.write(self.csv)
+
+    def close(self):
+        pass
+
+
+class CopyConnection:
+    def __init__(self, description, csv):
+        self.description = description
+        self.csv = csv
+
+    def cursor(self):
+        return CopyCursor(self.description, self.csv)
+
+
+@pytest.mark.parametrize('db_type', ['sqlite', 'oracle'])
+def test_fetch_chunks_by_array_size(connection, db_type):
+    # sqlite cursor has no prefetchrows, like cx_Oracle before version 8
+    chunks = list(DBLoader.fetch_chunks('select * from prices', connection, db_type, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert list(chunks[0].columns) == ['id', 'price', 'day']
+
+
+def test_fetch_chunks_of_empty_result_keeps_columns(connection):
+    chunks = list(DBLoader.fetch_chunks('select id from prices where id < 0', connection, 'sqlite'))
+
+    assert len(chunks) == 1 and list(chunks[0].columns) == ['id']
+
+
+def test_copy_chunks_have_same_dtypes():
+    description = [('code', 1043), ('flag', 16), ('day', 1082), ('value', 701)]
+    csv = 'code,flag,day,value\n1,t,,1.5\n2,,,2\n,f,2020-01-03,\nx,t,2020-01-04,4\n'
+
+    df = DBLoader.read_sql('select', CopyConnection(description, csv), 'postgresql', chunk_size=2)
+
+    assert df['code'].tolist()[:2] == ['1', '2'] and df['code'].tolist()[3] == 'x'
+    assert df['flag'][0] is True and pd.isna(df['flag'][1]) and df['flag'][2] is False
+    assert pd.api.types.is_datetime64_any_dtype(df['day'])
+    assert df['day'][3] == pd.Timestamp('2020-01-04')
+    assert str(df['value'].dtype) == 'float64'
+
+
+@pytest.fixture
+def database(connection, tmp_path, monkeypatch):
+    """
+    Returns input database of the test connection with its own connection pools.
+    """
+    monkeypatch.setattr(connection_pool, 'pools', {})
+    yield {'type': 'sqlite', 'db_name': str(tmp_path / 'test.db'), 'query': ['prices']}
+    connection_pool.close_pools()
+
+
+@pytest.fixture
+def partitioned(connection, database, make_config):
+    """
+    Returns function reading table prices (with null rows) by partition from config.
+    """
+    connection.executemany('insert into prices values (?, ?, ?)', [(None, 9.0, None), (9, None, '2020-02-01')])
+    connection.commit()
+
+    def read(partition: dict) -> pd.DataFrame:
+        queries = {'prices': {'table': 'prices', 'variable_name': 'prices', 'partition': partition}}
+        return DBLoader(make_config(queries=queries), None).read(database)['prices']
+
+    return read
+
+
+@pytest.mark.parametrize('partition', [{'column': 'id', 'ranges': [[0, 2], [2, None]]},
+                                       {'column': 'id', 'splits': 3},
+                                       {'column': 'day', 'splits': 4},
+                                       {'column': 'price', 'splits': 2}])
+def test_partitions_read_every_row_once(partitioned, partition):
+    df = partitioned(dict(partition, workers=2))
+
+    assert len(df) == 7
+    assert sorted(df['price'].dropna().tolist()) == [0.0, 1.5, 3.0, 4.5, 6.0, 9.0]
+    assert df['id'].isna().sum() == 1
+
+
+@pytest.mark.parametrize('keys', [None, ['id']])
+def test_incremental_read_refetches_rows_at_stored_watermark(connection, database, make_config, keys):
+    queries = {'prices': {'table': 'prices', 'variable_name': 'prices', 'watermark': 'day', 'watermark_key': keys}}
+    config = make_config(queries=queries)
+
+    assert len(DBLoader(config, None).read(database)['prices']) == 5
+
+    # row committed later with the same watermark as the last read row and one newer row
+    connection.executemany('insert into prices values (?, ?, ?)', [(5, 7.5, '2020-01-05'), (6, 9.0, '2020-01-06')])
+    connection.commit()
+    df = DBLoader(config, None).read(database)['prices']
+    assert df['id'].tolist() == [0, 1, 2, 3, 4, 5, 6]
+
+    assert DBLoader(config, None).read(database)['prices']['id'].tolist() == [0, 1, 2, 3, 4, 5, 6]
+
+
+def test_query_with_chunk_size_is_streamed(database, make_config):
+    queries = {'prices': {'table': 'prices', 'variable_name': 'prices', 'format_strategy': 'prices',
+                          'chunk_size': 2}}
+    config = make_config(queries=queries, input_strategies={
+        'prices': [{'original_name': 'id', 'final_name': 'ID', 'visible': 1},
+                   {'original_name': 'price', 'final_name': 'PRICE', 'visible': 1}]})
+
+    source = DBLoader(config, None).read(database)['prices']
+
+    assert isinstance(source, ChunkSource)
+    assert [len(chunk) for chunk in source] == [2, 2, 1]
+    assert source.materialize().to_dict('list') == {'ID': [0, 1, 2, 3, 4], 'PRICE': [0.0, 1.5, 3.0, 4.5, 6.0]}
+
+    pool = connection_pool.get_pool(database, config)
+    assert pool.size == 1 and len(pool.idle) == 1
+
+    next(iter(source))
+    assert pool.size == 0
+
+
+def test_fractional_splits_spread_rows(connection, database, make_config):
+    connection.execute('delete from prices')
+    connection.executemany('insert into prices values (?, ?, ?)', [(index, index / 10, None) for index in range(11)])
+    connection.commit()
+    query_values = {'table': 'prices', 'variable_name': 'prices', 'partition': {'column': 'price', 'splits': 4}}
+
+    conditions = DBLoader(make_config(), None).get_partition_conditions(
+        connection_pool.get_pool(database), 'sqlite', query_values)
+
+    counts = [connection.execute('select count(*) from prices where {}'.format(condition)).fetchone()[0]
+              for condition in conditions]
+    assert counts == [3, 2, 3, 3]
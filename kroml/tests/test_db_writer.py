@@ -0,0 +1,67 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from iostrategies import connection_pool
+from iostrategies.connection_pool import get_pool
+from iostrategies.output_db.db_writer_pd import DBWriter
+from utils.chunks import ChunkSource
+from utils.variable_context import VariableContext
+
+FRAME = pd.DataFrame({'id': np.arange(5), 'price': [1.5, np.nan, 3.0, 4.5, 6.0], 'note': list('abcde')})
+STRATEGY = [{'original_name': 'id', 'final_name': 'id', 'visible': 1},
+            {'original_name': 'price', 'final_name': 'price', 'visible': 1},
+            {'original_name': 'note', 'final_name': 'note', 'visible': 0}]
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(connection_pool, 'pools', {})
+    conn = sqlite3.connect(str(tmp_path / 'test.db'))
+    conn.execute('create table prices (id integer, price real, note text)')
+    conn.commit()
+    conn.close()
+    yield {'type': 'sqlite', 'db_name': str(tmp_path / 'test.db'), 'query': ['prices']}
+    connection_pool.close_pools()
+
+
+def read_table(database) -> list:
+    conn = sqlite3.connect(database['db_name'])
+    try:
+        return conn.execute('select id, price, note from prices order by id').fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('data', [FRAME, ChunkSource(lambda: iter([FRAME.iloc[:3], FRAME.iloc[3:]]))])
+def test_write_by_chunks_with_format_strategy(database, make_config, monkeypatch, data):
+    queries = {'prices': {'table': 'prices', 'variable_name': 'prices', 'format_strategy': 'prices',
+                          'write_chunk_size': 2}}
+    config = make_config(queries=queries, query=['prices'], output_strategies={'prices': STRATEGY})
+    variables = VariableContext(config)
+    variables.set_object('prices', data)
+
+    chunk_sizes = []
+    write_rows = DBWriter.write_rows_to_database
+    monkeypatch.setattr(DBWriter, 'write_rows_to_database', staticmethod(
+        lambda cursor, tablename, dataframe, paramstyle:
+        chunk_sizes.append(len(dataframe)) or write_rows(cursor, tablename, dataframe, paramstyle)))
+
+    DBWriter(config, variables).write(database)
+
+    assert max(chunk_sizes) == 2 and sum(chunk_sizes) == 5
+    assert read_table(database) == [(0, 1.5, None), (1, None, None), (2, 3.0, None), (3, 4.5, None),
+                                    (4, 6.0, None)]
+
+
+@pytest.mark.parametrize('commit_chunks, rows', [(False, 0), (True, 2)])
+def test_failed_write_keeps_committed_chunks_only(database, commit_chunks, rows):
+    def chunks():
+        yield FRAME.iloc[:2]
+        raise ValueError('chunk failed')
+
+    with pytest.raises(ValueError):
+        with get_pool(database).connection() as conn:
+            DBWriter.write_chunks(conn, 'sqlite', 'prices', chunks(), commit_chunks=commit_chunks)
+
+    assert len(read_table(database)) == rows
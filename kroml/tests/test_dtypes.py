@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from utils.dtypes import downcast_column, get_dtype_hints, optimize_dtypes, INT32_BOUND
+
+
+def test_integers_are_never_unsigned_or_narrower_than_int32():
+    small = downcast_column(pd.Series([0, 1, 200], dtype='int64'))
+    assert str(small.dtype) == 'int32'
+    assert (small - 201).tolist() == [-201, -200, -1]
+    assert int(pd.Series([100] * 10, dtype='int64').pipe(downcast_column).sum()) == 1000
+
+    assert str(downcast_column(pd.Series([0, INT32_BOUND + 1], dtype='int64')).dtype) == 'int64'
+    assert str(downcast_column(pd.Series([1, 2], dtype='int16')).dtype) == 'int16'
+
+
+def test_floats_are_downcast_only_without_precision_loss():
+    assert str(downcast_column(pd.Series([0.5, 1.25, np.nan])).dtype) == 'float32'
+    assert str(downcast_column(pd.Series([0.1, 0.2])).dtype) == 'float64'
+
+
+def test_default_threshold_converts_only_repetitive_strings():
+    df = pd.DataFrame({'code': ['a', 'b'] * 50, 'name': ['n{}'.format(index % 10) for index in range(100)]})
+
+    df = optimize_dtypes(df)
+
+    assert isinstance(df['code'].dtype, pd.CategoricalDtype)
+    assert not isinstance(df['name'].dtype, pd.CategoricalDtype)
+
+
+def test_dtype_hints_of_visible_columns():
+    strategy = [{'original_name': 'A', 'final_name': 'a', 'dtype': 'date'},
+                {'original_name': 'B', 'final_name': 'b', 'visible': 1, 'dtype': 'keep'},
+                {'original_name': 'C', 'final_name': 'c', 'visible': 0, 'dtype': 'int32'},
+                {'original_name': 'D', 'final_name': 'd'}]
+
+    assert get_dtype_hints(strategy) == {'a': 'date', 'b': 'keep'}
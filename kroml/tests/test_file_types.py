@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from iostrategies.io_strategy_pd import IOStrategy
+
+FRAME = pd.DataFrame({'id': np.arange(5, dtype='int64'), 'price': np.linspace(0, 2, 5), 'code': list('abcde')})
+
+
+@pytest.fixture
+def io_strategy(make_config):
+    return IOStrategy(make_config(), None)
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'feather', 'arrow'])
+def test_columnar_file_round_trip(io_strategy, tmp_path, extension):
+    pytest.importorskip('pyarrow')
+    file_name = 'frame.' + extension
+    io_strategy.__getattribute__(io_strategy.type_dict[extension] + '_write')(
+        {'df': FRAME, 'file_name': str(tmp_path / 'data' / file_name)})
+
+    pd.testing.assert_frame_equal(io_strategy.read({'file_name': file_name}), FRAME)
+    assert list(io_strategy.read({'file_name': file_name, 'original_names': ['code']}).columns) == ['code']
+
+
+def test_npy_round_trip_without_pickle(io_strategy, tmp_path):
+    io_strategy.npy_write({'df': FRAME, 'file_name': str(tmp_path / 'data' / 'frame.npy')})
+
+    assert np.load(str(tmp_path / 'data' / 'frame.npy'), allow_pickle=False).dtype.names == ('id', 'price', 'code')
+    df = io_strategy.read({'file_name': 'frame.npy'})
+    assert df['id'].tolist() == FRAME['id'].tolist()
+    assert df['code'].tolist() == FRAME['code'].tolist()
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from iostrategies.io_strategy_pd import IOStrategy
+from utils.filters import normalize_filters, filter_frame
+
+STRATEGY = [{'original_name': 'ID', 'final_name': 'id', 'visible': 1},
+            {'original_name': 'Day', 'final_name': 'day', 'visible': 1, 'dtype': 'date'}]
+FRAME = pd.DataFrame({'ID': np.arange(6, dtype='int64'), 'Day': pd.date_range('2020-01-01', periods=6),
+                      'Unit': ['A', 'B'] * 3})
+FILTER = [['Day', 'between', ['2020-01-02', '2020-01-05']], {'column': 'Unit', 'op': 'in', 'value': ['A']}]
+
+
+@pytest.fixture
+def io_strategy(make_config):
+    return IOStrategy(make_config(input_strategies={'days': STRATEGY}), None)
+
+
+def test_normalize_filters_expands_between_and_rejects_unknown_operator():
+    assert normalize_filters(FILTER) == [('Day', '>=', '2020-01-02'), ('Day', '<=', '2020-01-05'),
+                                         ('Unit', 'in', ['A'])]
+    with pytest.raises(Exception):
+        normalize_filters([['Day', 'like', 'x']])
+
+
+def test_filter_frame_parses_dates():
+    assert filter_frame(FRAME, normalize_filters(FILTER))['ID'].tolist() == [2, 4]
+
+
+@pytest.mark.parametrize('extension', ['csv', 'parquet'])
+def test_filter_columns_are_read_and_dropped(io_strategy, tmp_path, extension):
+    if extension == 'parquet':
+        pytest.importorskip('pyarrow')
+        FRAME.to_parquet(str(tmp_path / 'data' / 'days.parquet'), index=False)
+    else:
+        FRAME.to_csv(str(tmp_path / 'data' / 'days.csv'), index=False)
+
+    df = io_strategy.read({'file_name': 'days.' + extension, 'format_strategy': 'days', 'filter': FILTER})
+
+    assert list(df.columns) == ['id', 'day']
+    assert df['id'].tolist() == [2, 4]
@@ -0,0 +1,63 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from managers.input_manager import InputManager
+from utils.logger import Logger
+from utils.variable_context import VariableContext
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_process_pool_reads_inputs_in_config_order(make_config, tmp_path, monkeypatch):
+    for name in ('first', 'second'):
+        (tmp_path / 'data' / (name + '.csv')).write_text('a,b\n1,{}\n2,{}\n'.format(name, name))
+    config = make_config({'int': {'input_workers': '2', 'input_process_workers': '1'}},
+                         input_files=[{'file_name': name + '.csv', 'variable_name': name, 'input_type': 'pandas',
+                                       'run': 'all'} for name in ('first', 'second')])
+    variables = VariableContext(config)
+
+    submitted = []
+    submit = InputManager.submit_process_input
+    monkeypatch.setattr(InputManager, 'submit_process_input',
+                        lambda self, name, input_file: submitted.append(name) or submit(self, name, input_file))
+
+    manager = InputManager(config, variables)
+    manager.execute()
+
+    assert submitted == ['first.csv', 'second.csv']
+    assert list(variables.object_dict) == ['first', 'second']
+    assert variables.get_object('second')['b'].tolist() == ['second', 'second']
+    assert manager.process_pool is None and manager.log_listener is None
+
+
+def test_process_logs_are_written_by_parent_handlers():
+    root_logger = logging.getLogger()
+    handler = ListHandler()
+    root_logger.addHandler(handler)
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    listener = Logger.start_process_log_listener(log_queue)
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=Logger.set_process_logger,
+                                 initargs=(log_queue,)) as pool:
+            pool.submit(logging.getLogger('kroml.child').info, 'from child').result()
+    finally:
+        listener.stop()
+        root_logger.removeHandler(handler)
+
+    assert handler.messages == ['from child']
+
+
+def test_managers_do_not_share_pending_inputs(make_config):
+    config = make_config()
+    first, second = InputManager(config, None), InputManager(config, None)
+
+    first.pending_inputs.append(('file', None, False))
+    assert second.pending_inputs == []
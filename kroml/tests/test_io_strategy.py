@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+from iostrategies.io_strategy_pd import IOStrategy
+
+STRATEGY = [{'original_name': 'ID', 'final_name': 'id', 'visible': 1, 'dtype': 'int32'},
+            {'original_name': 'Price', 'final_name': 'price', 'visible': 1, 'dtype': 'float32'},
+            {'original_name': 'Day', 'final_name': 'day', 'visible': 1, 'dtype': 'date'},
+            {'original_name': 'Note', 'final_name': 'note', 'visible': 0}]
+
+
+@pytest.fixture
+def strategy(make_config, tmp_path):
+    """
+    Returns function creating IOStrategy of a test project with format strategy 'prices'.
+    """
+    def make(ini: dict = None):
+        return IOStrategy(make_config(ini, input_strategies={'prices': STRATEGY}), None)
+
+    make.data = tmp_path / 'data'
+    return make
+
+
+def write_prices(path, separator=','):
+    rows = ['ID{0}Price{0}Day{0}Note'.format(separator)]
+    rows += [separator.join([str(index), str(index * 1.5), '2020-01-0{}'.format(index + 1), 'n']) for index in range(3)]
+    path.write_text('\n'.join(rows) + '\n')
+
+
+def test_fast_csv_uses_declared_types_and_sniffed_separator(strategy):
+    io_strategy = strategy({'bool': {'fast_csv': 'true'}})
+    write_prices(strategy.data / 'prices.csv', separator=';')
+
+    df = io_strategy.read({'file_name': 'prices.csv', 'format_strategy': 'prices'})
+
+    assert list(df.columns) == ['id', 'price', 'day']
+    assert str(df['id'].dtype) == 'int32'
+    assert str(df['price'].dtype) == 'float32'
+    assert pd.api.types.is_datetime64_any_dtype(df['day'])
+
+
+def test_default_csv_parsing_infers_types(strategy):
+    io_strategy = strategy()
+    write_prices(strategy.data / 'prices.csv')
+
+    df = io_strategy.read({'file_name': 'prices.csv', 'format_strategy': 'prices'})
+
+    assert df['id'].tolist() == [0, 1, 2]
+    assert str(df['id'].dtype) == 'int64'
+
+
+def test_input_cache_key_includes_resolved_reader(strategy, tmp_path, monkeypatch):
+    write_prices(strategy.data / 'prices.csv')
+    input_file = {'file_name': 'prices.csv', 'format_strategy': 'prices'}
+    cache_directory = tmp_path / 'input_cache'
+
+    monkeypatch.setattr(IOStrategy, 'is_pyarrow_csv_available', staticmethod(lambda: False))
+    io_strategy = strategy({'bool': {'input_cache': 'true', 'fast_csv': 'true'}})
+    assert io_strategy.get_reader_options(input_file, 'csv') == {'csv_engine': 'c'}
+    io_strategy.read(input_file)
+    io_strategy.read(input_file)
+    assert len(list(cache_directory.glob('*.arrow'))) == 1
+
+    monkeypatch.setattr(IOStrategy, 'is_pyarrow_csv_available', staticmethod(lambda: True))
+    assert io_strategy.get_reader_options(input_file, 'csv') == {'csv_engine': 'pyarrow'}
+    io_strategy.read(input_file)
+    assert len(list(cache_directory.glob('*.arrow'))) == 2
+
+
+def test_reader_options_of_excel_follow_streaming_setting(strategy):
+    pytest.importorskip('openpyxl')
+    input_file = {'file_name': 'prices.xlsx'}
+
+    assert strategy().get_reader_options(input_file, 'xlsx') == {'excel_streaming': False}
+    assert strategy({'bool': {'excel_streaming': 'true'}}).get_reader_options(input_file, 'xlsx') == \
+        {'excel_streaming': True}
+    assert strategy({'bool': {'excel_streaming': 'true'}}).get_reader_options(input_file, 'xls') == \
+        {'excel_streaming': False}
+
+
+def test_streamed_excel_matches_read_excel(strategy):
+    pytest.importorskip('openpyxl')
+    frame = pd.DataFrame({'ID': [1, 2, 3], 'Price': [1.5, 3.0, 4.5], 'Note': ['a', 'b', 'c']})
+    frame.to_excel(str(strategy.data / 'prices.xlsx'), sheet_name='data', index=False)
+    input_file = {'file_name': 'prices.xlsx', 'sheet_name': 'data', 'original_names': ['ID', 'Price']}
+
+    streaming = strategy({'bool': {'excel_streaming': 'true'}})
+    try:
+        streamed = streaming.excel_load(input_file)
+    finally:
+        streaming.close_workbooks()
+
+    pd.testing.assert_frame_equal(streamed, strategy().excel_load(input_file))
+    assert streamed['ID'].tolist() == [1, 2, 3]
@@ -0,0 +1,96 @@
+import pytest
+from utils.logger import Logger, MethodStats
+
+logger = Logger(__name__)
+
+
+@logger.for_all_methods(in_args=False, skip_func=['skipped'])
+class Decorated:
+    def called(self, value):
+        return value * 2
+
+    def skipped(self):
+        return 1
+
+
+@pytest.fixture
+def method_stats(monkeypatch):
+    monkeypatch.setattr(Logger, 'method_stats', {})
+    monkeypatch.setattr(Logger, 'instrumentation', 'stats')
+    return Logger.method_stats
+
+
+def test_stats_mode_aggregates_calls(method_stats):
+    for value in range(3):
+        assert Decorated().called(value) == value * 2
+    Decorated().skipped()
+
+    assert list(Logger.method_stats) == ['Decorated.called']
+    assert Logger.method_stats['Decorated.called'].count == 3
+
+    Logger.log_method_stats()
+    assert Logger.method_stats == {}
+
+
+def test_off_mode_does_not_record(method_stats):
+    Logger.set_instrumentation('off')
+    Decorated().called(1)
+
+    assert Logger.method_stats == {}
+
+
+def test_unknown_mode_raises(method_stats):
+    with pytest.raises(Exception, match='not recognized'):
+        Logger.set_instrumentation('verbose')
+
+
+def test_percentile_of_bounded_sample():
+    stats = MethodStats(max_samples=10)
+    for duration in range(100):
+        stats.add(float(duration))
+
+    assert stats.count == 100
+    assert len(stats.samples) == 10
+    assert stats.max == 99.0
+    assert stats.percentile(100) == max(stats.samples)
+
+
+def test_queued_log_writer_writes_records(tmp_path):
+    import logging
+    log_file = str(tmp_path / 'log.csv')
+    try:
+        Logger.set_logger_settings(l_stream=None, l_filename=log_file, l_queue=True)
+        assert Logger.log_writer is not None
+
+        logger.info('queued record', inp_class='Test', inp_func='test')
+        Logger.flush_logs()
+
+        with open(log_file) as infile:
+            content = infile.read()
+        assert 'Test|test|user|code_exec|queued record' in content
+        assert content.startswith(str(Logger.run_id))
+    finally:
+        Logger.stop_log_writer()
+        for handler in logging.getLogger().handlers[:]:
+            logging.getLogger().removeHandler(handler)
+
+
+def test_run_ids_are_allocated_from_sidecar(tmp_path):
+    from datetime import datetime
+    now = datetime(2020, 1, 2)
+    log_file = str(tmp_path / 'log.csv')
+
+    first = Logger.get_last_run_id(now, filepath=log_file)
+    second = Logger.get_last_run_id(now, filepath=log_file)
+
+    assert first == 20200102000000001
+    assert second == first + 1
+    with open(log_file + '.runid') as infile:
+        assert int(infile.read()) == second
+
+
+def test_last_run_id_is_read_from_end_of_log(tmp_path):
+    log_file = tmp_path / 'log.csv'
+    log_file.write_text('20200102000000005|record\nTraceback line\n20200102000000007|record\nTraceback\n')
+
+    assert Logger.read_last_run_id(str(log_file)) == 20200102000000007
@@ -0,0 +1,121 @@
+import sys
+import json
+import logging
+import threading
+import tracemalloc
+import pandas as pd
+import pytest
+from main import MainExecution
+from utils.chunks import ChunkSource
+from utils.logger import Logger
+
+MODULE_SOURCE = '''
+import pandas as pd
+from manipulation.modules.abstract_module import Module
+
+
+class {class_name}(Module):
+    def execute(self, param):
+        df = self.variables.get_object(param['input_df'])
+        assert isinstance(df, pd.DataFrame)
+        self.variables.set_object(param['output_df'], df.assign(double=df['a'] * 2))
+'''
+
+
+@pytest.fixture
+def make_main(write_config, tmp_path, monkeypatch):
+    """
+    Returns function creating MainExecution with one module reading in_df and writing out_df.
+    """
+    monkeypatch.syspath_prepend(str(tmp_path / 'modules'))
+
+    def make(class_name: str, input_file: dict, ini: dict = None, source: str = MODULE_SOURCE):
+        monkeypatch.delitem(sys.modules, class_name.lower(), raising=False)
+        (tmp_path / 'modules' / (class_name.lower() + '.py')).write_text(source.format(class_name=class_name))
+
+        main_config_file = write_config(ini, input_files=[dict(input_file, variable_name='in_df',
+                                                               input_type='pandas', run='all')],
+                                        output_files=[{'file_name': 'out.csv', 'variable_name': 'out_df',
+                                                       'output_type': 'pandas'}],
+                                        modules=[{'class_name': class_name, 'module_path': class_name.lower(),
+                                                  'params': {'input_df': 'in_df', 'output_df': 'out_df'}}])
+        return MainExecution('{{"main_config_file": "{}", "mode": "execute"}}'.format(main_config_file))
+
+    yield make
+
+    Logger.stop_log_writer()
+    for handler in logging.getLogger().handlers[:]:
+        logging.getLogger().removeHandler(handler)
+        handler.close()
+
+
+@pytest.fixture
+def run_main(make_main):
+    """
+    Returns function running MainExecution with one module reading in_df and writing out_df.
+    """
+    def run(class_name: str, input_file: dict, ini: dict = None):
+        main_execution = make_main(class_name, input_file, ini)
+        main_execution.execute()
+        return main_execution
+
+    return run
+
+
+def test_module_runs_end_to_end(run_main, tmp_path):
+    (tmp_path / 'data' / 'in.csv').write_text('a,b\n1,x\n2,y\n')
+
+    main_execution = run_main('EndToEndModule', {'file_name': 'in.csv'})
+
+    assert main_execution.variables.get_status() == {'EndToEndModule': True}
+    out = pd.read_csv(str(tmp_path / 'data' / 'out.csv'))
+    assert out['double'].tolist() == [2, 4]
+
+
+def test_chunk_source_is_materialized_only_for_the_module(run_main, tmp_path):
+    (tmp_path / 'data' / 'in.csv').write_text('a,b\n' + ''.join('{},x\n'.format(value) for value in range(10)))
+
+    main_execution = run_main('ChunkedModule', {'file_name': 'in.csv', 'chunk_size': 3})
+
+    assert main_execution.variables.get_status() == {'ChunkedModule': True}
+    assert isinstance(main_execution.variables.get_object('in_df'), ChunkSource)
+    assert main_execution.variables.materialized == {}
+    out = pd.read_csv(str(tmp_path / 'data' / 'out.csv'))
+    assert out['double'].tolist() == [value * 2 for value in range(10)]
+
+
+def test_concurrent_executes_keep_own_memory_reports(make_main, tmp_path):
+    (tmp_path / 'data' / 'in.csv').write_text('a,b\n1,x\n2,y\n')
+    source = MODULE_SOURCE.replace('        df = self', '        time.sleep(0.3)\n        df = self')
+    source = 'import time\n' + source
+    executions = [make_main('SlowModule', {'file_name': 'in.csv'}, {'bool': {'memory_report': 'true'}},
+                            source=source) for _ in range(2)]
+    # reports of both runs are named by the same run id, they differ by execution count
+    executions[1].execution_count = 1
+
+    threads = [threading.Thread(target=execution.execute) for execution in executions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not tracemalloc.is_tracing()
+    for count in (1, 2):
+        with open(str(tmp_path / 'logs' / 'memory_{}_{}.json'.format(Logger.run_id, count))) as infile:
+            report = json.load(infile)
+        assert [(stage['stage'], stage['name']) for stage in report['stages']] == \
+            [('input', 'in.csv'), ('module', 'SlowModule'), ('output', 'out.csv')]
+
+
+def test_in_place_change_of_materialized_chunk_source_is_kept(make_main, tmp_path):
+    (tmp_path / 'data' / 'in.csv').write_text('a,b\n' + ''.join('{},x\n'.format(value) for value in range(10)))
+    source = MODULE_SOURCE.replace("        self.variables.set_object(param['output_df'], df.assign(double=df['a'] * 2))",
+                                   "        df['double'] = df['a'] * 2\n"
+                                   "        self.variables.set_object(param['output_df'], df[['double']])")
+
+    main_execution = make_main('InPlaceModule', {'file_name': 'in.csv', 'chunk_size': 3}, source=source)
+    main_execution.execute()
+
+    in_df = main_execution.variables.get_object('in_df')
+    assert isinstance(in_df, pd.DataFrame)
+    assert in_df['double'].tolist() == [value * 2 for value in range(10)]
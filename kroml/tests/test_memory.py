@@ -0,0 +1,68 @@
+import json
+import tracemalloc
+import numpy as np
+import pandas as pd
+from utils.memory import MemoryTracker, deep_size, format_size
+
+
+class Variables:
+    def __init__(self):
+        self.object_dict = {}
+
+    def get_object(self, key):
+        return self.object_dict[key]
+
+
+def test_measure_records_added_variables_and_peak(tmp_path):
+    tracker = MemoryTracker()
+    variables = Variables()
+    tracker.start(enabled=True)
+    try:
+        with tracker.measure('input', 'small.csv', variables):
+            variables.object_dict['small'] = pd.DataFrame({'a': np.arange(10)})
+        with tracker.measure('module', 'Big', variables):
+            variables.object_dict['big'] = pd.DataFrame({'a': np.arange(100000)})
+
+        tracker.save(str(tmp_path / 'memory.json'), run_id=1)
+    finally:
+        tracker.stop()
+
+    with open(str(tmp_path / 'memory.json')) as infile:
+        report = json.load(infile)
+
+    assert [stage['name'] for stage in report['stages']] == ['small.csv', 'Big']
+    assert report['stages'][1]['added_variables']['big'] >= 800000
+    assert report['peak_stage'] == {'stage': 'module', 'name': 'Big'}
+
+
+def test_disabled_tracker_records_nothing(tmp_path):
+    tracker = MemoryTracker()
+    tracker.start(enabled=False)
+    with tracker.measure('input', 'file', Variables()):
+        pass
+
+    tracker.save(str(tmp_path / 'memory.json'))
+    assert tracker.current.get().records == []
+    assert not (tmp_path / 'memory.json').exists()
+
+
+def test_deep_size_counts_shared_objects_once():
+    array = np.zeros(1000)
+    assert deep_size([array, array]) < 2 * array.nbytes
+    assert format_size(1536) == '1.5 KB'
+
+
+def test_tracemalloc_runs_until_last_run_stops():
+    tracker = MemoryTracker()
+    first = tracker.start(enabled=True)
+    second = tracker.start(enabled=True)
+
+    tracker.stop(first)
+    tracker.stop(first)
+    assert tracemalloc.is_tracing()
+    with tracker.measure('module', 'Second'):
+        pass
+    assert [record['name'] for record in second.records] == ['Second'] and first.records == []
+
+    tracker.stop(second)
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,35 @@
+import os
+import ast
+from managers.module_manager import ModuleManager
+
+
+def test_recognize_module_uses_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(ModuleManager, 'module_index', None)
+    directory = str(tmp_path / 'modules') + '/'
+    os.makedirs(directory)
+    with open(directory + 'first.py', 'w') as outfile:
+        outfile.write('class First:\n    pass\n')
+    index_file = str(tmp_path / 'index.pickle')
+
+    assert list(ModuleManager.recognize_module(directory, index_file=index_file)) == ['First']
+    assert os.path.isfile(index_file)
+
+    parsed = []
+    original = ModuleManager.get_declaration_from_source
+
+    def counting(text, obj_type=ast.ClassDef):
+        parsed.append(text)
+        return original(text, obj_type)
+
+    monkeypatch.setattr(ModuleManager, 'get_declaration_from_source', staticmethod(counting))
+    monkeypatch.setattr(ModuleManager, 'module_index', None)
+
+    # unchanged file is taken from persisted index
+    assert list(ModuleManager.recognize_module(directory, index_file=index_file)) == ['First']
+    assert parsed == []
+
+    with open(directory + 'first.py', 'w') as outfile:
+        outfile.write('class First:\n    pass\n\n\nclass Second:\n    pass\n')
+
+    assert sorted(ModuleManager.recognize_module(directory, index_file=index_file)) == ['First', 'Second']
+    assert len(parsed) == 1
@@ -0,0 +1,59 @@
+import json
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from utils.tracing import Tracer
+
+
+def test_concurrent_runs_keep_own_traces(tmp_path):
+    tracer = Tracer()
+    barrier = threading.Barrier(2)
+
+    def run(name):
+        trace = tracer.start(enabled=True)
+        with tracer.span(name, category='run'):
+            barrier.wait()
+            with tracer.span(name + '.child'):
+                barrier.wait()
+        tracer.save(str(tmp_path / (name + '.json')), run_id=name, trace=trace)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ('first', 'second')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in ('first', 'second'):
+        with open(str(tmp_path / (name + '.json'))) as infile:
+            trace = json.load(infile)
+        spans = {event['name']: event for event in trace['traceEvents'] if event['ph'] == 'X'}
+        assert sorted(spans) == [name, name + '.child']
+        assert spans[name + '.child']['args']['parent'] == name
+        assert trace['otherData']['run_id'] == name
+
+
+def test_span_in_thread_pool_belongs_to_run():
+    tracer = Tracer()
+    trace = tracer.start(enabled=True)
+
+    def work():
+        with tracer.span('work'):
+            pass
+
+    with tracer.span('parent'):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(contextvars.copy_context().run, work).result()
+
+    spans = {event['name']: event for event in trace.events}
+    assert spans['work']['args']['parent'] == 'parent'
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = Tracer()
+    trace = tracer.start(enabled=False)
+    with tracer.span('ignored'):
+        pass
+
+    tracer.save(str(tmp_path / 'trace.json'))
+    assert trace.events == []
+    assert not (tmp_path / 'trace.json').exists()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.variable_context import VariableContext
+
+MODULES = [{'class_name': 'First', 'param': {'input_df': 'a', 'output_df': 'b'}},
+           {'class_name': 'Second', 'param': {'input_df': 'b', 'output_df': 'c'}}]
+
+
+def frame(rows=20000):
+    return pd.DataFrame({'value': np.arange(rows, dtype='int64')})
+
+
+def test_only_variables_of_finished_consumers_are_spilled(make_config):
+    config = make_config({'float': {'memory_budget_mb': '0.2'}}, modules=MODULES,
+                         output_files=[{'file_name': 'c.csv', 'variable_name': 'c', 'output_type': 'pandas'}])
+    variables = VariableContext(config)
+
+    variables.set_object('a', frame())
+    variables.set_object('b', frame())
+    # consumers of 'a' and 'b' have not run yet, so they stay in memory even over the budget
+    assert set(variables.object_dict.loaded) == {'a', 'b'}
+
+    variables.set_module_status('First', True)
+    variables.set_object('c', frame())
+    assert 'a' in variables.object_dict.pending
+    assert set(variables.object_dict.loaded) == {'b', 'c'}
+
+    assert variables.get_object('a')['value'].sum() == frame()['value'].sum()
+
+
+def test_dead_variables_are_released(make_config):
+    config = make_config({'bool': {'evict_dead_variables': 'true'}}, modules=MODULES,
+                         output_files=[{'file_name': 'c.csv', 'variable_name': 'c', 'output_type': 'pandas'}])
+    variables = VariableContext(config)
+    for name in ('a', 'b', 'c'):
+        variables.set_object(name, frame(10))
+
+    variables.release_variables('First')
+    assert 'a' not in variables.object_dict
+    variables.release_variables('Second')
+    assert sorted(variables.object_dict) == ['c']
+
+
+def test_set_object_does_not_overwrite(make_config):
+    variables = VariableContext(make_config(modules=MODULES))
+    variables.set_object('a', 1)
+
+    with pytest.raises(Exception, match='existing value'):
+        variables.set_object('a', 2)
+    variables.set_object('a', 2, replace=True)
+    assert variables.get_object('a') == 2
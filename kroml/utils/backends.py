@@ -0,0 +1,83 @@
+import time
+import importlib
+import threading
+from utils.logger import Logger
+
+logger = Logger(__name__)
+
+# name of the backend: module to be imported when the backend is requested for the first time
+BACKENDS = {'postgresql': 'psycopg2',
+            'mysql': 'mysql.connector',
+            'oracle': 'cx_Oracle',
+            'sqlite': 'sqlite3',
+            'sqlalchemy': 'sqlalchemy',
+            'pyarrow': 'pyarrow',
+            'pyarrow.dataset': 'pyarrow.dataset',
+            'openpyxl': 'openpyxl',
+            'keras.models': 'keras.models',
+            'keras.layers': 'keras.layers',
+            'keras.utils': 'keras.utils'}
+
+import_times = {}
+
+import_lock = threading.Lock()
+
+
+def register_backend(name: str, module_path: str) -> None:
+    """
+    Registers backend, which is imported only when it is requested by get_backend.
+
+    :param str name: Name under which the backend is requested, e.g. type of database from config.
+    :param str module_path: Dotted path of module to be imported.
+    :return None: No return value
+    """
+    BACKENDS[name.lower()] = module_path
+
+
+def get_backend(name: str):
+    """
+    Imports backend registered under the name and measures time of the import.
+    Already imported backends are returned from sys.modules by importlib, so the cost is paid only once per process.
+
+    :param str name: Name of registered backend.
+    :return module: Imported module.
+    """
+    module_path = BACKENDS.get(name.lower())
+    if module_path is None:
+        raise Exception('Backend "{}" is not registered.'.format(name))
+
+    with import_lock:
+        if name.lower() in import_times:
+            return importlib.import_module(module_path)
+
+        start = time.perf_counter()
+        module = importlib.import_module(module_path)
+        import_times[name.lower()] = time.perf_counter() - start
+
+    logger.debug('Backend "{}" imported in {:.4f}s'.format(name, import_times[name.lower()]),
+                 inp_class='backends', inp_func='get_backend', msg_type='time', created_by='system')
+    return module
+
+
+def get_import_report() -> dict:
+    """
+    Returns time in seconds spent importing each backend used in the process.
+
+    :return dict: Dictionary with name of backend as the key and import time as value.
+    """
+    return dict(import_times)
+
+
+def log_import_report() -> None:
+    """
+    Writes import time of each used backend into log.
+
+    :return None: No return value
+    """
+    if not import_times:
+        logger.info('No backend was imported.', inp_class='backends', inp_func='log_import_report',
+                    msg_type='time', created_by='system')
+
+    for name, seconds in sorted(import_times.items(), key=lambda item: item[1], reverse=True):
+        logger.info('Backend "{}" import time: {:.4f}s'.format(name, seconds), inp_class='backends',
+                    inp_func='log_import_report', msg_type='time', created_by='system')
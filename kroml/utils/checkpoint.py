@@ -0,0 +1,308 @@
+import os
+import json
+import pickle
+import shutil
+import threading
+from collections.abc import MutableMapping
+import pandas as pd
+from utils.logger import Logger
+from utils.columnar import write_frame, read_frame
+from utils.hashing import hash_file
+
+logger = Logger(__name__)
+
+
+def is_checkpoint_file(file_name: str) -> bool:
+    """
+    Checks if file name has format of checkpoint variable file (<sha1 of content>.<extension>).
+
+    :param str file_name: Name of the file.
+    :return bool: True if file is checkpoint variable file.
+    """
+    content_hash = file_name.partition('.')[0]
+    return len(content_hash) == 40 and all(char in '0123456789abcdef' for char in content_hash)
+
+
+class LazyObjectDict(MutableMapping):
+    """
+    Dictionary of variable context objects. Objects restored from checkpoint are kept only as references to stored
+    files (pending objects) and are loaded on the first access. Membership test does not load the object.
+    Entries of loaded objects, which were not set since they were loaded or stored, are kept in entries, so
+    checkpoint can reuse them. Setting the object marks it dirty by removing its entry.
+    """
+    def __init__(self, loader):
+        self.loaded = {}
+        self.pending = {}
+        self.entries = {}
+        self.loader = loader
+
+    def __getitem__(self, key):
+        if key in self.loaded:
+            return self.loaded[key]
+
+        if key in self.pending:
+            obj = self.loader(key, self.pending[key])
+            self.loaded[key] = obj
+            self.entries[key] = self.pending.pop(key)
+            return obj
+
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self.pending.pop(key, None)
+        self.entries.pop(key, None)
+        self.loaded[key] = value
+
+    def __delitem__(self, key):
+        self.entries.pop(key, None)
+        if key in self.loaded:
+            del self.loaded[key]
+        elif key in self.pending:
+            del self.pending[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.loaded or key in self.pending
+
+    def __iter__(self):
+        yield from list(self.loaded)
+        yield from list(self.pending)
+
+    def __len__(self):
+        return len(self.loaded) + len(self.pending)
+
+    def set_pending(self, key, entry: dict) -> None:
+        """
+        Registers object stored in file, which is loaded on the first access.
+
+        :param str key: Key of the object in variable context.
+        :param dict entry: Checkpoint entry describing stored file.
+        :return None: No return value
+        """
+        self.loaded.pop(key, None)
+        self.entries.pop(key, None)
+        self.pending[key] = entry
+
+
+class CheckpointStore:
+    """
+    Checkpoint of variable context stored in directory with one file per variable. Files are named by hash of their
+    content and listed in manifest together with run status of modules. Manifest is a small JSON file describing each
+    variable (file, hash, size, type, shape and dtypes), so the checkpoint can be checked without reading any variable.
+    Only variables set since the last checkpoint are serialized, variables that were not loaded from checkpoint or
+    were loaded but not set again reuse their stored files. Object changed in place has to be set again
+    (set_object with replace=True) to be written.
+    If columnar is set, dataframes are stored in Arrow IPC format, which is memory-mapped on load and allows reading
+    only selected columns. Other objects are pickled.
+    """
+    INDEX_FILE = 'manifest.json'
+
+    def __init__(self, directory: str, columnar: bool = False):
+        self.directory = directory
+        self.columnar = columnar
+        self.index = None
+
+    def get_path(self, file_name: str, directory: str = None) -> str:
+        return os.path.join(directory or self.directory, file_name)
+
+    def read_index(self) -> dict:
+        """
+        Reads manifest of the checkpoint.
+
+        :return dict: Dictionary with keys 'status' and 'variables' or None if checkpoint does not exist.
+        """
+        try:
+            with open(self.get_path(self.INDEX_FILE), 'r') as infile:
+                self.index = json.load(infile)
+        except (OSError, ValueError):
+            self.index = None
+
+        return self.index
+
+    def check_files(self) -> list:
+        """
+        Checks that every variable file listed in manifest exists and has the recorded size. Content is not read.
+
+        :return list: Names of variables whose files are missing or changed.
+        """
+        invalid = []
+        for key, entry in (self.index or {}).get('variables', {}).items():
+            try:
+                if os.path.getsize(self.get_path(entry['file'])) != entry.get('bytes'):
+                    invalid.append(key)
+            except OSError:
+                invalid.append(key)
+
+        return invalid
+
+    @staticmethod
+    def describe(obj: object) -> dict:
+        """
+        Returns description of the object stored in manifest.
+
+        :param object obj: Described object.
+        :return dict: Dictionary with type of the object and for dataframes also its shape and dtypes of columns.
+        """
+        description = {'type': type(obj).__name__}
+
+        if isinstance(obj, pd.DataFrame):
+            description['shape'] = list(obj.shape)
+            description['dtypes'] = {str(column): str(dtype) for column, dtype in obj.dtypes.items()}
+        elif isinstance(obj, pd.Series):
+            description['shape'] = list(obj.shape)
+            description['dtypes'] = {str(obj.name): str(obj.dtype)}
+
+        return description
+
+    def load_object(self, key: str, entry: dict, columns: list = None) -> object:
+        """
+        Loads one object from checkpoint.
+
+        :param str key: Key of the object in variable context.
+        :param dict entry: Checkpoint entry describing stored file.
+        :param list columns: If object is dataframe, only these columns are loaded. All columns are loaded if None.
+        :return object: Restored object.
+        """
+        logger.debug('Restoring "{}" from checkpoint.'.format(key), inp_class='CheckpointStore',
+                     inp_func='load_object', created_by='system')
+
+        path = self.get_path(entry['file'], entry.get('directory'))
+
+        if entry.get('format') == 'arrow':
+            return read_frame(path, columns=columns)
+
+        with open(path, 'rb') as infile:
+            obj = pickle.load(infile)
+
+        if columns is not None and isinstance(obj, pd.DataFrame):
+            return obj[columns]
+        return obj
+
+    def serialize(self, obj: object, path: str) -> str:
+        """
+        Writes object into file in Arrow format if it is a dataframe and columnar storage is enabled, otherwise
+        pickles it. Object is written directly into the file, so no serialized copy is held in memory.
+
+        :param object obj: Serialized object.
+        :param str path: Path to the output file.
+        :return str: Name of used format ('arrow' or 'pickle').
+        """
+        if self.columnar and isinstance(obj, pd.DataFrame) and write_frame(obj, path):
+            return 'arrow'
+
+        with open(path, 'wb') as outfile:
+            pickle.dump(obj, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        return 'pickle'
+
+    def write_file(self, file_name: str, data: bytes) -> None:
+        """
+        Atomically writes file into checkpoint directory. Temporary file is named by process and thread, so
+        concurrent runs writing the same file do not replace each other's temporary file.
+
+        :param str file_name: Name of the file.
+        :param bytes data: Content of the file.
+        :return None: No return value
+        """
+        tmp_path = self.get_path('{}.{}.{}.tmp'.format(file_name, os.getpid(), threading.get_ident()))
+        with open(tmp_path, 'wb') as outfile:
+            outfile.write(data)
+        os.replace(tmp_path, self.get_path(file_name))
+
+    def store_object(self, obj: object) -> (dict, bool):
+        """
+        Stores one object into file named by hash of its content, unless such file already exists. Object is
+        written into temporary file, which is hashed by blocks and renamed.
+
+        :param object obj: Stored object.
+        :return (dict, bool): Entry describing stored file and True if the file was written.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        tmp_path = self.get_path('object.{}.{}.tmp'.format(os.getpid(), threading.get_ident()))
+        try:
+            data_format = self.serialize(obj, tmp_path)
+            content_hash = hash_file(tmp_path)
+            entry = {'file': content_hash + '.' + data_format, 'hash': content_hash, 'format': data_format,
+                     'bytes': os.path.getsize(tmp_path)}
+            entry.update(self.describe(obj))
+
+            # file name is given by content, so existing file already holds the same value
+            if os.path.isfile(self.get_path(entry['file'])):
+                return entry, False
+
+            os.replace(tmp_path, self.get_path(entry['file']))
+            return entry, True
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self) -> None:
+        """
+        Removes all variable files from the directory.
+
+        :return None: No return value
+        """
+        if not os.path.isdir(self.directory):
+            return None
+
+        for file_name in os.listdir(self.directory):
+            if is_checkpoint_file(file_name):
+                os.remove(self.get_path(file_name))
+
+    def reuse_entry(self, entry: dict) -> (dict, bool):
+        """
+        Returns entry of already stored object for the manifest. Object spilled to other directory is copied into
+        checkpoint without loading it.
+
+        :param dict entry: Checkpoint entry describing stored file.
+        :return (dict, bool): Entry describing file in checkpoint directory and True if the file was copied.
+        """
+        if entry.get('directory') is None:
+            return entry, False
+
+        is_copied = False
+        if not os.path.isfile(self.get_path(entry['file'])):
+            shutil.copyfile(self.get_path(entry['file'], entry['directory']), self.get_path(entry['file']))
+            is_copied = True
+        return {name: value for name, value in entry.items() if name != 'directory'}, is_copied
+
+    def save(self, run_status_dict: dict, object_dict: LazyObjectDict) -> None:
+        """
+        Saves changed variables and index of the checkpoint. Files not referenced by the new index are removed.
+
+        :param dict run_status_dict: Module execution dictionary.
+        :param LazyObjectDict object_dict: Objects of variable context.
+        :return None: No return value
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        variables = {}
+        written = 0
+
+        for key, entry in object_dict.pending.items():
+            entry, is_written = self.reuse_entry(entry)
+            written += is_written
+            variables[key] = entry
+
+        for key, obj in object_dict.loaded.items():
+            entry = object_dict.entries.get(key)
+            if entry is not None and os.path.isfile(self.get_path(entry['file'], entry.get('directory'))):
+                entry, is_written = self.reuse_entry(entry)
+            else:
+                entry, is_written = self.store_object(obj)
+                # stored object is clean until it is set again
+                object_dict.entries[key] = entry
+            written += is_written
+            variables[key] = entry
+
+        self.index = {'status': run_status_dict, 'variables': variables}
+        self.write_file(self.INDEX_FILE, json.dumps(self.index, indent=2).encode())
+
+        referenced = {entry['file'] for entry in variables.values()}
+        for file_name in os.listdir(self.directory):
+            if file_name not in referenced and is_checkpoint_file(file_name):
+                os.remove(self.get_path(file_name))
+
+        logger.info('Checkpoint saved, {} of {} variables written.'.format(written, len(variables)),
+                    inp_class='CheckpointStore', inp_func='save', created_by='system')
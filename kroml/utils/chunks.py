@@ -0,0 +1,90 @@
+import pandas as pd
+from utils.logger import Logger
+
+logger = Logger(__name__)
+
+
+class ChunkSource:
+    """
+    Re-iterable source of dataframe chunks stored in variable context instead of whole dataframe. Every iteration
+    opens the source again by calling reader, so only one chunk is held in memory at a time and the source can be
+    processed by several modules or writers. Reader should be picklable (e.g. functools.partial of pd.read_csv),
+    so the source can be checkpointed together with other variables.
+    """
+    def __init__(self, reader, rename_names: dict = None, transforms: list = None):
+        """
+        :param reader: Callable without arguments returning iterable of dataframes.
+        :param dict rename_names: Columns of each chunk are renamed according to this dictionary.
+        :param list transforms: Functions applied on each chunk in given order after renaming.
+        """
+        self.reader = reader
+        self.rename_names = rename_names or {}
+        self.transforms = transforms or []
+
+    def __iter__(self):
+        chunks = self.reader()
+        try:
+            for chunk in chunks:
+                if self.rename_names:
+                    chunk = chunk.rename(columns=self.rename_names)
+                for transform in self.transforms:
+                    chunk = transform(chunk)
+                yield chunk
+        finally:
+            # TextFileReader of pandas keeps the file open until it is closed
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def map(self, funct) -> 'ChunkSource':
+        """
+        Returns new chunk source applying the function on each chunk of this source.
+
+        :param funct: Function taking a dataframe chunk and returning transformed dataframe.
+        :return ChunkSource: New chunk source, this source is not changed.
+        """
+        return ChunkSource(self.reader, self.rename_names, self.transforms + [funct])
+
+    def materialize(self) -> pd.DataFrame:
+        """
+        Reads all chunks and concatenates them into one dataframe, see concat_chunks.
+
+        :return pd.DataFrame: Whole dataframe.
+        """
+        return concat_chunks(self)
+
+
+def concat_chunks(chunks) -> pd.DataFrame:
+    """
+    Concatenates dataframe chunks into one dataframe with new range index. Columns of each chunk are copied when the
+    chunk is read, so the chunk can be released before the next one is read, and each column of the result releases
+    its parts once it is built. Memory peak is therefore about the size of the result plus one chunk and one column,
+    while list of chunks passed to pd.concat holds the whole result twice. Chunks are expected to have the same
+    columns as the first chunk, missing columns are filled with NaN and other columns are dropped.
+
+    :param chunks: Iterable of dataframes, e.g. generator or ChunkSource.
+    :return pd.DataFrame: Concatenated dataframe, empty dataframe if there is no chunk.
+    """
+    columns, parts = None, None
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            parts = [[] for _ in columns]
+        elif list(chunk.columns) != columns:
+            chunk = chunk.reindex(columns=columns)
+
+        for position, part in enumerate(parts):
+            part.append(chunk.iloc[:, position].reset_index(drop=True).copy())
+        del chunk
+
+    if columns is None:
+        return pd.DataFrame()
+
+    data = {}
+    for position in range(len(columns)):
+        data[position] = pd.concat(parts[position], ignore_index=True) if len(parts[position]) > 1 \
+            else parts[position][0]
+        parts[position] = None
+
+    df = pd.DataFrame(data, copy=False)
+    df.columns = columns
+    return df
@@ -0,0 +1,105 @@
+import pandas as pd
+from utils.logger import Logger
+from utils.backends import get_backend
+from utils.filters import to_arrow_expression
+
+logger = Logger(__name__)
+
+ARROW_MAGIC = b'ARROW1'
+
+
+def is_arrow_available() -> bool:
+    """
+    Checks if pyarrow is installed.
+
+    :return bool: True if pyarrow can be imported.
+    """
+    try:
+        get_backend('pyarrow')
+        return True
+    except ImportError:
+        return False
+
+
+def is_arrow_file(path: str) -> bool:
+    """
+    Checks if file is stored in Arrow IPC (Feather V2) file format.
+
+    :param str path: Path to the file.
+    :return bool: True if file starts with Arrow magic bytes.
+    """
+    try:
+        with open(path, 'rb') as infile:
+            return infile.read(len(ARROW_MAGIC)) == ARROW_MAGIC
+    except OSError:
+        return False
+
+
+def write_frame(df: pd.DataFrame, path: str) -> bool:
+    """
+    Writes dataframe into Arrow IPC file. Index and pandas dtypes are kept in schema metadata. Table is written
+    directly into the file, so no serialized copy of the dataframe is held in memory.
+
+    :param pd.DataFrame df: Written dataframe.
+    :param str path: Path to the output file.
+    :return bool: True if dataframe was written, False if it cannot be represented in Arrow (e.g. mixed types in
+                  object column or non-string column names) or pyarrow is not installed.
+    """
+    try:
+        pa = get_backend('pyarrow')
+        table = pa.Table.from_pandas(df)
+    except ImportError:
+        return False
+    except Exception as e:
+        logger.debug('Dataframe cannot be stored in Arrow format: {}'.format(e), inp_class='columnar',
+                     inp_func='write_frame', created_by='system')
+        return False
+
+    with pa.ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table)
+    return True
+
+
+def read_frame(path: str, columns: list = None, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Reads dataframe from Arrow IPC file. File is memory-mapped, so only requested columns are read from disk.
+
+    :param str path: Path to the Arrow file.
+    :param list columns: Names of columns to be read. All columns are read if None.
+    :param bool memory_map: If True, file is memory-mapped instead of read into memory.
+    :return pd.DataFrame: Loaded dataframe.
+    """
+    pa = get_backend('pyarrow')
+
+    source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+    with source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            # index stored as columns has to be read together with requested columns
+            pandas_metadata = table.schema.pandas_metadata or {}
+            index_columns = [column for column in pandas_metadata.get('index_columns', [])
+                             if isinstance(column, str) and column not in columns]
+            table = table.select(list(columns) + index_columns)
+        return table.to_pandas()
+
+
+def scan_frame(path: str, file_format: str = 'ipc', columns: list = None, conditions: list = None) -> pd.DataFrame:
+    """
+    Reads dataframe from Parquet or Arrow IPC file by pyarrow dataset scan. Row filter is evaluated during the scan,
+    so row groups excluded by their statistics are skipped and filtered rows are never converted to pandas.
+
+    :param str path: Path to the file.
+    :param str file_format: Format of the file ('parquet' or 'ipc').
+    :param list columns: Names of columns to be read. All columns are read if None.
+    :param list conditions: Normalized row filter (see utils.filters.normalize_filters).
+    :return pd.DataFrame: Loaded dataframe.
+    """
+    dataset = get_backend('pyarrow.dataset').dataset(path, format=file_format)
+
+    if columns is not None:
+        pandas_metadata = dataset.schema.pandas_metadata or {}
+        columns = list(columns) + [column for column in pandas_metadata.get('index_columns', [])
+                                   if isinstance(column, str) and column not in columns]
+
+    table = dataset.to_table(columns=columns, filter=to_arrow_expression(conditions or [], dataset.schema))
+    return table.to_pandas()
@@ -1,21 +1,36 @@
 import os
 import json
+import pickle
+import hashlib
 import configparser
 
+CONFIG_CACHE_VERSION = 1
+
 
 class ConfigParser:
     """
     Reads the config file and stores all the values in config object.
+
+    Merged values of all .ini and .json files found in config directory are compiled into a snapshot file
+    (key 'config_cache' in [default] section of main config). The snapshot is reused on the next start as long as
+    none of the source files was added, removed or changed.
     """
     def __init__(self, main_config_file='main_config.ini', mode='execute'):
 
+        self.attributes = {}
+
         self.config_ini = configparser.ConfigParser()
 
         self.config_ini.read(main_config_file)
 
-        self.config_dir = self.config_ini[mode]['config_dir']
+        self.set_attr('config_dir', self.config_ini[mode]['config_dir'])
 
-        self.log_file = self.config_ini['default']['log_dir'] + self.config_ini['default']['log_file']
+        self.set_attr('log_file', self.config_ini['default']['log_dir'] + self.config_ini['default']['log_file'])
+
+        if self.config_ini['default'].get('config_cache'):
+            self.config_cache = self.config_dir + self.config_ini['default']['config_cache']
+        else:
+            self.config_cache = None
 
         self.config_ini = configparser.ConfigParser()
 
@@ -37,26 +52,40 @@ class ConfigParser:
                 else:
                     continue
 
-        self.get_ini_attrs(ini_files)
+        compiled = self.load_compiled_config(ini_files + json_files)
+
+        if compiled is not None:
+            for key, value in compiled.items():
+                self.set_attr(key, value)
+        else:
+            default_keys = set(self.attributes)
 
-        self.get_json_attrs(json_files)
+            self.get_ini_attrs(ini_files)
+
+            self.get_json_attrs(json_files)
+
+            self.save_compiled_config(ini_files + json_files,
+                                      {key: value for key, value in self.attributes.items()
+                                       if key not in default_keys})
 
     def set_attr(self, attribute_name, value, overwrite=False):
         """
         Method for loading attributes from config.json
         Sets attributes, and reaasigns values.
         """
-        if attribute_name in dir(self) and not overwrite:
+        if not overwrite and (attribute_name in self.__dict__ or hasattr(type(self), attribute_name)):
             raise Exception(f"Attribute \"{attribute_name}\" already exists, value was NOT overwritten")
 
         self.__setattr__(attribute_name, value)
+        self.attributes[attribute_name] = value
 
     def get_attr(self, attribute_name, default=None):
         """
         Method for finding attributes
         """
-        if attribute_name in dir(self) and self.__getattribute__(attribute_name) is not None:
-            return self.__getattribute__(attribute_name)
+        value = self.attributes.get(attribute_name)
+        if value is not None:
+            return value
 
         return default
 
@@ -84,6 +113,96 @@ class ConfigParser:
                 for key, value in attr_dict.items():
                     self.set_attr(key, value)
 
+    @staticmethod
+    def get_file_fingerprint(file_path: str, with_hash: bool = True) -> dict:
+        """
+        Returns modification time, size and optionally hash of the content of the file.
+
+        :param str file_path: Path to the config file.
+        :param bool with_hash: If True, content of the file is read and hashed.
+        :return dict: Dictionary with keys 'mtime', 'size' and 'hash'.
+        """
+        stat = os.stat(file_path)
+        fingerprint = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'hash': None}
+
+        if with_hash:
+            with open(file_path, 'rb') as infile:
+                fingerprint['hash'] = hashlib.sha1(infile.read()).hexdigest()
+
+        return fingerprint
+
+    def load_compiled_config(self, files_arr) -> dict:
+        """
+        Loads compiled snapshot of config values if it was built from the same set of config files.
+        Files with changed modification time are re-hashed, so only real change of content invalidates the snapshot.
+
+        :param list files_arr: Paths to all config files found in config directory.
+        :return dict: Dictionary with config values or None if snapshot does not exist or is outdated.
+        """
+        if self.config_cache is None or not os.path.isfile(self.config_cache):
+            return None
+
+        try:
+            with open(self.config_cache, 'rb') as infile:
+                snapshot = pickle.load(infile)
+        except Exception:
+            return None
+
+        if snapshot.get('version') != CONFIG_CACHE_VERSION or set(snapshot['files']) != set(files_arr):
+            return None
+
+        refreshed = False
+        for file_path, cached in snapshot['files'].items():
+            fingerprint = self.get_file_fingerprint(file_path, with_hash=False)
+            if fingerprint['mtime'] == cached['mtime'] and fingerprint['size'] == cached['size']:
+                continue
+
+            fingerprint = self.get_file_fingerprint(file_path)
+            if fingerprint['hash'] != cached['hash']:
+                return None
+
+            snapshot['files'][file_path] = fingerprint
+            refreshed = True
+
+        if refreshed:
+            self.write_compiled_config(snapshot)
+
+        return snapshot['attributes']
+
+    def save_compiled_config(self, files_arr, attributes: dict) -> None:
+        """
+        Saves compiled config values together with fingerprints of the files they were read from.
+
+        :param list files_arr: Paths to all config files found in config directory.
+        :param dict attributes: Config values read from the files.
+        :return None: No return value
+        """
+        if self.config_cache is None:
+            return None
+
+        snapshot = {'version': CONFIG_CACHE_VERSION,
+                    'files': {file_path: self.get_file_fingerprint(file_path) for file_path in files_arr},
+                    'attributes': attributes}
+
+        self.write_compiled_config(snapshot)
+
+    def write_compiled_config(self, snapshot: dict) -> None:
+        """
+        Atomically replaces snapshot file, so concurrently starting processes never read a half written file.
+        Snapshot is only an optimization, failure to write it is ignored.
+
+        :param dict snapshot: Snapshot to be written.
+        :return None: No return value
+        """
+        tmp_file = f"{self.config_cache}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as outfile:
+                pickle.dump(snapshot, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.config_cache)
+        except OSError:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
     def update_config(self, run_json: str):
         run_json_dict = json.loads(run_json)
         for key, value in run_json_dict.items():
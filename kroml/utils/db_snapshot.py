@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import threading
+import pandas as pd
+from utils.logger import Logger
+from utils.columnar import read_frame, write_frame
+
+logger = Logger(__name__)
+
+DB_SNAPSHOT_DIR = 'db_snapshot/'
+
+DB_SNAPSHOT_VERSION = 1
+
+
+class DBSnapshot:
+    """
+    Local snapshot of rows already fetched by incremental database query. Rows are stored in Arrow IPC file named
+    by fingerprint of the query: database, table, condition, selected columns, watermark and key columns. Changed
+    query therefore starts a new snapshot, which is filled by full read of the table.
+    """
+    def __init__(self, directory: str = DB_SNAPSHOT_DIR):
+        """
+        :param str directory: Directory of the snapshots.
+        """
+        self.directory = directory
+
+    @staticmethod
+    def get_key(input_database: dict, query_values: dict, columns: list = None) -> str:
+        """
+        Returns fingerprint of the query used as name of snapshot file.
+
+        :param dict input_database: Database from input_db in config.
+        :param dict query_values: Query from config.
+        :param list columns: Selected columns, all columns are selected if None.
+        :return str: Hexadecimal fingerprint.
+        """
+        fingerprint = {'version': DB_SNAPSHOT_VERSION,
+                       'database': [str(input_database.get('type')).lower(), input_database.get('url'),
+                                    input_database.get('port'), input_database.get('db_name'),
+                                    input_database.get('sid')],
+                       'query': {key: value for key, value in query_values.items()
+                                 if key not in ('variable_name', 'fetch_size', 'optimize_dtypes', 'partition')},
+                       'columns': columns}
+
+        return hashlib.sha1(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.arrow')
+
+    def get(self, key: str) -> pd.DataFrame:
+        """
+        Returns stored snapshot.
+
+        :param str key: Fingerprint of the query.
+        :return pd.DataFrame: Snapshot or None if the query has no snapshot yet.
+        """
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return read_frame(path, memory_map=False)
+        except Exception as e:
+            logger.warning('Snapshot "{}" cannot be read, table is read again: {}'.format(path, e),
+                           inp_class='DBSnapshot', inp_func='get', created_by='system')
+            return None
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Replaces stored snapshot by the dataframe.
+
+        :param str key: Fingerprint of the query.
+        :param pd.DataFrame df: Rows fetched so far.
+        :return bool: True if dataframe was stored, False if it cannot be represented in Arrow format.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        # snapshot is replaced atomically, so interrupted run leaves the previous snapshot
+        tmp_path = '{}.{}.{}.tmp'.format(self.get_path(key), os.getpid(), threading.get_ident())
+        if not write_frame(df, tmp_path):
+            logger.warning('Snapshot "{}" cannot be stored in Arrow format.'.format(self.get_path(key)),
+                           inp_class='DBSnapshot', inp_func='put', created_by='system')
+            return False
+        os.replace(tmp_path, self.get_path(key))
+        return True
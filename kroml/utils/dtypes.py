@@ -0,0 +1,105 @@
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype, is_object_dtype, is_string_dtype
+from utils.logger import Logger
+from utils.memory import format_size
+
+logger = Logger(__name__)
+
+# default maximal ratio of unique values to rows of string column converted to categorical
+CATEGORY_THRESHOLD = 0.05
+# int64 column is downcast to int32 only if its values are within this bound, so sums and differences of two values
+# still fit into int32
+INT32_BOUND = 2 ** 30
+
+
+def get_dtype_hints(strategy: list) -> dict:
+    """
+    Returns types declared with key 'dtype' in format strategy for visible columns, used by optimize_dtypes.
+    Declared type is a pandas dtype, 'date' (dates are parsed) or 'keep' (column is left unchanged).
+
+    :param list strategy: Columns of format strategy.
+    :return dict: Dictionary with final name of column as a key and declared type as a value.
+    """
+    hints = {}
+
+    for sv in strategy:
+        if sv.get('visible', 1) == 1 and 'final_name' in sv and sv.get('dtype'):
+            hints[sv['final_name']] = sv['dtype']
+
+    return hints
+
+
+def downcast_column(column: pd.Series) -> pd.Series:
+    """
+    Downcasts numeric column to a smaller type which is still safe for later arithmetic. int64 column is downcast
+    to int32 only if all values are within INT32_BOUND, other integer columns are kept. Unsigned types are never
+    chosen, because subtraction of them wraps around. Float column is downcast to float32 only if all values are
+    represented exactly, so no precision is lost.
+
+    :param pd.Series column: Downcast column.
+    :return pd.Series: Downcast column or the same column if it cannot be downcast safely.
+    """
+    if is_bool_dtype(column.dtype):
+        return column
+
+    if is_integer_dtype(column.dtype):
+        if column.dtype == 'int64' and column.between(-INT32_BOUND, INT32_BOUND).all():
+            return column.astype('int32')
+        return column
+
+    if is_float_dtype(column.dtype):
+        downcast = pd.to_numeric(column, downcast='float')
+        if downcast.dtype != column.dtype and \
+                ((downcast.astype(column.dtype) == column) | (downcast.isna() & column.isna())).all():
+            return downcast
+
+    return column
+
+
+def optimize_dtypes(df: pd.DataFrame, hints: dict = None, category_threshold: float = CATEGORY_THRESHOLD,
+                    name: str = None) -> pd.DataFrame:
+    """
+    Reduces memory of dataframe. Columns with hint are converted to the hinted type ('date' parses dates,
+    'keep' leaves the column unchanged). Other string columns whose ratio of unique values to rows is at most
+    category_threshold are converted to categoricals and numeric columns are downcast safely. Default threshold
+    of 5 % converts only columns with many repeated values, where categorical codes save memory and keep
+    comparisons and grouping cheap; columns with more distinct values stay strings.
+
+    :param pd.DataFrame df: Optimized dataframe.
+    :param dict hints: Dictionary with column name as a key and dtype as a value.
+    :param float category_threshold: Maximal ratio of unique values to number of rows of categorical column.
+    :param str name: Name of the dataframe used in log.
+    :return pd.DataFrame: Dataframe with optimized dtypes.
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+
+    hints = hints or {}
+    memory_before = int(df.memory_usage(index=True, deep=True).sum())
+
+    columns = {}
+    for column_name in df.columns:
+        column = df[column_name]
+        hint = hints.get(column_name)
+
+        if hint == 'keep':
+            continue
+        elif hint == 'date':
+            columns[column_name] = pd.to_datetime(column, errors='coerce')
+        elif hint:
+            columns[column_name] = column.astype(hint)
+        elif is_object_dtype(column.dtype) or is_string_dtype(column.dtype):
+            if column.nunique(dropna=True) <= category_threshold * len(column):
+                columns[column_name] = column.astype('category')
+        else:
+            columns[column_name] = downcast_column(column)
+
+    df = df.copy(deep=False)
+    for column_name, column in columns.items():
+        df[column_name] = column
+
+    memory_after = int(df.memory_usage(index=True, deep=True).sum())
+    logger.info('Dtypes of "{}" optimized, memory {} -> {}.'.format(name, format_size(memory_before),
+                                                                     format_size(memory_after)),
+                inp_class='dtypes', inp_func='optimize_dtypes', msg_type='memory', created_by='system')
+    return df
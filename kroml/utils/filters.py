@@ -0,0 +1,134 @@
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from utils.backends import get_backend
+
+# operators of row filter, 'between' is expanded into '>=' and '<='
+OPERATORS = ['==', '!=', '<', '<=', '>', '>=', 'in', 'not in']
+
+
+def normalize_filters(filters: list) -> list:
+    """
+    Converts row filter from config into list of (column, operator, value) conditions, which all have to be met.
+    Condition is given as a list [column, operator, value] or a dictionary with keys 'column', 'op' and 'value',
+    e.g. ["RECONPERIOD_DATE", "between", ["2019-01-01", "2019-12-31"]] or ["FRS_BUSINESS_UNIT", "in", ["BU1"]].
+
+    :param list filters: Row filter from config.
+    :return list: List of conditions (column, operator, value).
+    """
+    conditions = []
+    for condition in filters or []:
+        if isinstance(condition, dict):
+            column, operator, value = condition.get('column'), condition.get('op'), condition.get('value')
+        else:
+            column, operator, value = condition
+
+        operator = '==' if operator in ('=', 'eq') else str(operator).lower()
+        if operator == 'between':
+            conditions.append((column, '>=', value[0]))
+            conditions.append((column, '<=', value[1]))
+        elif operator in OPERATORS:
+            conditions.append((column, operator, list(value) if operator in ('in', 'not in') else value))
+        else:
+            raise Exception('Filter operator "{}" of column "{}" not recognized.'.format(operator, column))
+
+    return conditions
+
+
+def filter_columns(conditions: list) -> list:
+    """
+    Returns names of columns used in the filter.
+
+    :param list conditions: Normalized row filter.
+    :return list: Names of columns in order of their first use.
+    """
+    columns = []
+    for column, _, _ in conditions:
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def filter_frame(df: pd.DataFrame, conditions: list, columns: list = None) -> pd.DataFrame:
+    """
+    Keeps only rows of dataframe meeting all conditions. Values compared with datetime columns are parsed as dates.
+
+    :param pd.DataFrame df: Filtered dataframe.
+    :param list conditions: Normalized row filter.
+    :param list columns: If given, only these columns are returned (filter may use other columns).
+    :return pd.DataFrame: Filtered dataframe with new range index.
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, operator, value in conditions:
+        values = df[column]
+        if is_datetime64_any_dtype(values.dtype):
+            value = [pd.Timestamp(item) for item in value] if isinstance(value, list) else pd.Timestamp(value)
+
+        if operator == 'in':
+            mask &= values.isin(value)
+        elif operator == 'not in':
+            mask &= ~values.isin(value)
+        elif operator == '==':
+            mask &= values == value
+        elif operator == '!=':
+            mask &= values != value
+        elif operator == '<':
+            mask &= values < value
+        elif operator == '<=':
+            mask &= values <= value
+        elif operator == '>':
+            mask &= values > value
+        elif operator == '>=':
+            mask &= values >= value
+
+    df = df[mask] if columns is None else df.loc[mask, columns]
+    return df.reset_index(drop=True)
+
+
+def to_arrow_expression(conditions: list, schema) -> 'pyarrow.dataset.Expression':
+    """
+    Converts row filter into pyarrow dataset expression, which allows skipping row groups by their statistics.
+    Values compared with date and timestamp columns are parsed as dates.
+
+    :param list conditions: Normalized row filter.
+    :param pyarrow.Schema schema: Schema of the scanned file.
+    :return pyarrow.dataset.Expression: Expression or None if there is no condition.
+    """
+    pa = get_backend('pyarrow')
+    ds = get_backend('pyarrow.dataset')
+
+    def coerce(value, arrow_type):
+        if pa.types.is_timestamp(arrow_type):
+            return pd.Timestamp(value).to_pydatetime()
+        if pa.types.is_date(arrow_type):
+            return pd.Timestamp(value).date()
+        return value
+
+    expression = None
+    for column, operator, value in conditions:
+        field = ds.field(column)
+        arrow_type = schema.field(column).type
+        if isinstance(value, list):
+            value = [coerce(item, arrow_type) for item in value]
+        else:
+            value = coerce(value, arrow_type)
+
+        if operator == 'in':
+            condition = field.isin(value)
+        elif operator == 'not in':
+            condition = ~field.isin(value)
+        elif operator == '==':
+            condition = field == value
+        elif operator == '!=':
+            condition = field != value
+        elif operator == '<':
+            condition = field < value
+        elif operator == '<=':
+            condition = field <= value
+        elif operator == '>':
+            condition = field > value
+        else:
+            condition = field >= value
+
+        expression = condition if expression is None else expression & condition
+
+    return expression
@@ -0,0 +1,16 @@
+import hashlib
+
+
+def hash_file(file_name: str, block_size: int = 1 << 20) -> str:
+    """
+    Returns sha1 hash of the file content, the file is read by blocks.
+
+    :param str file_name: Path to the file.
+    :param int block_size: Size of read block in bytes.
+    :return str: Hexadecimal hash of the content.
+    """
+    content_hash = hashlib.sha1()
+    with open(file_name, 'rb') as infile:
+        for block in iter(lambda: infile.read(block_size), b''):
+            content_hash.update(block)
+    return content_hash.hexdigest()
@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import threading
+import pandas as pd
+from utils.logger import Logger
+from utils.columnar import read_frame, write_frame
+from utils.hashing import hash_file
+
+logger = Logger(__name__)
+
+INPUT_CACHE_DIR = 'input_cache/'
+
+INPUT_CACHE_VERSION = 1
+
+
+class InputCache:
+    """
+    Cache of parsed input files. Dataframe after renaming and column selection is stored in Arrow IPC file named
+    by fingerprint of the input: path, size and modification time (or hash of the content) of the file, format
+    strategy and options of the loader. Changed file or config therefore leads to different file and stale entries
+    are removed by size-bounded LRU eviction - the least recently used files are deleted when the total size of
+    the cache exceeds max_bytes.
+    """
+    def __init__(self, directory: str = INPUT_CACHE_DIR, max_bytes: int = None, content_hash: bool = False):
+        """
+        :param str directory: Directory of the cache.
+        :param int max_bytes: Maximal total size of cached files, the size is not limited if None.
+        :param bool content_hash: If True, file is identified by hash of its content instead of modification time.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+
+    def get_key(self, file_name: str, input_file: dict, strategy: list = None) -> str:
+        """
+        Returns fingerprint of the input used as name of cached file.
+
+        :param str file_name: Path to the input file.
+        :param dict input_file: Input file from config, all its options except of the variable name are included.
+        :param list strategy: Columns of format strategy of the input file.
+        :return str: Hexadecimal fingerprint.
+        """
+        stat = os.stat(file_name)
+        fingerprint = {'version': INPUT_CACHE_VERSION,
+                       'path': os.path.abspath(file_name),
+                       'size': stat.st_size,
+                       'content': hash_file(file_name) if self.content_hash else stat.st_mtime_ns,
+                       'options': {key: value for key, value in input_file.items()
+                                   if key not in ('variable_name', 'run', 'input_type')},
+                       'strategy': strategy}
+
+        return hashlib.sha1(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.arrow')
+
+    def get(self, key: str) -> pd.DataFrame:
+        """
+        Returns cached dataframe and marks it as recently used.
+
+        :param str key: Fingerprint of the input.
+        :return pd.DataFrame: Cached dataframe or None if the input is not cached.
+        """
+        path = self.get_path(key)
+        try:
+            os.utime(path)
+            return read_frame(path, memory_map=False)
+        except OSError:
+            return None
+        except Exception as e:
+            logger.warning('Cached input "{}" cannot be read: {}'.format(path, e), inp_class='InputCache',
+                           inp_func='get', created_by='system')
+            return None
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Stores dataframe into cache and evicts the least recently used files if the cache is over its size.
+
+        :param str key: Fingerprint of the input.
+        :param pd.DataFrame df: Parsed dataframe.
+        :return bool: True if dataframe was stored, False if it cannot be represented in Arrow format.
+        """
+        if not isinstance(df, pd.DataFrame):
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # each writer uses its own temporary file, so the same input can be stored concurrently
+        tmp_path = '{}.{}.{}.tmp'.format(self.get_path(key), os.getpid(), threading.get_ident())
+        if not write_frame(df, tmp_path):
+            return False
+        os.replace(tmp_path, self.get_path(key))
+
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used files until total size of the cache is within max_bytes.
+
+        :return None: No return value
+        """
+        if not self.max_bytes:
+            return None
+
+        files = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.arrow'):
+                try:
+                    stat = os.stat(self.get_path(file_name[:-len('.arrow')]))
+                    files.append((stat.st_mtime, stat.st_size, file_name))
+                except OSError:
+                    continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, file_name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+                total -= size
+                logger.debug('Cached input "{}" evicted.'.format(file_name), inp_class='InputCache',
+                             inp_func='evict', created_by='system')
+            except OSError:
+                continue
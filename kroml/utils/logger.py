@@ -1,32 +1,288 @@
 import time
+import queue
+import random
+import atexit
 import logging
+import logging.handlers
 import sys
 import inspect
+import functools
+import threading
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def lock_file(file) -> None:
+    """
+    Acquires exclusive lock of opened file, blocks until the lock is available.
+
+    :param file: Opened file object.
+    :return None: No return value
+    """
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def unlock_file(file) -> None:
+    """
+    Releases lock acquired by lock_file.
+
+    :param file: Opened file object.
+    :return None: No return value
+    """
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class MethodStats:
+    """
+    In-memory timing aggregates of one decorated method. Percentiles are computed from a bounded reservoir sample
+    of call durations, so memory does not grow with number of calls.
+    """
+    def __init__(self, max_samples: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.max_samples = max_samples
+        self.samples = []
+
+    def add(self, duration: float) -> None:
+        """
+        Adds duration of one call into aggregates.
+
+        :param float duration: Duration of the call in seconds.
+        :return None: No return value
+        """
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+        if len(self.samples) < self.max_samples:
+            self.samples.append(duration)
+        else:
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = duration
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns percentile of sampled call durations (nearest-rank method).
+
+        :param float percent: Percentile in range 0 - 100.
+        :return float: Duration in seconds.
+        """
+        if not self.samples:
+            return 0.0
+
+        ordered = sorted(self.samples)
+        index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+
+class QueuedLogWriter(threading.Thread):
+    """
+    Background thread writing log records handed over by QueueHandler. Records waiting in the queue are formatted
+    and written to the log file and stream in batches, so logging threads never block on file or console I/O.
+    """
+    def __init__(self, formatter: logging.Formatter, filename: str = None, stream=None, batch_size: int = 500):
+        super().__init__(name='QueuedLogWriter', daemon=True)
+        self.queue = queue.Queue()
+        self.formatter = formatter
+        self.stream = stream
+        self.batch_size = batch_size
+        self.stop_marker = object()
+
+        if filename is not None:
+            self.file = open(filename, 'a')
+        else:
+            self.file = None
+
+    def run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            events = []
+            for item in batch:
+                if item is self.stop_marker:
+                    stopped = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    try:
+                        lines.append(self.formatter.format(item) + '\n')
+                    except Exception:
+                        lines.append(f"Log record cannot be formatted: {item.msg!r}\n")
+
+            self.write(''.join(lines))
+
+            for event in events:
+                event.set()
+
+        if self.file is not None:
+            self.file.close()
+
+    def write(self, text: str) -> None:
+        """
+        Writes batch of formatted records to log file and stream.
+
+        :param str text: Formatted records separated by new line.
+        :return None: No return value
+        """
+        if not text:
+            return
+
+        for output in (self.file, self.stream):
+            if output is None:
+                continue
+            try:
+                output.write(text)
+                output.flush()
+            except Exception:
+                pass
+
+    def flush(self, timeout: float = None) -> None:
+        """
+        Blocks until all records queued before this call are written.
+
+        :param float timeout: Maximum time to wait in seconds.
+        :return None: No return value
+        """
+        if not self.is_alive():
+            return
+
+        event = threading.Event()
+        self.queue.put(event)
+        event.wait(timeout)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Writes all queued records, closes log file and ends the thread.
+
+        :param float timeout: Maximum time to wait in seconds.
+        :return None: No return value
+        """
+        if not self.is_alive():
+            return
+
+        self.queue.put(self.stop_marker)
+        self.join(timeout)
+
 
 class Logger:
     """
     Class for management logs and setting unified format, output location and logging methods.
+
+    Methods decorated by for_all_methods are instrumented according to Logger.instrumentation:
+        - 'stats' (default): durations are aggregated in memory and written by log_method_stats as summaries
+        - 'calls': every call writes start and end DEBUG records (with arguments if in_args is set)
+        - 'off': methods are called without any instrumentation
     """
+    instrumentation = 'stats'
+    method_stats = {}
+    method_stats_lock = threading.Lock()
+    log_writer = None
+    run_id = None
+
+    @staticmethod
+    def read_last_run_id(filepath: str, max_bytes: int = 65536):
+        """
+        Reads run id of the last record in log file. File is read backwards from its end by blocks, so the cost does
+        not depend on the size of the file. Lines not starting with run id (e.g. tracebacks) are skipped.
+
+        :param str filepath: Path to the log file.
+        :param int max_bytes: Maximum number of bytes read from the end of the file.
+        :return int: Last run id or None if it was not found.
+        """
+        try:
+            with open(filepath, 'rb') as fp:
+                fp.seek(0, 2)
+                position = fp.tell()
+                data = b''
+                while position > 0 and len(data) < max_bytes:
+                    read_size = min(4096, position)
+                    position -= read_size
+                    fp.seek(position)
+                    data = fp.read(read_size) + data
+
+                    lines = data.splitlines()
+                    # the first line may be incomplete unless the beginning of the file was reached
+                    for line in reversed(lines if position == 0 else lines[1:]):
+                        run_id = line.partition(b'|')[0]
+                        if run_id.isdigit():
+                            return int(run_id)
+        except OSError:
+            pass
+
+        return None
+
     @staticmethod
     def get_last_run_id(now_obj, filepath=None):
+        """
+        Allocates new run id. The last allocated run id is kept in sidecar file '<log file>.runid', which is locked
+        during the allocation, so concurrently starting processes always get different run ids.
+        If the sidecar file does not exist, the last run id is read from the end of the log file.
+
+        :param datetime now_obj: Current date and time.
+        :param str filepath: Path to the log file, may contain <date> and <time> placeholders.
+        :return int: New run id.
+        """
+        first_run_id = int(now_obj.strftime("%Y%m%d") + '000000001')
+
+        if filepath is None:
+            return first_run_id
+
         filepath = filepath.replace('<date>', now_obj.strftime("%d.%m.%Y")) \
                            .replace('<time>', now_obj.strftime("%H:%M:%S"))
 
         try:
-            with open(filepath) as fp:
-                lines = fp.readlines()
-                run_id = int(lines[-1].partition('|')[0]) + 1
+            with open(filepath + '.runid', 'a+') as fp:
+                lock_file(fp)
+                try:
+                    fp.seek(0)
+                    content = fp.read().strip()
+                    if content.isdigit():
+                        last_run_id = int(content)
+                    else:
+                        last_run_id = Logger.read_last_run_id(filepath)
+
+                    run_id = first_run_id if last_run_id is None else max(last_run_id + 1, first_run_id)
+
+                    fp.seek(0)
+                    fp.truncate()
+                    fp.write(str(run_id))
+                    fp.flush()
+                finally:
+                    unlock_file(fp)
         except Exception as e:
             print(str(e))
-            run_id = now_obj.strftime("%Y%m%d") + '000000001'
+            last_run_id = Logger.read_last_run_id(filepath)
+            run_id = first_run_id if last_run_id is None else last_run_id + 1
 
         return run_id
 
     @staticmethod
     def set_logger_settings(logger_name: str = None, l_stream=sys.stderr, l_filename=None,
-                            l_level=logging.DEBUG, l_format: str = '%(asctime)-15s|%(levelname)s|%(message)s'):
+                            l_level=logging.DEBUG, l_format: str = '%(asctime)-15s|%(levelname)s|%(message)s',
+                            l_queue: bool = False):
         """
         Setting up logger setting
 
@@ -35,6 +291,7 @@ class Logger:
         :param l_filename: output file
         :param l_level: logger level
         :param l_format: format of output message
+        :param l_queue: if True, records are written in batches by background QueuedLogWriter thread
         """
         now = datetime.now()
 
@@ -46,7 +303,10 @@ class Logger:
             for handler in root_logger.handlers[:]:
                 root_logger.removeHandler(handler)
 
+            Logger.stop_log_writer()
+
             run_id = Logger.get_last_run_id(now, filepath=l_filename)
+            Logger.run_id = run_id
 
             log_formatter = logging.Formatter(f"{run_id}|{l_format}")
 
@@ -56,6 +316,13 @@ class Logger:
                 l_filename = l_filename.replace('<date>', now.strftime("%d.%m.%Y")) \
                                        .replace('<time>', now.strftime("%H:%M:%S"))
 
+            if l_queue:
+                Logger.log_writer = QueuedLogWriter(log_formatter, filename=l_filename, stream=l_stream)
+                Logger.log_writer.start()
+                root_logger.addHandler(logging.handlers.QueueHandler(Logger.log_writer.queue))
+                return
+
+            if l_filename is not None:
                 file_handler = logging.FileHandler(l_filename)
                 file_handler.setFormatter(log_formatter)
                 root_logger.addHandler(file_handler)
@@ -65,6 +332,108 @@ class Logger:
                 console_handler.setFormatter(log_formatter)
                 root_logger.addHandler(console_handler)
 
+    @staticmethod
+    def flush_logs(timeout: float = 10) -> None:
+        """
+        Waits until background log writer writes all queued records. Does nothing if queued logging is not used.
+
+        :param float timeout: Maximum time to wait in seconds.
+        :return None: No return value
+        """
+        if Logger.log_writer is not None:
+            Logger.log_writer.flush(timeout)
+
+    @staticmethod
+    def stop_log_writer(timeout: float = 10) -> None:
+        """
+        Writes all queued records and stops background log writer. Called also at interpreter exit.
+
+        :param float timeout: Maximum time to wait in seconds.
+        :return None: No return value
+        """
+        if Logger.log_writer is not None:
+            Logger.log_writer.stop(timeout)
+            Logger.log_writer = None
+
+    @staticmethod
+    def start_process_log_listener(log_queue) -> logging.handlers.QueueListener:
+        """
+        Starts listener passing records logged by worker processes (see set_process_logger) to handlers
+        of root logger of this process.
+
+        :param log_queue: Multiprocessing queue shared with worker processes.
+        :return QueueListener: Started listener, it has to be stopped after worker processes are finished.
+        """
+        listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers)
+        listener.start()
+        return listener
+
+    @staticmethod
+    def set_process_logger(log_queue, l_level=logging.DEBUG, instrumentation: str = 'stats') -> None:
+        """
+        Initializer of worker process. Records of the process are sent into log_queue, so they are written
+        by handlers of parent process, see start_process_log_listener.
+
+        :param log_queue: Multiprocessing queue shared with parent process.
+        :param l_level: logger level
+        :param str instrumentation: Instrumentation mode of the parent process.
+        :return None: No return value
+        """
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        root_logger.setLevel(l_level)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        Logger.set_instrumentation(instrumentation)
+
+    @staticmethod
+    def set_instrumentation(mode: str = 'stats') -> None:
+        """
+        Sets instrumentation mode of decorated methods.
+
+        :param str mode: One of 'stats', 'calls' or 'off'.
+        :return None: No return value
+        """
+        if mode not in ('stats', 'calls', 'off'):
+            raise Exception('Instrumentation mode "{}" not recognized.'.format(mode))
+
+        Logger.instrumentation = mode
+
+    @staticmethod
+    def record_call(method_name: str, duration: float) -> None:
+        """
+        Adds duration of one call of decorated method into in-memory aggregates.
+
+        :param str method_name: Name of the method in format <class>.<method>.
+        :param float duration: Duration of the call in seconds.
+        :return None: No return value
+        """
+        with Logger.method_stats_lock:
+            stats = Logger.method_stats.get(method_name)
+            if stats is None:
+                stats = Logger.method_stats[method_name] = MethodStats()
+            stats.add(duration)
+
+    @staticmethod
+    def log_method_stats(reset: bool = True) -> None:
+        """
+        Writes one summary record per instrumented method (count, total, p50, p95 and max duration).
+
+        :param bool reset: If True, aggregates are cleared after they are written.
+        :return None: No return value
+        """
+        with Logger.method_stats_lock:
+            method_stats = Logger.method_stats
+            if reset:
+                Logger.method_stats = {}
+
+        summary_logger = Logger(__name__)
+        for method_name, stats in sorted(method_stats.items(), key=lambda item: item[1].total, reverse=True):
+            inp_class, _, inp_func = method_name.rpartition('.')
+            summary_logger.info('Calls: {} Total: {:.4f}s p50: {:.6f}s p95: {:.6f}s Max: {:.6f}s'.format(
+                                    stats.count, stats.total, stats.percentile(50), stats.percentile(95), stats.max),
+                                inp_class=inp_class, inp_func=inp_func, msg_type='time', created_by='system')
+
     def __init__(self, name=None):
         self.name = name
         self.logger = logging.getLogger(name)
@@ -72,6 +441,9 @@ class Logger:
         self.arr = []
 
     def debug(self, message: str, inp_class=None, inp_func=None, msg_type='code_exec', created_by='user'):
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
         if inp_class is None:
             inp_class = inspect.currentframe().f_back.f_locals['self'].__class__.__name__
 
@@ -81,6 +453,9 @@ class Logger:
         self.logger.debug(f"{inp_class}|{inp_func}|{created_by}|{msg_type}|{message}")
 
     def info(self, message: str, inp_class=None, inp_func=None, msg_type='code_exec', created_by='user'):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         if inp_class is None:
             inp_class = inspect.currentframe().f_back.f_locals['self'].__class__.__name__
 
@@ -90,6 +465,9 @@ class Logger:
         self.logger.info(f"{inp_class}|{inp_func}|{created_by}|{msg_type}|{message}")
 
     def warning(self, message: str, inp_class=None, inp_func=None, msg_type='code_exec', created_by='user'):
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+
         if inp_class is None:
             inp_class = inspect.currentframe().f_back.f_locals['self'].__class__.__name__
 
@@ -99,6 +477,9 @@ class Logger:
         self.logger.warning(f"{inp_class}|{inp_func}|{created_by}|{msg_type}|{message}")
 
     def error(self, message: str, inp_class=None, inp_func=None, msg_type='code_exec', created_by='user'):
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+
         if inp_class is None:
             inp_class = inspect.currentframe().f_back.f_back.f_locals['self'].__class__.__name__
 
@@ -107,24 +488,25 @@ class Logger:
 
         self.logger.error(f"{inp_class}|{inp_func}|{created_by}|{msg_type}|{message}")
 
-    def __start_time(self, message: str, inp_class=None, inp_func=None) -> None:
+    def __start_time(self, message: str, inp_class=None, inp_func=None) -> float:
         """
         Starts the timer for specific method.
 
         :param str message: input message (Name of class and method)
-        :return None: Writes to log file / output
+        :return float: Start time of the call, to be passed to __end_time. Writes to log file / output
         """
-        self.start = time.time()
         self.debug(message, inp_class=inp_class, inp_func=inp_func, msg_type='time', created_by='system')
+        return time.perf_counter()
 
-    def __end_time(self, message: str, inp_class=None, inp_func=None) -> None:
+    def __end_time(self, message: str, start: float, inp_class=None, inp_func=None) -> None:
         """
         Prints the execution time of specific method.
 
         :param str message: Input message (Name of class and method)
+        :param float start: Start time of the call returned by __start_time.
         :return None: Writes to log file / output
         """
-        end = time.time() - self.start
+        end = time.perf_counter() - start
 
         hours = int(end / 3600)
         minutes = int(end / 60 % 60)
@@ -151,17 +533,34 @@ class Logger:
         """
         Support function for decorating class methods.
         """
+        method_name = f"{inp_class.__name__}.{inp_funct.__name__}"
 
+        @functools.wraps(inp_funct)
         def wrapper(*args, **kwargs):
+            mode = Logger.instrumentation
+
+            if mode == 'stats':
+                start = time.perf_counter()
+                try:
+                    return inp_funct(*args, **kwargs)
+                finally:
+                    Logger.record_call(method_name, time.perf_counter() - start)
+
+            if mode != 'calls' or not self.logger.isEnabledFor(logging.DEBUG):
+                return inp_funct(*args, **kwargs)
+
             if in_args:
                 message = f"Start: Inputs - {list(args[1:])}"
             else:
                 message = "Start"
 
-            self.__start_time(message, inp_class=inp_class.__name__, inp_func=inp_funct.__name__)
+            start = self.__start_time(message, inp_class=inp_class.__name__, inp_func=inp_funct.__name__)
 
             result = inp_funct(*args, **kwargs)
-            self.__end_time("End", inp_class=inp_class.__name__, inp_func=inp_funct.__name__)
+            self.__end_time("End", start, inp_class=inp_class.__name__, inp_func=inp_funct.__name__)
             return result
 
         return wrapper
+
+
+atexit.register(Logger.stop_log_writer)
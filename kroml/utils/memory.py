@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import threading
+import contextvars
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from utils.logger import Logger
+
+logger = Logger(__name__)
+
+
+def get_rss() -> int:
+    """
+    Returns resident set size of current process in bytes. Uses psutil if it is installed, otherwise reads
+    /proc/self/statm. Returns None if neither is available.
+
+    :return int: Resident set size in bytes.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def deep_size(obj, seen: set = None) -> int:
+    """
+    Returns approximate size of object in bytes including objects it references. Pandas objects are measured
+    with memory_usage(deep=True), numpy arrays by their buffer size and containers recursively.
+
+    :param obj: Measured object.
+    :param set seen: Ids of already measured objects, shared objects are counted only once.
+    :return int: Size of object in bytes.
+    """
+    if seen is None:
+        seen = set()
+
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    elif isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_size(vars(obj), seen)
+
+    return size
+
+
+class MemoryReport:
+    """
+    Memory usage of stages recorded by one run.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.records = []
+        self.lock = threading.Lock()
+        self.stopped = False
+
+
+class MemoryTracker:
+    """
+    Records memory usage of pipeline stages (input loads, modules and output writes) of one run: change of resident
+    set size, peak of memory allocated by Python during the stage (tracemalloc) and deep size of each object added
+    into variable context.
+
+    Report of the run is held in context variable, so concurrent runs (e.g. requests of flask_main served by
+    different threads) record into their own reports. Tracemalloc is shared by the process, it is started by the
+    first enabled run and stopped when the last enabled run stops, if the tracker started it. Stages of concurrent
+    runs overlap, so their traced peaks may include allocations of the other runs.
+    """
+    def __init__(self):
+        self.current = contextvars.ContextVar('memory_report', default=None)
+        self.lock = threading.Lock()
+        self.active_runs = 0
+        self.started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        report = self.current.get()
+        return report is not None and report.enabled
+
+    def start(self, enabled: bool = True) -> MemoryReport:
+        """
+        Starts memory tracking of new run in the current context.
+
+        :param bool enabled: If False, stages are not measured.
+        :return MemoryReport: Report of the run.
+        """
+        report = MemoryReport(enabled)
+        self.current.set(report)
+
+        if enabled:
+            with self.lock:
+                self.active_runs += 1
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self.started_tracemalloc = True
+        return report
+
+    def stop(self, report: MemoryReport = None) -> None:
+        """
+        Stops memory tracking of the run. Tracemalloc is stopped if no other run is tracked and it was started
+        by the tracker.
+
+        :param MemoryReport report: Stopped report, report of the current context if None.
+        :return None: No return value
+        """
+        report = report or self.current.get()
+        if report is None or not report.enabled or report.stopped:
+            return None
+
+        report.stopped = True
+        with self.lock:
+            self.active_runs -= 1
+            if self.active_runs == 0 and self.started_tracemalloc:
+                tracemalloc.stop()
+                self.started_tracemalloc = False
+
+    @contextmanager
+    def measure(self, stage: str, name: str, variables=None):
+        """
+        Context manager measuring memory usage of one stage of the run of the current context.
+
+        :param str stage: Type of the stage (input, module, output).
+        :param str name: Name of the stage, e.g. name of loaded file or class name of module.
+        :param VariableContext variables: Variable context, objects added into it during the stage are measured.
+        """
+        report = self.current.get()
+        if report is None or not report.enabled or not tracemalloc.is_tracing():
+            yield
+            return
+
+        keys_before = set(variables.object_dict) if variables is not None else set()
+        rss_before = get_rss()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+
+        try:
+            yield
+        finally:
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            rss_after = get_rss()
+
+            added = {}
+            if variables is not None:
+                for key in set(variables.object_dict) - keys_before:
+                    added[key] = deep_size(variables.get_object(key))
+
+            record = {'stage': stage, 'name': name,
+                      'rss_before': rss_before, 'rss_after': rss_after,
+                      'rss_delta': rss_after - rss_before if rss_before is not None and rss_after is not None
+                      else None,
+                      'traced_delta': traced_after - traced_before,
+                      'traced_peak': traced_peak - traced_before if hasattr(tracemalloc, 'reset_peak') else None,
+                      'added_variables': added}
+            with report.lock:
+                report.records.append(record)
+
+            logger.info('{} "{}" RSS delta: {} Traced peak: {} Added variables: {}'.format(
+                            stage, name, format_size(record['rss_delta']), format_size(record['traced_peak']),
+                            {key: format_size(size) for key, size in added.items()}),
+                        inp_class='MemoryTracker', inp_func='measure', msg_type='memory', created_by='system')
+
+    def save(self, filename: str, run_id=None, report: MemoryReport = None) -> None:
+        """
+        Writes memory report of the run into JSON file. Does nothing if memory tracking is disabled.
+
+        :param str filename: Path of the output file.
+        :param run_id: Run id stored in the report.
+        :param MemoryReport report: Saved report, report of the current context if None.
+        :return None: No return value
+        """
+        report = report or self.current.get()
+        if report is None or not report.enabled:
+            return None
+
+        with report.lock:
+            records = list(report.records)
+
+        peak = max((record for record in records if record['traced_peak'] is not None),
+                   key=lambda record: record['traced_peak'], default=None)
+
+        with open(filename, 'w') as outfile:
+            json.dump({'run_id': str(run_id),
+                       'rss': get_rss(),
+                       'peak_stage': None if peak is None else {'stage': peak['stage'], 'name': peak['name']},
+                       'stages': records}, outfile, indent=2)
+
+        logger.info('Memory report of the run was saved into "{}".'.format(filename), inp_class='MemoryTracker',
+                    inp_func='save', created_by='system')
+
+
+def format_size(size: int) -> str:
+    """
+    Formats number of bytes as human readable string.
+
+    :param int size: Number of bytes.
+    :return str: Formatted size, e.g. 12.5 MB.
+    """
+    if size is None:
+        return 'n/a'
+
+    value = float(size)
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(value) < 1024:
+            return '{:.1f} {}'.format(value, unit)
+        value /= 1024
+    return '{:.1f} TB'.format(value)
+
+
+memory_tracker = MemoryTracker()
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from utils.logger import Logger
+
+logger = Logger(__name__)
+
+
+class Trace:
+    """
+    Spans recorded by one run.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events = []
+        self.thread_names = {}
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+
+class Tracer:
+    """
+    Records hierarchical spans of one run and exports them in Chrome trace event format, which can be opened
+    in chrome://tracing or Perfetto UI. Every span is a complete ('X') event, nesting of spans is given by their
+    start times and durations within the thread. Parent of the span is stored also in its arguments.
+
+    Trace of the run and stack of open spans are held in context variables, so concurrent runs (e.g. requests
+    of flask_main served by different threads) record into their own traces. Work submitted to thread pool is
+    recorded into the trace of its run if it is called in copy of the submitting context
+    (contextvars.copy_context().run), its spans then have the submitting span as parent.
+    """
+    def __init__(self):
+        self.current = contextvars.ContextVar('trace', default=None)
+        self.stack = contextvars.ContextVar('trace_stack', default=())
+
+    @property
+    def enabled(self) -> bool:
+        trace = self.current.get()
+        return trace is not None and trace.enabled
+
+    def start(self, enabled: bool = True) -> Trace:
+        """
+        Starts tracing of new run in the current context.
+
+        :param bool enabled: If False, spans are not recorded.
+        :return Trace: Trace of the run.
+        """
+        trace = Trace(enabled)
+        self.current.set(trace)
+        self.stack.set(())
+        return trace
+
+    @contextmanager
+    def span(self, name: str, category: str = 'code', **args):
+        """
+        Context manager measuring one span.
+
+        :param str name: Name of the span, e.g. <class>.<method> or name of loaded file.
+        :param str category: Category of the span (run, manager, io, module, ...).
+        :param args: Additional values stored in the span.
+        """
+        trace = self.current.get()
+        if trace is None or not trace.enabled:
+            yield
+            return
+
+        stack = self.stack.get()
+        parent = stack[-1] if stack else None
+        token = self.stack.set(stack + (name,))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.stack.reset(token)
+
+            thread = threading.current_thread()
+            event = {'name': name, 'cat': category, 'ph': 'X',
+                     'ts': round((start - trace.origin) * 1e6, 3), 'dur': round(duration * 1e6, 3),
+                     'pid': os.getpid(), 'tid': thread.ident,
+                     'args': dict(args, parent=parent)}
+
+            with trace.lock:
+                trace.events.append(event)
+                trace.thread_names[thread.ident] = thread.name
+
+    def trace(self, category: str = 'code'):
+        """
+        Decorator measuring each call of the function as a span named <class>.<function>.
+
+        :param str category: Category of the span.
+        """
+        def decorator(funct):
+            @functools.wraps(funct)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return funct(*args, **kwargs)
+
+                with self.span(funct.__qualname__, category=category):
+                    return funct(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def save(self, filename: str, run_id=None, trace: Trace = None) -> None:
+        """
+        Writes recorded spans into JSON file in Chrome trace event format. Does nothing if tracing is disabled.
+
+        :param str filename: Path of the output file.
+        :param run_id: Run id stored in trace metadata.
+        :param Trace trace: Saved trace, trace of the current context if None.
+        :return None: No return value
+        """
+        trace = trace or self.current.get()
+        if trace is None or not trace.enabled:
+            return None
+
+        with trace.lock:
+            events = sorted(trace.events, key=lambda event: event['ts'])
+            thread_names = dict(trace.thread_names)
+
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                    for tid, name in thread_names.items()]
+
+        with open(filename, 'w') as outfile:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                       'otherData': {'run_id': str(run_id)}}, outfile)
+
+        logger.info('Trace of the run was saved into "{}".'.format(filename), inp_class='Tracer',
+                    inp_func='save', created_by='system')
+
+
+tracer = Tracer()
@@ -1,8 +1,8 @@
 import pandas as pd
 import numpy as np
-import keras
 from sklearn.preprocessing import StandardScaler
 from manipulation.modules.outlier_detection.mapping import Mapping
+from utils.backends import get_backend
 
 # TODO call_categorize and get_stats generalize and modify to work, to do so, you need to edit Mapping
 
@@ -157,9 +157,9 @@ def cat_to_vec(mydf: pd.DataFrame) -> np.ndarray:
                     n = n + 1
                 dfp[col] = dfp[col].replace(to_replace=i, value=dic[i])
             if result == '':
-                result = keras.utils.to_categorical(dfp[col], num_classes=clas_num(dfp[col].unique()))
+                result = get_backend('keras.utils').to_categorical(dfp[col], num_classes=clas_num(dfp[col].unique()))
             else:
-                add = keras.utils.to_categorical(dfp[col], num_classes=clas_num(dfp[col].unique()))
+                add = get_backend('keras.utils').to_categorical(dfp[col], num_classes=clas_num(dfp[col].unique()))
                 result = np.concatenate((result, add), axis=1)
         else:
             dfp[col] = dfp[col].fillna(0)
@@ -1,10 +1,15 @@
-import pickle
+import pandas as pd
 from utils.logger import Logger
 from utils.config_parser import ConfigParser
+from utils.checkpoint import CheckpointStore, LazyObjectDict
+from utils.memory import deep_size, format_size
+from utils.chunks import ChunkSource
 
 logger = Logger(__name__)
 
-VAR_CON_FILE = 'variable_context.pickle'
+VAR_CON_DIR = 'variable_context/'
+
+SPILL_DIR = 'variable_context_spill/'
 
 
 @logger.for_all_methods(in_args=False,
@@ -18,36 +23,107 @@ class VariableContext:
     """
     Variable context stores all the variables used in program execution to a dictionary schema.
     Variable can be an object of various type. It is stored under a specific string value to dictionary.
+
+    Context is checkpointed into directory VAR_CON_DIR (or 'variable_context_directory' from config) with one file
+    per variable, so only changed variables are written. In debug mode variables are restored lazily on the first
+    access and modules which finished successfully in the checkpointed run are not executed again.
+
+    If 'evict_dead_variables' is set, variable is deleted after the last module referencing it in its params
+    (variables written by output_files and output_db are kept). If 'memory_budget_mb' is set and objects held
+    in memory exceed it, least recently used variables are spilled to SPILL_DIR (or 'spill_directory' from config)
+    and loaded back transparently on the next get_object. Only variables whose last consumer in module flow has
+    already finished are spilled, as running or later modules may still hold and change them.
     """
 
     def __init__(self, config: ConfigParser):
         self.config = config
-        self.object_dict = {}
+        self.checkpoint = CheckpointStore(self.config.get_attr('variable_context_directory', default=VAR_CON_DIR),
+                                          columnar=self.config.get_attr('columnar_storage', default=False))
+        self.spill_store = CheckpointStore(self.config.get_attr('spill_directory', default=SPILL_DIR),
+                                           columnar=self.config.get_attr('columnar_storage', default=False))
+        self.object_dict = None
+        self.run_status_dict = None
+        self.object_sizes = {}
+        self.last_access = {}
+        self.access_counter = 0
+        self.last_consumers = {}
+        self.spill_consumers = {}
+        self.materialized = {}
+        self.materialized_fingerprints = {}
+
+        self.initialize()
+
+    def initialize(self) -> None:
+        """
+        Establishes empty variable and status dictionary for new run or restores them from checkpoint in debug mode.
+
+        :return None: No return value
+        """
+        self.object_dict = LazyObjectDict(self.checkpoint.load_object)
         self.run_status_dict = {}
+        self.object_sizes = {}
+        self.last_access = {}
+        self.access_counter = 0
+        self.materialized = {}
+        self.materialized_fingerprints = {}
+
+        if self.config.get_attr('evict_dead_variables', default=False):
+            self.last_consumers = self.get_last_consumers()
+        else:
+            self.last_consumers = {}
+
+        if self.config.get_attr('memory_budget_mb'):
+            self.spill_consumers = self.get_last_consumers(include_live=True)
+            self.spill_store.clear()
+        else:
+            self.spill_consumers = {}
 
         # establishment of modules
         if self.config.get_attr("debug") and self.check_module_context():
             self.load_context()
-            logger.info("Loading saved flow from variable context pickle file", created_by='system')
+            logger.info("Loading saved flow from variable context checkpoint", created_by='system')
         else:
             for module in self.config.get_attr('modules'):
                 if module.get('class_name') is not None:
                     self.run_status_dict[module.get('class_name')] = None
             logger.warning("Creating empty variable and status dictionary", created_by='system')
 
-    def get_object(self, key: str) -> object:
+    def get_object(self, key: str, columns: list = None) -> object:
         """
         Returns object from variable context stored under specific key.
         Returns None if key is not present in the variable context dictionary.
+        If columns are given and the object is a dataframe not yet restored from checkpoint, only these columns are
+        read from checkpoint and the object itself stays in checkpoint.
+        Chunk source materialized for the running module is returned as dataframe.
 
         :param str key: Value of specific key in dictionary
+        :param list columns: Names of dataframe columns to be returned. Whole object is returned if None.
         :return object: Object stored in variable context
         """
-        return self.object_dict.get(key, None)
+        if key in self.materialized:
+            obj = self.materialized[key]
+            return obj if columns is None else obj[columns]
+
+        if columns is not None and key in self.object_dict.pending:
+            return self.checkpoint.load_object(key, self.object_dict.pending[key], columns=columns)
+
+        is_pending = key in self.object_dict.pending
+        obj = self.object_dict.get(key, None)
+
+        if is_pending and obj is not None:
+            self.update_memory_usage(key, obj)
+        elif key in self.last_access:
+            self.access_counter += 1
+            self.last_access[key] = self.access_counter
+
+        if columns is not None and isinstance(obj, pd.DataFrame):
+            return obj[columns]
+        return obj
         
     def set_object(self, key: str, obj: object, replace: bool = False) -> None:
         """
-        Stores an object in variable context dictionary under specific key.
+        Stores an object in variable context dictionary under specific key. The key is marked as changed, so the
+        object is written by the next checkpoint.
 
         :param object obj: Object to be stored in dictionary
         :param str key: Key being added to a dictionary
@@ -60,14 +136,18 @@ class VariableContext:
         if obj is None:
             pass
         elif replace:
+            self.materialized.pop(key, None)
+            self.materialized_fingerprints.pop(key, None)
             self.object_dict[key] = obj
+            self.update_memory_usage(key, obj)
         else:
             if key not in self.object_dict:
                 self.object_dict[key] = obj
+                self.update_memory_usage(key, obj)
             else:
                 raise Exception("Trying setting on existing value! KEY=\"{}\"\n"
                                 "Use parameter replace=True or call del_object(key) first.".format(key))
-                
+
     def del_object(self, key: str) -> bool:
         """
         Deletes a key from dictionary with corresponding object.
@@ -76,49 +156,217 @@ class VariableContext:
         :return bool: Returns True if object was deleted from variable context dictionary.
                       Returns False if key was not present in dictionary and thus could not be deleted.
         """
+        self.materialized.pop(key, None)
+        self.materialized_fingerprints.pop(key, None)
         if key in self.object_dict:
             del(self.object_dict[key])
+            self.object_sizes.pop(key, None)
+            self.last_access.pop(key, None)
             return True
         else:
             return False
 
+    @staticmethod
+    def get_module_variables(module: dict) -> list:
+        """
+        Returns names of variables referenced in params of the module in module flow.
+
+        :param dict module: Module from module flow.
+        :return list: Names of referenced variables.
+        """
+        names = []
+        params = module.get('param', module.get('params')) or {}
+        for value in params.values():
+            for name in value if isinstance(value, list) else [value]:
+                if isinstance(name, str):
+                    names.append(name)
+        return names
+
+    def materialize_variables(self, names: list) -> None:
+        """
+        Materializes chunk sources stored under given keys for the module which is going to be executed. Dataframes
+        with all chunks are returned by get_object until release_materialized is called, chunk sources stay in the
+        context, so other modules and writers still stream them.
+
+        :param list names: Keys of variables.
+        :return None: No return value
+        """
+        for name in names:
+            if name in self.object_dict and isinstance(self.object_dict[name], ChunkSource):
+                self.materialized[name] = self.object_dict[name].materialize()
+                self.materialized_fingerprints[name] = VariableContext.get_fingerprint(self.materialized[name])
+                logger.info(f"Chunk source \"{name}\" materialized for module which does not support streaming",
+                            created_by='system')
+
+    def release_materialized(self) -> None:
+        """
+        Drops dataframes materialized by materialize_variables, called after the module finished. Dataframe changed
+        in place by the module (without set_object) replaces its chunk source in the context, so the change is seen
+        by later modules and writers, and a warning is logged.
+
+        :return None: No return value
+        """
+        for name, df in self.materialized.items():
+            if VariableContext.get_fingerprint(df) != self.materialized_fingerprints.get(name):
+                logger.warning(f"Materialized chunk source \"{name}\" was changed in place by the module, it is kept "
+                               "in variable context as dataframe. Use set_object to store changed variables.",
+                               inp_class='VariableContext', inp_func='release_materialized', created_by='system')
+                self.object_dict[name] = df
+                self.update_memory_usage(name, df)
+
+        self.materialized = {}
+        self.materialized_fingerprints = {}
+
+    @staticmethod
+    def get_fingerprint(df: pd.DataFrame) -> tuple:
+        """
+        Returns fingerprint of dataframe content used to detect in-place changes of materialized chunk sources.
+
+        :param pd.DataFrame df: Dataframe.
+        :return tuple: Columns, dtypes, length and hash of values, hash is None if values cannot be hashed.
+        """
+        try:
+            values_hash = int(pd.util.hash_pandas_object(df, index=True).sum())
+        except TypeError:
+            values_hash = None
+        return tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes), len(df), values_hash
+
+    def get_last_consumers(self, include_live: bool = False) -> dict:
+        """
+        Finds the last module referencing each variable in its params in module flow. Variables written by output
+        files, output databases and 'response' variable are live until the end of the run and are not included
+        unless include_live is set.
+
+        :param bool include_live: If True, variables live until the end of the run are included.
+        :return dict: Dictionary with name of the variable as the key and class name of the last module as value.
+        """
+        last_consumers = {}
+        for module in self.config.get_attr('modules', default=[]):
+            for name in VariableContext.get_module_variables(module):
+                last_consumers[name] = module.get('class_name')
+
+        if include_live:
+            return last_consumers
+
+        live_variables = {'response'}
+        for output_file in self.config.get_attr('output_files', default=[]):
+            if output_file is not None:
+                live_variables.add(output_file.get('variable_name'))
+        for output_database in self.config.get_attr('output_db', default=[]):
+            for query_name in output_database.get('query', []):
+                query_values = self.config.get_attr('queries', default={}).get(query_name) or {}
+                live_variables.add(query_values.get('variable_name'))
+
+        return {name: class_name for name, class_name in last_consumers.items() if name not in live_variables}
+
+    def release_variables(self, class_name: str) -> None:
+        """
+        Deletes variables whose last consumer is the module, called after the module finished successfully.
+
+        :param str class_name: Class name of finished module.
+        :return None: No return value
+        """
+        for name, consumer in self.last_consumers.items():
+            if consumer == class_name and self.del_object(name):
+                logger.info(f"Variable \"{name}\" released after its last consumer \"{class_name}\"",
+                            created_by='system')
+
+    def update_memory_usage(self, key: str, obj: object) -> None:
+        """
+        Records size and access of the object held in memory and spills least recently used objects to disk if
+        objects held in memory exceed 'memory_budget_mb'.
+
+        :param str key: Key of the object, which was stored or loaded.
+        :param object obj: The object.
+        :return None: No return value
+        """
+        self.access_counter += 1
+        self.last_access[key] = self.access_counter
+
+        budget = self.config.get_attr('memory_budget_mb')
+        if not budget:
+            return None
+
+        self.object_sizes[key] = deep_size(obj)
+
+        limit = float(budget) * 1024 * 1024
+        total = sum(self.object_sizes.get(name, 0) for name in self.object_dict.loaded)
+
+        # object referenced by running or later module may be held and changed by it, so it cannot be spilled
+        candidates = sorted((name for name in self.object_dict.loaded
+                             if name != key and self.run_status_dict.get(self.spill_consumers.get(name)) is True),
+                            key=lambda name: self.last_access.get(name, 0))
+        for name in candidates:
+            if total <= limit:
+                break
+
+            entry = self.object_dict.entries.get(name)
+            if entry is None:
+                entry, _ = self.spill_store.store_object(self.object_dict.loaded[name])
+                entry['directory'] = self.spill_store.directory
+            self.object_dict.set_pending(name, entry)
+            total -= self.object_sizes.pop(name, 0)
+
+            logger.info(f"Variable \"{name}\" spilled to disk, objects in memory: {format_size(total)}",
+                        created_by='system')
+
     def save_context(self):
         """
-        Saves object of variable context into a pickle file.
+        Saves variable context into checkpoint directory. Only variables changed since the last checkpoint are written.
 
         :return None: No return value
         """
-        filename = VAR_CON_FILE
-        tmp_dict = {"status": self.run_status_dict, "variables": self.object_dict}
-        with open(filename, 'wb') as outfile:
-            pickle.dump(tmp_dict, outfile)
+        self.checkpoint.save(self.run_status_dict, self.object_dict)
 
     def check_module_context(self):
         """
-        Method for checking if pickle file structure is same as module_flow.
+        Method for checking if checkpoint structure is same as module_flow and all its variable files are present.
+        Reads only checkpoint manifest, variables are not loaded.
         :return bool
         """
-        filename = VAR_CON_FILE
-        with open(filename, 'rb') as infile:
-            tmp_dict = pickle.load(infile)
-            saved_run_status_dict = tmp_dict["status"]
+        index = self.checkpoint.read_index()
+        if index is None:
+            return False
+
+        saved_run_status_dict = index["status"]
 
         for module in self.config.get_attr("modules"):
             if module.get("class_name") not in saved_run_status_dict:
                 return False
+
+        invalid_variables = self.checkpoint.check_files()
+        if invalid_variables:
+            logger.warning(f"Checkpoint files of variables {invalid_variables} are missing or changed",
+                           created_by='system')
+            return False
         return True
 
     def load_context(self):
         """
-        Loads variable context from a pickle file into an object.
+        Loads variable context from checkpoint. Variables are only registered and loaded on the first access.
+        Status of the first module which did not finish successfully and of all modules after it is cleared,
+        so the run resumes from this module.
 
         :return None: No return value
         """
-        filename = VAR_CON_FILE
-        with open(filename, 'rb') as infile:
-            tmp_dict = pickle.load(infile)
-            self.object_dict = tmp_dict["variables"]
-            self.run_status_dict = tmp_dict["status"]
+        index = self.checkpoint.index or self.checkpoint.read_index()
+
+        self.object_dict = LazyObjectDict(self.checkpoint.load_object)
+        for key, entry in index["variables"].items():
+            self.object_dict.set_pending(key, entry)
+
+        self.run_status_dict = dict(index["status"])
+
+        resume = False
+        for module in self.config.get_attr("modules"):
+            class_name = module.get("class_name")
+            if class_name is None:
+                continue
+            if not resume and self.run_status_dict.get(class_name) is not True:
+                resume = True
+                logger.info(f"Run resumes from module \"{class_name}\"", created_by='system')
+            if resume:
+                self.run_status_dict[class_name] = None
 
     def set_status(self, obj: object) -> None:
         """